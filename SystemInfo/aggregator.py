@@ -0,0 +1,326 @@
+import asyncio
+import heapq
+import json
+import time
+from collections import namedtuple
+
+AgentResult = namedtuple("AgentResult", ["endpoint", "ok", "timestamp", "metrics", "latency", "error"])
+
+
+class HTTPStatusError(Exception):
+    """
+    The agent answered with a status other than 200.
+
+    Unlike a dropped connection this is a real answer, so it is not retried.
+
+    Args:
+        status (int): HTTP status code.
+    """
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+def parse_endpoint(endpoint):
+    """
+    Split an agent endpoint into host and port.
+
+    Args:
+        endpoint (str or tuple): "host:port", "http://host:port" or (host, port).
+
+    Returns:
+        tuple: (host, port).
+    """
+    if isinstance(endpoint, tuple):
+        return endpoint[0], int(endpoint[1])
+    if "://" in endpoint:
+        endpoint = endpoint.split("://", 1)[1]
+    endpoint = endpoint.split("/", 1)[0]
+    host, _, port = endpoint.rpartition(":")
+    return host.strip("[]"), int(port)
+
+
+class AgentConnection:
+    """
+    A persistent HTTP/1.1 connection to one agent's exporter.
+
+    The connection is opened on first use, kept alive between polls and
+    reopened once if the agent closed it in the meantime.
+
+    Args:
+        host (str): Agent host.
+        port (int): Agent port.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def _request(self, path):
+        self._writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by agent")
+        parts = status_line.split(None, 2)
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            body = await self._reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self._reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        if status != 200:
+            raise HTTPStatusError(status)
+        return body
+
+    async def get(self, path):
+        """
+        Fetch one path over the persistent connection.
+
+        A connection the agent dropped while idle is reopened and the request
+        sent once more; an HTTPStatusError is raised as is.
+
+        Args:
+            path (str): Request path.
+
+        Returns:
+            bytes: The response body.
+        """
+        if self._writer is None:
+            await self._connect()
+            return await self._request(path)
+        try:
+            return await self._request(path)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # The agent dropped the idle connection; retry on a fresh one.
+            await self.close()
+            await self._connect()
+            return await self._request(path)
+
+    async def close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class FleetAggregator:
+    """
+    Polls many agents' /metrics.json endpoints concurrently.
+
+    All agents are polled from one event loop over persistent connections,
+    so hundreds of hosts cost hundreds of sockets, not threads. Each host
+    has its own timeout; a slow or dead host only fails its own result and
+    has its connection dropped. Exporters listen on loopback by default, so
+    remote agents must be started with a wider bind, e.g. --host 0.0.0.0.
+
+    Args:
+        endpoints (iterable): Agent endpoints, see parse_endpoint.
+        timeout (float): Seconds allowed per host and poll.
+        max_concurrency (int): Most requests in flight at once.
+        path (str): Path of the agent's JSON metrics.
+    """
+
+    def __init__(self, endpoints, timeout=2.0, max_concurrency=200, path="/metrics.json"):
+        self.endpoints = [parse_endpoint(endpoint) for endpoint in endpoints]
+        self.timeout = timeout
+        self.path = path
+        self.results = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._connections = {}
+
+    async def _poll_one(self, endpoint):
+        connection = self._connections.get(endpoint)
+        if connection is None:
+            connection = self._connections[endpoint] = AgentConnection(*endpoint)
+        name = f"{endpoint[0]}:{endpoint[1]}"
+        async with self._semaphore:
+            start = time.monotonic()
+            try:
+                body = await asyncio.wait_for(connection.get(self.path), self.timeout)
+                document = json.loads(body)
+            except asyncio.TimeoutError:
+                await connection.close()
+                return AgentResult(name, False, None, {}, None, f"timed out after {self.timeout} s")
+            except HTTPStatusError as e:
+                # The response was read in full, so the connection stays usable.
+                return AgentResult(name, False, None, {}, None, str(e))
+            except Exception as e:
+                await connection.close()
+                return AgentResult(name, False, None, {}, None, f"{type(e).__name__}: {e}")
+            latency = time.monotonic() - start
+        return AgentResult(name, True, document.get("timestamp"), document.get("metrics", {}), latency, None)
+
+    async def poll(self):
+        """
+        Poll every agent once.
+
+        Returns:
+            dict: "host:port" mapped to AgentResult.
+        """
+        results = await asyncio.gather(*[self._poll_one(endpoint) for endpoint in self.endpoints])
+        self.results = {result.endpoint: result for result in results}
+        return self.results
+
+    async def run(self, interval=5.0, count=None):
+        """
+        Poll every interval and yield the results.
+
+        Args:
+            interval (float): Seconds between polls.
+            count (int, optional): Stop after this many polls.
+
+        Yields:
+            dict: "host:port" mapped to AgentResult.
+        """
+        next_tick = time.monotonic()
+        polled = 0
+        while count is None or polled < count:
+            yield await self.poll()
+            polled += 1
+            next_tick += interval
+            await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+
+    async def close(self):
+        await asyncio.gather(*[connection.close() for connection in self._connections.values()])
+        self._connections.clear()
+
+
+def _labelled(results, prefix, suffix):
+    """
+    Yield (endpoint, label, value) for metrics named <prefix><label><suffix>.
+    """
+    for result in results.values():
+        if not result.ok:
+            continue
+        for name, value in result.metrics.items():
+            if value is not None and name.startswith(prefix) and name.endswith(suffix):
+                yield result.endpoint, name[len(prefix):len(name) - len(suffix)], value
+
+
+def hottest_cpus(results, n=10):
+    """
+    Get the hosts with the highest total CPU usage.
+
+    Args:
+        results (dict): Output of FleetAggregator.poll.
+        n (int): Number of rows.
+
+    Returns:
+        list: (endpoint, cpu percent) tuples, highest first.
+    """
+    rows = (
+        (result.endpoint, result.metrics["cpu.total"])
+        for result in results.values()
+        if result.ok and result.metrics.get("cpu.total") is not None
+    )
+    return heapq.nlargest(n, rows, key=lambda row: row[1])
+
+
+def fullest_disks(results, n=10):
+    """
+    Get the fullest filesystems across the fleet.
+
+    Args:
+        results (dict): Output of FleetAggregator.poll.
+        n (int): Number of rows.
+
+    Returns:
+        list: (endpoint, mountpoint, percent) tuples, fullest first.
+    """
+    return heapq.nlargest(n, _labelled(results, "mount.", ".percent"), key=lambda row: row[2])
+
+
+def gpu_loads(results, n=10):
+    """
+    Get the busiest GPUs across the fleet.
+
+    Args:
+        results (dict): Output of FleetAggregator.poll.
+        n (int): Number of rows.
+
+    Returns:
+        list: (endpoint, gpu index, load percent) tuples, busiest first.
+    """
+    return heapq.nlargest(n, _labelled(results, "gpu.", ".load"), key=lambda row: row[2])
+
+
+def fleet_summary(results, n=10):
+    """
+    Merge the agents' results into fleet-wide tables.
+
+    Args:
+        results (dict): Output of FleetAggregator.poll.
+        n (int): Rows per table.
+
+    Returns:
+        dict: "hottest_cpus", "fullest_disks", "gpu_loads" tables plus the
+        lists of "reachable" and "unreachable" endpoints.
+    """
+    return {
+        "hottest_cpus": hottest_cpus(results, n),
+        "fullest_disks": fullest_disks(results, n),
+        "gpu_loads": gpu_loads(results, n),
+        "reachable": sorted(endpoint for endpoint, result in results.items() if result.ok),
+        "unreachable": sorted(endpoint for endpoint, result in results.items() if not result.ok),
+    }
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration: pass agent endpoints, or run against
+    # a few local stand-in exporters.
+    import sys
+
+    from exporter import MetricsExporter
+
+    exporters = []
+    endpoints = sys.argv[1:]
+    if not endpoints:
+        for _ in range(5):
+            exporter = MetricsExporter(interval=1.0, port=0)
+            host, port = exporter.start()
+            exporters.append(exporter)
+            endpoints.append(f"{host}:{port}")
+
+    async def main():
+        aggregator = FleetAggregator(endpoints, timeout=2.0)
+        try:
+            async for results in aggregator.run(interval=1.0, count=3):
+                summary = fleet_summary(results, n=5)
+                print(f"Reachable: {len(summary['reachable'])}, unreachable: {summary['unreachable']}")
+                for endpoint, cpu in summary["hottest_cpus"]:
+                    print(f"  CPU  {endpoint:<22} {cpu:6.1f}%")
+                for endpoint, mountpoint, percent in summary["fullest_disks"]:
+                    print(f"  Disk {endpoint:<22} {mountpoint:<30} {percent:6.1f}%")
+                for endpoint, index, load in summary["gpu_loads"]:
+                    print(f"  GPU  {endpoint:<22} #{index:<3} {load:6.1f}%")
+        finally:
+            await aggregator.close()
+
+    try:
+        asyncio.run(main())
+    finally:
+        for exporter in exporters:
+            exporter.stop()
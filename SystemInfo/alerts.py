@@ -0,0 +1,520 @@
+import fnmatch
+import math
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import disk_monitoring
+
+Alert = namedtuple("Alert", ["rule", "metric", "state", "value", "message", "timestamp"])
+
+FIRING = "firing"
+RESOLVED = "resolved"
+
+
+class _RuleState:
+    __slots__ = ("firing", "since", "last_value", "last_time", "rate", "estimator")
+
+    def __init__(self):
+        self.firing = False
+        self.since = None
+        self.last_value = None
+        self.last_time = None
+        self.rate = None
+        self.estimator = None
+
+
+class Rule:
+    """
+    Base class of the alert rules.
+
+    A rule applies to every metric whose name matches ``metric`` (an exact
+    name or an fnmatch pattern such as "mount.*.percent") and keeps a small,
+    fixed amount of state per matching metric, so each sample costs O(1).
+
+    Subclasses implement ``condition`` and ``cleared``. Having separate
+    trigger and clear conditions gives hysteresis: a firing rule does not
+    fire again, and only resolves once ``cleared`` holds.
+
+    States are only dropped by ``forget``. AlertEngine forgets metrics that
+    went idle; a rule fed directly must be told about removed metrics.
+
+    Args:
+        name (str): Rule name reported in alerts.
+        metric (str): Metric name or pattern.
+        for_seconds (float): How long the condition must hold before firing.
+        message (str, optional): Format string with {metric}, {value} and {rule}.
+    """
+
+    def __init__(self, name, metric, for_seconds=0.0, message=None):
+        self.name = name
+        self.metric = metric
+        self.for_seconds = for_seconds
+        self.message = message or "{rule}: {metric} is {value:.2f}"
+        self._states = {}
+
+    def matches(self, metric):
+        return metric == self.metric or fnmatch.fnmatchcase(metric, self.metric)
+
+    def update(self, state, value, timestamp):
+        """
+        Update per-metric state before the conditions are checked.
+
+        Returns:
+            float: The value the conditions are checked against, or None to skip.
+        """
+        return value
+
+    def condition(self, state, value):
+        raise NotImplementedError
+
+    def cleared(self, state, value):
+        raise NotImplementedError
+
+    def format(self, metric, value, state):
+        return self.message.format(rule=self.name, metric=metric, value=value)
+
+    def evaluate(self, metric, value, timestamp):
+        """
+        Feed one sample of one metric.
+
+        Args:
+            metric (str): Metric name.
+            value (float): Sample value.
+            timestamp (float): Sample time in seconds.
+
+        Returns:
+            Alert: A firing or resolved alert on a state change, otherwise None.
+        """
+        state = self._states.get(metric)
+        if state is None:
+            state = self._states[metric] = _RuleState()
+        checked = self.update(state, value, timestamp)
+        state.last_value = value
+        state.last_time = timestamp
+        if checked is None:
+            return None
+
+        if state.firing:
+            if self.cleared(state, checked):
+                state.firing = False
+                state.since = None
+                return Alert(self.name, metric, RESOLVED, checked, self.format(metric, checked, state), timestamp)
+            return None
+
+        if not self.condition(state, checked):
+            state.since = None
+            return None
+        if state.since is None:
+            state.since = timestamp
+        if timestamp - state.since >= self.for_seconds:
+            state.firing = True
+            return Alert(self.name, metric, FIRING, checked, self.format(metric, checked, state), timestamp)
+        return None
+
+    def forget(self, metric):
+        """
+        Drop the state kept for a metric, e.g. of a removed mount.
+        """
+        self._states.pop(metric, None)
+
+
+class ThresholdRule(Rule):
+    """
+    Fire when a metric goes above (or below) a threshold.
+
+    Args:
+        name (str): Rule name reported in alerts.
+        metric (str): Metric name or pattern.
+        above (float, optional): Fire when the value is above this.
+        below (float, optional): Fire when the value is below this.
+        hysteresis (float): Distance back past the threshold needed to resolve.
+        for_seconds (float): How long the condition must hold before firing.
+        message (str, optional): Format string with {metric}, {value} and {rule}.
+    """
+
+    def __init__(self, name, metric, above=None, below=None, hysteresis=0.0, for_seconds=0.0, message=None):
+        if above is None and below is None:
+            raise ValueError("ThresholdRule needs above or below")
+        super().__init__(name, metric, for_seconds, message)
+        self.above = above
+        self.below = below
+        self.hysteresis = hysteresis
+
+    def condition(self, state, value):
+        return ((self.above is not None and value > self.above)
+                or (self.below is not None and value < self.below))
+
+    def cleared(self, state, value):
+        return ((self.above is None or value <= self.above - self.hysteresis)
+                and (self.below is None or value >= self.below + self.hysteresis))
+
+
+class RateRule(Rule):
+    """
+    Fire when a metric changes faster than a given rate.
+
+    The rate is an exponentially weighted moving average of the per-second
+    change between consecutive samples, so single spikes can be smoothed
+    out without keeping any history.
+
+    Args:
+        name (str): Rule name reported in alerts.
+        metric (str): Metric name or pattern.
+        max_rate (float): Fire when the rate per second exceeds this; use a
+            negative value with ``falling=True`` for drops.
+        falling (bool): Fire when the rate goes below ``max_rate`` instead.
+        smoothing (float): EWMA weight of the newest rate, 1.0 for none.
+        hysteresis (float): Distance back past max_rate needed to resolve.
+        for_seconds (float): How long the condition must hold before firing.
+        message (str, optional): Format string with {metric}, {value} and {rule}.
+    """
+
+    def __init__(self, name, metric, max_rate, falling=False, smoothing=1.0, hysteresis=0.0,
+                 for_seconds=0.0, message=None):
+        super().__init__(name, metric, for_seconds, message or "{rule}: {metric} changing at {value:.2f}/s")
+        self.max_rate = max_rate
+        self.falling = falling
+        self.smoothing = smoothing
+        self.hysteresis = hysteresis
+
+    def update(self, state, value, timestamp):
+        if state.last_time is None or timestamp <= state.last_time:
+            return None
+        rate = (value - state.last_value) / (timestamp - state.last_time)
+        if state.rate is None:
+            state.rate = rate
+        else:
+            state.rate += self.smoothing * (rate - state.rate)
+        return state.rate
+
+    def condition(self, state, value):
+        return value < self.max_rate if self.falling else value > self.max_rate
+
+    def cleared(self, state, value):
+        if self.falling:
+            return value >= self.max_rate + self.hysteresis
+        return value <= self.max_rate - self.hysteresis
+
+
+class FillRateEstimator:
+    """
+    Online least-squares fit of a metric's level over time.
+
+    Running sums are decayed by elapsed time with the given half-life, so
+    the fit follows the recent trend the same way whatever the sampling
+    rate. The sums are kept relative to the newest sample, which keeps them
+    small and precise however long the estimator runs. Each sample is O(1).
+
+    Args:
+        half_life (float): Seconds after which a sample has half its weight.
+    """
+
+    def __init__(self, half_life=6 * 3600.0):
+        self.half_life = half_life
+        self.count = 0
+        self.first_time = None
+        self.last_time = None
+        self.last_value = None
+        self._w = self._t = self._y = self._tt = self._ty = 0.0
+
+    def add(self, timestamp, value):
+        if self.last_time is not None:
+            shift = timestamp - self.last_time
+            if shift < 0:
+                return
+            d = 0.5 ** (shift / self.half_life)
+            # Move the origin to the new sample: t' = t - shift.
+            self._tt = (self._tt - 2 * shift * self._t + shift * shift * self._w) * d
+            self._ty = (self._ty - shift * self._y) * d
+            self._t = (self._t - shift * self._w) * d
+            self._y *= d
+            self._w *= d
+        else:
+            self.first_time = timestamp
+        self._w += 1.0
+        self._y += value
+        self.count += 1
+        self.last_value = value
+        self.last_time = timestamp
+
+    @property
+    def span(self):
+        """
+        Seconds between the first and the newest sample.
+        """
+        return self.last_time - self.first_time if self.count else 0.0
+
+    @property
+    def slope(self):
+        """
+        Fitted change per second, or None with fewer than two distinct times.
+        """
+        variance = self._tt * self._w - self._t * self._t
+        if self.count < 2 or variance <= 1e-9 * self._tt * self._w:
+            return None
+        return (self._ty * self._w - self._t * self._y) / variance
+
+    def seconds_until(self, level):
+        """
+        Predict when the fitted line reaches a level.
+
+        Args:
+            level (float): Target level, e.g. 1.0 for a used ratio.
+
+        Returns:
+            float: Seconds from the last sample, 0 if already there, or None if
+            the level is not being approached.
+        """
+        slope = self.slope
+        if self.last_value is None:
+            return None
+        if self.last_value >= level:
+            return 0.0
+        if slope is None or slope <= 0:
+            return None
+        return (level - self.last_value) / slope
+
+
+class DiskFillRule(Rule):
+    """
+    Fire when a filesystem is predicted to be full within a horizon.
+
+    Keeps a FillRateEstimator per mount, fed with unrounded
+    "mount.<mountpoint>.used_ratio" values (used / (used + free) bytes).
+    The rounded percent is not used: a single 0.1% rounding step would
+    look like a fill rate. No prediction is made until the samples span
+    ``min_span`` seconds, and fill rates below ``min_rate`` count as not
+    filling. The alert resolves once the prediction moves past the horizon
+    times ``hysteresis`` (or the mount stops filling).
+
+    Args:
+        name (str): Rule name reported in alerts.
+        metric (str): Metric pattern of the used ratios.
+        horizon_hours (float): Fire when full is predicted within this many hours.
+        half_life (float): Half-life of the fill-rate estimator in seconds.
+        min_span (float): Seconds of samples needed before predicting.
+        min_rate (float): Smallest fill rate taken seriously, as a fraction
+            of the capacity per hour.
+        hysteresis (float): Factor of the horizon needed to resolve.
+        for_seconds (float): How long the prediction must hold before firing.
+    """
+
+    def __init__(self, name="disk_fill", metric="mount.*.used_ratio", horizon_hours=24.0, half_life=6 * 3600.0,
+                 min_span=3600.0, min_rate=0.001, hysteresis=1.5, for_seconds=0.0):
+        super().__init__(name, metric, for_seconds)
+        self.horizon_hours = horizon_hours
+        self.half_life = half_life
+        self.min_span = min_span
+        self.min_rate = min_rate
+        self.hysteresis = hysteresis
+
+    def _hours_until_full(self, estimator):
+        """
+        Hours until full, inf if not filling, or None without enough history.
+        """
+        if estimator is None or estimator.span < self.min_span:
+            return None
+        if estimator.last_value >= 1.0:
+            return 0.0
+        slope = estimator.slope
+        if slope is None or slope * 3600 < self.min_rate:
+            return math.inf
+        return estimator.seconds_until(1.0) / 3600
+
+    def update(self, state, value, timestamp):
+        if state.estimator is None:
+            state.estimator = FillRateEstimator(self.half_life)
+        state.estimator.add(timestamp, value)
+        return self._hours_until_full(state.estimator)
+
+    def condition(self, state, value):
+        return value <= self.horizon_hours
+
+    def cleared(self, state, value):
+        return value > self.horizon_hours * self.hysteresis
+
+    def format(self, metric, value, state):
+        mountpoint = metric[len("mount."):metric.rfind(".")] if metric.startswith("mount.") else metric
+        if math.isinf(value):
+            return f"{self.name}: {mountpoint} is no longer filling up"
+        return f"{self.name}: {mountpoint} full in {value:.1f} hours"
+
+    def forecast(self):
+        """
+        Get the current prediction of every mount.
+
+        Returns:
+            dict: Metric name mapped to hours until full, or None if the mount
+            is not filling up or has too little history.
+        """
+        forecasts = {}
+        for metric, state in self._states.items():
+            hours = self._hours_until_full(state.estimator)
+            forecasts[metric] = hours if hours is not None and not math.isinf(hours) else None
+        return forecasts
+
+
+class AlertEngine:
+    """
+    Evaluate rules against a stream of metric values.
+
+    Alerts are delivered to every subscribed callback and, if ``alert_queue``
+    is given, put on that queue. Each rule only reports state changes
+    (firing, then resolved), so repeated samples above a threshold produce
+    a single alert.
+
+    A metric without a sample for ``retention`` seconds (e.g. a removed
+    veth, device or mount) is forgotten by every rule, so per-metric state
+    does not grow with every name ever seen. A firing alert of a forgotten
+    metric is dropped without a resolved alert.
+
+    Args:
+        rules (iterable, optional): Initial rules.
+        alert_queue (queue.Queue, optional): Queue that receives every alert.
+        retention (float): Seconds without a sample before a metric is forgotten.
+    """
+
+    def __init__(self, rules=(), alert_queue=None, retention=3600.0):
+        self.rules = list(rules)
+        self.queue = alert_queue
+        self.retention = retention
+        self._callbacks = []
+        self._matches = {}
+        self._last_seen = {}
+        self._lock = threading.Lock()
+
+    def add_rule(self, rule):
+        with self._lock:
+            self.rules.append(rule)
+            self._matches.clear()
+
+    def subscribe(self, callback):
+        """
+        Call ``callback(alert)`` for every alert.
+        """
+        self._callbacks.append(callback)
+
+    def _rules_for(self, metric):
+        rules = self._matches.get(metric)
+        if rules is None:
+            rules = self._matches[metric] = [rule for rule in self.rules if rule.matches(metric)]
+        return rules
+
+    def process(self, values, timestamp=None):
+        """
+        Feed one sample of several metrics, e.g. SystemMetricsCollector.collect(),
+        then forget idle metrics.
+
+        Args:
+            values (dict): Metric name mapped to value; None values are skipped.
+            timestamp (float, optional): Sample time. Defaults to now.
+
+        Returns:
+            list: Alerts raised by this sample.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        alerts = []
+        with self._lock:
+            for metric, value in values.items():
+                if value is None:
+                    continue
+                self._last_seen[metric] = timestamp
+                for rule in self._rules_for(metric):
+                    alert = rule.evaluate(metric, value, timestamp)
+                    if alert is not None:
+                        alerts.append(alert)
+            self._expire(timestamp)
+
+        for alert in alerts:
+            if self.queue is not None:
+                self.queue.put(alert)
+            for callback in self._callbacks:
+                try:
+                    callback(alert)
+                except Exception as e:
+                    print(f"Error in alert callback: {e}")
+        return alerts
+
+
+    def expire(self, now=None):
+        """
+        Forget metrics without a sample in the last ``retention`` seconds.
+
+        Args:
+            now (float, optional): Current time. Defaults to now.
+
+        Returns:
+            list: Names of the forgotten metrics.
+        """
+        with self._lock:
+            return self._expire(time.time() if now is None else now)
+
+    def _expire(self, now):
+        oldest = now - self.retention
+        expired = [metric for metric, seen in self._last_seen.items() if seen < oldest]
+        for metric in expired:
+            del self._last_seen[metric]
+            self._matches.pop(metric, None)
+            for rule in self.rules:
+                rule.forget(metric)
+        return expired
+
+
+def disk_usage_values(scans):
+    """
+    Turn disk_monitoring.scan_partitions() output into mount usage values.
+
+    Args:
+        scans (list): PartitionScan entries.
+
+    Returns:
+        dict: "mount.<mountpoint>.percent" and unrounded
+        "mount.<mountpoint>.used_ratio" values; failed mounts are left out.
+    """
+    values = {}
+    for scan in scans:
+        if scan.usage is None:
+            continue
+        values[f"mount.{scan.mountpoint}.percent"] = scan.usage.percent
+        values[f"mount.{scan.mountpoint}.used_ratio"] = disk_monitoring.used_ratio(scan.usage)
+    return values
+
+
+def default_rules():
+    """
+    Get a reasonable starting set of rules.
+
+    Returns:
+        list: CPU, memory, swap and filesystem rules.
+    """
+    return [
+        ThresholdRule("cpu_high", "cpu.total", above=90, hysteresis=10, for_seconds=60),
+        ThresholdRule("memory_high", "memory.percent", above=90, hysteresis=5, for_seconds=30),
+        RateRule("swap_growing", "swap.percent", max_rate=0.5, smoothing=0.3, for_seconds=30),
+        ThresholdRule("filesystem_full", "mount.*.percent", above=95, hysteresis=2),
+        DiskFillRule(horizon_hours=24),
+    ]
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    import memory_monitoring
+
+    alerts = queue.Queue()
+    engine = AlertEngine(default_rules(), alert_queue=alerts)
+    engine.add_rule(ThresholdRule("memory_demo", "memory.percent", above=0, hysteresis=0))
+    engine.subscribe(lambda alert: print(f"[{alert.state.upper()}] {alert.message}"))
+
+    for _ in range(6):
+        values = disk_usage_values(disk_monitoring.scan_partitions())
+        values["memory.percent"] = memory_monitoring.get_memory_usage_percentage()
+        engine.process(values)
+        time.sleep(1)
+
+    for rule in engine.rules:
+        if isinstance(rule, DiskFillRule):
+            for metric, hours in rule.forecast().items():
+                print(f"{metric}: {'not filling up' if hours is None else f'full in {hours:.1f} hours'}")
+    print(f"{alerts.qsize()} alert(s) queued")
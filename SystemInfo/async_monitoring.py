@@ -0,0 +1,264 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cpu_monitoring
+import disk_monitoring
+import memory_monitoring
+import network_monitoring
+import process_monitoring
+from snapshot import Snapshot
+
+MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Get the shared, bounded executor that runs blocking collector calls.
+
+    Returns:
+        ThreadPoolExecutor: The shared executor.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="systeminfo")
+        return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function on the shared executor.
+
+    Args:
+        func (callable): Function to run.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        The function's result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+# CPU
+
+async def get_cpu_usage(interval=None, sampler=None):
+    """
+    Get CPU utilization without blocking the event loop.
+
+    Args:
+        interval (float, optional): If given, measure over this many seconds
+            using asyncio.sleep; otherwise measure since the previous call.
+        sampler (CpuSampler, optional): Sampler to use. Defaults to the module-wide one.
+
+    Returns:
+        CpuUsage: Total, per-core and breakdown percentages.
+    """
+    if interval is not None:
+        sampler = cpu_monitoring.CpuSampler()
+        await run_blocking(sampler.sample)
+        await asyncio.sleep(interval)
+    elif sampler is None:
+        sampler = cpu_monitoring._default_sampler
+    return await run_blocking(sampler.sample)
+
+
+async def get_cpu_usage_per_core(interval=None):
+    return (await get_cpu_usage(interval)).per_core
+
+
+async def get_total_cpu_usage(interval=None):
+    return (await get_cpu_usage(interval)).total
+
+
+async def get_cpu_frequency():
+    cpufreq = await run_blocking(cpu_monitoring._get_cpu_freq)
+    return {"current": cpufreq.current, "min": cpufreq.min, "max": cpufreq.max}
+
+
+# Memory
+
+async def get_memory_info():
+    return await run_blocking(memory_monitoring.get_memory_info)
+
+
+async def get_memory_usage_percentage():
+    return await run_blocking(memory_monitoring.get_memory_usage_percentage)
+
+
+async def get_swap_space_info():
+    return await run_blocking(memory_monitoring.get_swap_space_info)
+
+
+# Disk
+
+async def get_disk_info():
+    return await run_blocking(disk_monitoring.get_disk_info)
+
+
+async def get_disk_usage_percentage():
+    return await run_blocking(disk_monitoring.get_disk_usage_percentage)
+
+
+async def get_individual_disk_info():
+    return await run_blocking(disk_monitoring.get_individual_disk_info)
+
+
+async def get_disk_io_rates():
+    return await run_blocking(disk_monitoring.get_disk_io_rates)
+
+
+# Network
+
+async def get_network_interfaces_info():
+    return await run_blocking(network_monitoring.get_network_interfaces_info)
+
+
+async def get_bandwidth_usage():
+    return await run_blocking(network_monitoring.get_bandwidth_usage)
+
+
+async def get_packets_sent_received():
+    return await run_blocking(network_monitoring.get_packets_sent_received)
+
+
+async def stream_interface_rates(interval=1, duration=None, stats_interval=30):
+    """
+    Async version of network_monitoring.stream_interface_rates.
+
+    Args:
+        interval (float): Time interval between measurements.
+        duration (float, optional): Total duration; runs forever if None.
+        stats_interval (float): Seconds between interface stats refreshes.
+
+    Yields:
+        InterfaceRate: One record per interface per interval.
+    """
+    rates = network_monitoring.NetworkIORates(stats_interval=stats_interval)
+    await run_blocking(rates.sample)
+    end_time = time.time() + duration if duration is not None else None
+
+    while end_time is None or time.time() < end_time:
+        await asyncio.sleep(interval)
+        for rate in await run_blocking(rates.sample):
+            yield rate
+
+
+# GPU (GPUtil is only imported when a GPU metric is requested)
+
+async def get_gpu_info():
+    import gpu_monitoring
+    return await run_blocking(gpu_monitoring.get_all_gpus_info)
+
+
+async def get_gpu_temperature(index=0):
+    import gpu_monitoring
+    return await run_blocking(gpu_monitoring.get_gpu_temperature, index)
+
+
+async def get_gpu_memory_used(index=0):
+    import gpu_monitoring
+    return await run_blocking(gpu_monitoring.get_gpu_memory_used, index)
+
+
+async def get_gpu_load(index=0):
+    import gpu_monitoring
+    return await run_blocking(gpu_monitoring.get_gpu_load, index)
+
+
+# Processes
+
+async def list_running_processes():
+    return await run_blocking(process_monitoring.list_running_processes)
+
+
+async def top_processes(n=20, key="cpu"):
+    return await run_blocking(process_monitoring.top_processes, n, key)
+
+
+async def sample_processes(pids, interval=1.0, sampler=None):
+    """
+    Async version of process_monitoring.sample_processes.
+
+    The shared wait for pids without a baseline is an asyncio.sleep, so
+    the event loop and the executor stay free.
+
+    Args:
+        pids (iterable): Process IDs.
+        interval (float): Wait used only for pids sampled for the first time.
+        sampler (ProcessSampler, optional): Sampler to use. Defaults to the module-wide one.
+
+    Returns:
+        dict: pid mapped to ProcessUsage; exited pids are dropped.
+    """
+    sampler = sampler or process_monitoring._default_sampler
+    pids = list(pids)
+    if await run_blocking(sampler.prime, pids):
+        await asyncio.sleep(interval)
+    return await run_blocking(sampler.collect, pids)
+
+
+async def process_resource_usage(pid, interval=1.0):
+    usage = (await sample_processes([pid], interval)).get(pid)
+    if usage is None:
+        return {}
+    return {
+        "PID": pid,
+        "CPU Percent": usage.cpu_percent,
+        "Memory Usage": process_monitoring.format_bytes(usage.rss),
+    }
+
+
+# Snapshots
+
+async def get_snapshot(processes=True):
+    return await run_blocking(Snapshot, processes)
+
+
+async def stream_snapshots(period=1.0, processes=False, count=None):
+    """
+    Yield a fresh Snapshot every period.
+
+    Ticks are scheduled at a fixed rate, so slow collections do not make
+    the stream drift; a tick that is already late starts immediately.
+
+    Args:
+        period (float): Seconds between snapshots.
+        processes (bool): Whether snapshots include the process table.
+        count (int, optional): Stop after this many snapshots.
+
+    Yields:
+        Snapshot: One snapshot per period.
+    """
+    next_tick = time.monotonic()
+    taken = 0
+    while count is None or taken < count:
+        yield await get_snapshot(processes)
+        taken += 1
+        next_tick += period
+        await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    async def main():
+        cpu, memory, disks = await asyncio.gather(
+            get_cpu_usage(interval=1),
+            get_memory_info(),
+            get_individual_disk_info(),
+        )
+        print(f"CPU Usage: {cpu.total}% (per core: {cpu.per_core})")
+        print(f"Memory: {memory['used']} / {memory['total']} GB")
+        print(f"Disks: {[disk['mountpoint'] for disk in disks]}")
+
+        async for snapshot in stream_snapshots(period=0.5, count=3):
+            print(f"Snapshot at {snapshot.timestamp:.2f}: memory {snapshot.memory.virtual.percent}%")
+
+    asyncio.run(main())
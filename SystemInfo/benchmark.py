@@ -0,0 +1,390 @@
+import argparse
+import contextlib
+import importlib
+import inspect
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, namedtuple
+
+import psutil
+
+from timeseries import percentile
+
+MODULES = (
+    "cpu_monitoring",
+    "disk_monitoring",
+    "gpu_monitoring",
+    "memory_monitoring",
+    "network_monitoring",
+    "process_monitoring",
+    "system_monitoring",
+)
+
+# Functions that are destructive, run for a fixed duration or reach out to the network.
+EXCLUDED = {
+    "terminate_process",
+    "real_time_network_monitoring",
+    "stream_interface_rates",
+    "get_connection_status",
+}
+
+# Arguments for public functions that have required parameters.
+ARGUMENTS = {
+    "convert_bytes_to_gb": (123456789,),
+    "format_bytes": (123456789,),
+    "format_time": (12345.6,),
+    "process_resource_usage": (os.getpid(),),
+    "sample_processes": ([os.getpid()],),
+}
+
+# Audit events counted per call; see the "Audit events table" in the Python docs.
+AUDIT_EVENTS = {"open", "subprocess.Popen", "os.listdir", "os.scandir", "socket.connect", "os.system"}
+
+FakePartition = namedtuple("FakePartition", ["device", "mountpoint", "fstype", "opts"])
+Timing = namedtuple("Timing", ["name", "latencies", "allocated", "peak", "events", "read_syscalls"])
+
+_event_counts = Counter()
+_counting = False
+_hook_installed = False
+
+
+def _audit_hook(event, args):
+    if _counting and event in AUDIT_EVENTS:
+        _event_counts[event] += 1
+
+
+def _install_audit_hook():
+    """
+    Install the audit hook on first use.
+
+    Audit hooks cannot be removed, so merely importing this module must not
+    add one to the importing process.
+    """
+    global _hook_installed
+    if not _hook_installed:
+        sys.addaudithook(_audit_hook)
+        _hook_installed = True
+
+
+@contextlib.contextmanager
+def count_events():
+    """
+    Count file opens, subprocess spawns and similar audit events.
+
+    Yields:
+        Counter: Event name mapped to count, filled in when the block exits.
+    """
+    global _counting
+    _install_audit_hook()
+    _event_counts.clear()
+    _counting = True
+    counts = Counter()
+    try:
+        yield counts
+    finally:
+        _counting = False
+        counts.update(_event_counts)
+
+
+def _read_syscalls():
+    """
+    Get the read/write syscall counters of this process, on Linux only.
+
+    Returns:
+        int: syscr + syscw from /proc/self/io, or None if unavailable.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":") for line in f)
+        return int(fields["syscr"]) + int(fields["syscw"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def public_functions(module):
+    """
+    Get the benchmarkable public functions of a module.
+
+    Args:
+        module: Imported monitoring module.
+
+    Returns:
+        list: (name, function, args) tuples.
+    """
+    functions = []
+    for name, func in inspect.getmembers(module, inspect.isfunction):
+        if name.startswith("_") or name in EXCLUDED or func.__module__ != module.__name__:
+            continue
+        args = ARGUMENTS.get(name, ())
+        required = [
+            p for p in inspect.signature(func).parameters.values()
+            if p.default is p.empty and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+        ]
+        if len(required) > len(args):
+            continue
+        functions.append((name, func, args))
+    return functions
+
+
+def time_function(name, func, args=(), iterations=20):
+    """
+    Measure one function.
+
+    The latency distribution comes from ``iterations`` plain calls. A
+    separate call under tracemalloc measures allocations, so tracing does
+    not distort the timings. Audit events and read/write syscalls are
+    averaged over the timed calls.
+
+    Args:
+        name (str): Name to report.
+        func (callable): Function to measure.
+        args (tuple): Arguments to call it with.
+        iterations (int): Number of timed calls.
+
+    Returns:
+        Timing: The measurements.
+    """
+    latencies = []
+    syscalls_before = _read_syscalls()
+    with count_events() as events:
+        for _ in range(iterations):
+            start = time.perf_counter_ns()
+            func(*args)
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+    syscalls_after = _read_syscalls()
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func(*args)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    read_syscalls = None
+    if syscalls_before is not None and syscalls_after is not None:
+        read_syscalls = (syscalls_after - syscalls_before) / iterations
+    return Timing(
+        name=name,
+        latencies=latencies,
+        allocated=after - before,
+        peak=peak - before,
+        events={event: count / iterations for event, count in events.items()},
+        read_syscalls=read_syscalls,
+    )
+
+
+def summarize_timing(timing):
+    """
+    Turn a Timing into a machine-readable result.
+
+    Args:
+        timing (Timing): Measurements of one function.
+
+    Returns:
+        dict: Latency distribution in microseconds plus allocation and call counts.
+    """
+    ordered = sorted(timing.latencies)
+    return {
+        "iterations": len(ordered),
+        "first_us": timing.latencies[0],
+        "min_us": ordered[0],
+        "mean_us": sum(ordered) / len(ordered),
+        "p50_us": percentile(ordered, 50),
+        "p95_us": percentile(ordered, 95),
+        "p99_us": percentile(ordered, 99),
+        "max_us": ordered[-1],
+        "allocated_bytes": timing.allocated,
+        "peak_bytes": timing.peak,
+        "events_per_call": timing.events,
+        "syscalls_per_call": timing.read_syscalls,
+    }
+
+
+@contextlib.contextmanager
+def synthetic_processes(count):
+    """
+    Run extra idle child processes for the duration of the block.
+
+    Args:
+        count (int): Number of processes to start.
+    """
+    children = []
+    try:
+        for _ in range(count):
+            children.append(subprocess.Popen(
+                [sys.executable, "-c", "import time; time.sleep(3600)"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            ))
+        yield children
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+@contextlib.contextmanager
+def synthetic_mounts(count):
+    """
+    Make psutil.disk_partitions report extra mounts for the duration of the block.
+
+    Each fake mount is a temporary directory, so statvfs on it succeeds
+    like on a real mount. They all live on one filesystem, which
+    disk_monitoring would rightly collapse into a single statvfs call, so
+    each one is given its own st_dev and fsid to be scanned like a
+    distinct mount.
+
+    Args:
+        count (int): Number of mounts to add.
+    """
+    import disk_monitoring
+
+    directory = tempfile.mkdtemp(prefix="systeminfo-mounts-")
+    real_disk_partitions = psutil.disk_partitions
+    real_statvfs_usage = disk_monitoring._statvfs_usage
+    fake = []
+    identities = {}
+    for i in range(count):
+        mountpoint = os.path.join(directory, f"mount{i}")
+        os.mkdir(mountpoint)
+        fake.append(FakePartition(f"overlay{i}", mountpoint, "overlay", "rw"))
+        # Negative ids cannot collide with real devices.
+        identities[mountpoint] = (-(i + 1), -(i + 1))
+
+    def statvfs_usage(mountpoint, started):
+        usage, st_dev, fsid = real_statvfs_usage(mountpoint, started)
+        return (usage,) + identities.get(mountpoint, (st_dev, fsid))
+
+    psutil.disk_partitions = lambda all=False: real_disk_partitions(all) + fake
+    disk_monitoring._statvfs_usage = statvfs_usage
+    try:
+        yield fake
+    finally:
+        psutil.disk_partitions = real_disk_partitions
+        disk_monitoring._statvfs_usage = real_statvfs_usage
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def run(iterations=20, modules=MODULES):
+    """
+    Benchmark every public function of the monitoring modules.
+
+    Args:
+        iterations (int): Timed calls per function.
+        modules (iterable): Module names to benchmark.
+
+    Returns:
+        dict: Module name mapped to function name mapped to its result; a
+        module that cannot be imported maps to {"error": message}.
+    """
+    results = {}
+    for module_name in modules:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            results[module_name] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        module_results = {}
+        for name, func, args in public_functions(module):
+            try:
+                module_results[name] = summarize_timing(time_function(name, func, args, iterations))
+            except Exception as e:
+                module_results[name] = {"error": f"{type(e).__name__}: {e}"}
+        results[module_name] = module_results
+    return results
+
+
+def environment():
+    """
+    Describe the machine the benchmark ran on.
+
+    Returns:
+        dict: Platform, Python and psutil details.
+    """
+    return {
+        "timestamp": time.time(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "psutil": psutil.__version__,
+        "cpu_count": psutil.cpu_count(),
+        "process_count": len(psutil.pids()),
+    }
+
+
+def compare(baseline, current, threshold=0.2, metric="p50_us"):
+    """
+    Find functions that got slower between two benchmark results.
+
+    Args:
+        baseline (dict): Earlier output of the benchmark.
+        current (dict): Later output of the benchmark.
+        threshold (float): Relative slowdown reported as a regression.
+        metric (str): Latency statistic to compare.
+
+    Returns:
+        list: (scenario, module, function, old, new) tuples of regressions.
+    """
+    regressions = []
+    for scenario, modules in current["scenarios"].items():
+        for module, functions in modules.items():
+            old_functions = baseline["scenarios"].get(scenario, {}).get(module, {})
+            if "error" in functions or "error" in old_functions:
+                continue
+            for name, result in functions.items():
+                old = old_functions.get(name, {}).get(metric)
+                new = result.get(metric)
+                if old and new and new > old * (1 + threshold):
+                    regressions.append((scenario, module, name, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every SystemInfo getter.")
+    parser.add_argument("--iterations", type=int, default=20, help="timed calls per function")
+    parser.add_argument("--processes", type=int, default=0, help="also run with this many extra processes")
+    parser.add_argument("--mounts", type=int, default=0, help="also run with this many extra mounts")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="report regressions against an earlier JSON result")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "scenarios": {}}
+    # The getters print their errors; keep stdout for the JSON report.
+    with contextlib.redirect_stdout(sys.stderr):
+        report["scenarios"]["baseline"] = run(args.iterations)
+        if args.processes:
+            with synthetic_processes(args.processes):
+                report["scenarios"][f"processes_{args.processes}"] = run(args.iterations, ["process_monitoring"])
+        if args.mounts:
+            with synthetic_mounts(args.mounts):
+                report["scenarios"][f"mounts_{args.mounts}"] = run(args.iterations, ["disk_monitoring"])
+
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for scenario, module, name, old, new in regressions:
+            print(f"REGRESSION {scenario} {module}.{name}: {old:.1f} us -> {new:.1f} us", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+import os
+import time
+from collections import namedtuple
+
+CgroupCounters = namedtuple("CgroupCounters", [
+    "path", "cpu_usec", "cpu_user_usec", "cpu_system_usec", "throttled_usec",
+    "memory_current", "memory_limit", "read_bytes", "write_bytes", "read_ops", "write_ops",
+])
+CgroupRate = namedtuple("CgroupRate", [
+    "path", "cpu_percent", "user_percent", "system_percent", "throttled_percent",
+    "memory_current", "memory_limit", "memory_percent",
+    "read_bytes_per_sec", "write_bytes_per_sec", "read_iops", "write_iops",
+])
+
+# cgroup v1 controller directories, in the order they are looked up.
+V1_CONTROLLERS = {
+    "cpuacct": ("cpuacct", "cpu,cpuacct", "cpuacct,cpu"),
+    "cpu": ("cpu", "cpu,cpuacct", "cpuacct,cpu"),
+    "memory": ("memory",),
+    "blkio": ("blkio",),
+}
+
+# Memory limits at or above this are cgroup v1's way of saying "no limit".
+V1_UNLIMITED = 2 ** 62
+
+
+def _read_text(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_int(path):
+    text = _read_text(path)
+    if text is None:
+        return None
+    text = text.strip()
+    if text == "max":
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def _read_keyed(path):
+    """
+    Parse a flat "key value" file such as cpu.stat into a dict of ints.
+    """
+    text = _read_text(path)
+    values = {}
+    if text is None:
+        return values
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) == 2:
+            try:
+                values[fields[0]] = int(fields[1])
+            except ValueError:
+                continue
+    return values
+
+
+class CgroupMonitor:
+    """
+    Per-cgroup CPU, memory and I/O accounting read from the cgroup filesystem.
+
+    cgroup v2 (a unified hierarchy with cgroup.controllers at the root) is
+    preferred; otherwise the v1 cpuacct, cpu, memory and blkio hierarchies
+    are used. Counters are turned into rates against the previous sample of
+    the same cgroup, so one pass over the tree per tick is all it costs.
+
+    Args:
+        root (str): Where the cgroup filesystem is mounted; point this at a
+            fixture tree to read recorded data.
+        proc_root (str): Where procfs is mounted, for pid to cgroup lookups.
+        max_depth (int, optional): Only list cgroups this many levels below the root.
+    """
+
+    def __init__(self, root="/sys/fs/cgroup", proc_root="/proc", max_depth=None):
+        self.root = root
+        self.proc_root = proc_root
+        self.max_depth = max_depth
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._last_counters = {}
+        self._last_time = None
+        self._pid_cgroups = {}
+
+        if os.path.exists(os.path.join(root, "cgroup.controllers")):
+            self.version = 2
+            self._controllers = {}
+        else:
+            self._controllers = {}
+            for controller, names in V1_CONTROLLERS.items():
+                for name in names:
+                    if os.path.isdir(os.path.join(root, name)):
+                        self._controllers[controller] = os.path.join(root, name)
+                        break
+            self.version = 1 if self._controllers else None
+
+    def _dir(self, path, controller=None):
+        base = self.root if self.version == 2 else self._controllers.get(controller)
+        if base is None:
+            return None
+        return os.path.join(base, path.lstrip("/"))
+
+    def _walk(self, base):
+        paths = []
+        for directory, subdirectories, _ in os.walk(base):
+            relative = os.path.relpath(directory, base)
+            depth = 0 if relative == "." else relative.count(os.sep) + 1
+            if self.max_depth is not None and depth >= self.max_depth:
+                subdirectories[:] = []
+            paths.append("/" if relative == "." else "/" + relative.replace(os.sep, "/"))
+        return paths
+
+    def list_cgroups(self):
+        """
+        List the cgroups under the root.
+
+        Returns:
+            list: Cgroup paths such as "/" or "/system.slice/sshd.service".
+        """
+        if self.version == 2:
+            return self._walk(self.root)
+        paths = set()
+        for controller in ("cpuacct", "memory", "blkio"):
+            base = self._controllers.get(controller)
+            if base is not None:
+                paths.update(self._walk(base))
+        return sorted(paths)
+
+    def read(self, path):
+        """
+        Read the raw counters of one cgroup.
+
+        Missing files (controllers that are not enabled, or the root cgroup
+        that has no memory.current) leave their fields at None.
+
+        Args:
+            path (str): Cgroup path relative to the root.
+
+        Returns:
+            CgroupCounters: The counters; CPU times in microseconds.
+        """
+        if self.version == 2:
+            return self._read_v2(path)
+        return self._read_v1(path)
+
+    def _read_v2(self, path):
+        directory = self._dir(path)
+        cpu = _read_keyed(os.path.join(directory, "cpu.stat"))
+        read_bytes = write_bytes = read_ops = write_ops = None
+        io = _read_text(os.path.join(directory, "io.stat"))
+        if io is not None:
+            read_bytes = write_bytes = read_ops = write_ops = 0
+            # One line per device: "8:0 rbytes=1 wbytes=2 rios=3 wios=4 dbytes=0 dios=0".
+            for line in io.splitlines():
+                fields = dict(field.split("=", 1) for field in line.split()[1:] if "=" in field)
+                read_bytes += int(fields.get("rbytes", 0))
+                write_bytes += int(fields.get("wbytes", 0))
+                read_ops += int(fields.get("rios", 0))
+                write_ops += int(fields.get("wios", 0))
+        return CgroupCounters(
+            path=path,
+            cpu_usec=cpu.get("usage_usec"),
+            cpu_user_usec=cpu.get("user_usec"),
+            cpu_system_usec=cpu.get("system_usec"),
+            throttled_usec=cpu.get("throttled_usec"),
+            memory_current=_read_int(os.path.join(directory, "memory.current")),
+            memory_limit=_read_int(os.path.join(directory, "memory.max")),
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            read_ops=read_ops,
+            write_ops=write_ops,
+        )
+
+    def _read_v1(self, path):
+        cpu_usec = cpu_user_usec = cpu_system_usec = throttled_usec = None
+        cpuacct = self._dir(path, "cpuacct")
+        if cpuacct is not None:
+            usage = _read_int(os.path.join(cpuacct, "cpuacct.usage"))
+            cpu_usec = usage // 1000 if usage is not None else None
+            stat = _read_keyed(os.path.join(cpuacct, "cpuacct.stat"))
+            if "user" in stat:
+                cpu_user_usec = stat["user"] * 1000000 // self._ticks
+            if "system" in stat:
+                cpu_system_usec = stat["system"] * 1000000 // self._ticks
+        cpu = self._dir(path, "cpu")
+        if cpu is not None:
+            throttled = _read_keyed(os.path.join(cpu, "cpu.stat")).get("throttled_time")
+            throttled_usec = throttled // 1000 if throttled is not None else None
+
+        memory_current = memory_limit = None
+        memory = self._dir(path, "memory")
+        if memory is not None:
+            memory_current = _read_int(os.path.join(memory, "memory.usage_in_bytes"))
+            memory_limit = _read_int(os.path.join(memory, "memory.limit_in_bytes"))
+            if memory_limit is not None and memory_limit >= V1_UNLIMITED:
+                memory_limit = None
+
+        read_bytes = write_bytes = read_ops = write_ops = None
+        blkio = self._dir(path, "blkio")
+        if blkio is not None:
+            read_bytes, write_bytes = self._read_blkio(os.path.join(blkio, "blkio.throttle.io_service_bytes"))
+            read_ops, write_ops = self._read_blkio(os.path.join(blkio, "blkio.throttle.io_serviced"))
+
+        return CgroupCounters(
+            path=path,
+            cpu_usec=cpu_usec,
+            cpu_user_usec=cpu_user_usec,
+            cpu_system_usec=cpu_system_usec,
+            throttled_usec=throttled_usec,
+            memory_current=memory_current,
+            memory_limit=memory_limit,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            read_ops=read_ops,
+            write_ops=write_ops,
+        )
+
+    @staticmethod
+    def _read_blkio(path):
+        text = _read_text(path)
+        if text is None:
+            return None, None
+        read = write = 0
+        # "8:0 Read 4096" lines per device, then a "Total 8192" line.
+        for line in text.splitlines():
+            fields = line.split()
+            if len(fields) == 3 and fields[1] == "Read":
+                read += int(fields[2])
+            elif len(fields) == 3 and fields[1] == "Write":
+                write += int(fields[2])
+        return read, write
+
+    def sample(self, paths=None):
+        """
+        Compute rates since the previous sample.
+
+        A cgroup seen for the first time has no baseline yet, so its rates
+        are None on that sample; memory figures are always filled in.
+
+        Args:
+            paths (iterable, optional): Cgroups to sample. Defaults to every
+                cgroup under the root.
+
+        Returns:
+            list: CgroupRate entries, one per cgroup.
+        """
+        if paths is None:
+            paths = self.list_cgroups()
+        now = time.monotonic()
+        elapsed = now - self._last_time if self._last_time is not None else None
+
+        counters = {}
+        rates = []
+        for path in paths:
+            current = self.read(path)
+            counters[path] = current
+            previous = self._last_counters.get(path)
+
+            def rate(field, scale=1.0):
+                value = getattr(current, field)
+                if previous is None or not elapsed or value is None or getattr(previous, field) is None:
+                    return None
+                # Counters restart when a cgroup is removed and re-created.
+                return max(value - getattr(previous, field), 0) / elapsed * scale
+
+            limit = current.memory_limit
+            rates.append(CgroupRate(
+                path=path,
+                # CPU time in microseconds per second of wall time, as a percent of one CPU.
+                cpu_percent=rate("cpu_usec", 1e-4),
+                user_percent=rate("cpu_user_usec", 1e-4),
+                system_percent=rate("cpu_system_usec", 1e-4),
+                throttled_percent=rate("throttled_usec", 1e-4),
+                memory_current=current.memory_current,
+                memory_limit=limit,
+                memory_percent=(current.memory_current / limit * 100
+                                if current.memory_current is not None and limit else None),
+                read_bytes_per_sec=rate("read_bytes"),
+                write_bytes_per_sec=rate("write_bytes"),
+                read_iops=rate("read_ops"),
+                write_iops=rate("write_ops"),
+            ))
+
+        self._last_counters = counters
+        self._last_time = now
+        return rates
+
+    def cgroup_of(self, pid):
+        """
+        Get the cgroup a process belongs to.
+
+        On cgroup v1 every controller has its own path; the most specific
+        one among cpuacct, memory and blkio is returned.
+
+        Args:
+            pid (int): Process ID.
+
+        Returns:
+            str: Cgroup path, or None if the process is gone.
+        """
+        text = _read_text(os.path.join(self.proc_root, str(pid), "cgroup"))
+        if text is None:
+            return None
+        best = None
+        for line in text.splitlines():
+            hierarchy, controllers, path = line.split(":", 2)
+            if self.version == 2:
+                if hierarchy == "0":
+                    return path
+            elif set(controllers.split(",")) & {"cpuacct", "memory", "blkio"}:
+                if best is None or path.count("/") > best.count("/") or best == "/":
+                    best = path
+        return best
+
+    def map_processes(self, processes):
+        """
+        Map processes to their cgroups.
+
+        Lookups are cached per (pid, create_time), so a recycled pid is
+        looked up afresh when the entries carry their create time. Plain
+        pids are cached per pid; entries missing from ``processes`` are
+        dropped from the cache, so a recycled plain pid is only missed if it
+        was reused between two consecutive calls.
+
+        Args:
+            processes (iterable): ProcessRow entries from
+                process_monitoring.ProcessTable, or plain process IDs.
+
+        Returns:
+            dict: Cgroup path mapped to the list of its entries, as passed in.
+        """
+        cache = {}
+        groups = {}
+        for process in processes:
+            pid = getattr(process, "pid", process)
+            key = (pid, getattr(process, "create_time", None))
+            path = self._pid_cgroups.get(key)
+            if path is None:
+                path = self.cgroup_of(pid)
+                if path is None:
+                    continue
+            cache[key] = path
+            groups.setdefault(path, []).append(process)
+        self._pid_cgroups = cache
+        return groups
+
+
+_default_monitor = None
+
+
+def get_default_monitor():
+    """
+    Get the shared monitor used by the module-level getters.
+
+    Returns:
+        CgroupMonitor: The shared monitor.
+    """
+    global _default_monitor
+    if _default_monitor is None:
+        _default_monitor = CgroupMonitor()
+    return _default_monitor
+
+
+def get_cgroup_usage(paths=None):
+    """
+    Get per-cgroup CPU, memory and I/O rates since the previous call.
+
+    Args:
+        paths (iterable, optional): Cgroups to sample. Defaults to all of them.
+
+    Returns:
+        list: A list containing dictionaries with the rates of each cgroup.
+    """
+    try:
+        return [rate._asdict() for rate in get_default_monitor().sample(paths)]
+    except Exception as e:
+        print(f"Error getting cgroup usage: {e}")
+        return []
+
+
+def get_process_cgroup(pid):
+    try:
+        return get_default_monitor().cgroup_of(pid)
+    except Exception as e:
+        print(f"Error getting cgroup of process {pid}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    import psutil
+
+    monitor = CgroupMonitor(max_depth=2)
+    print(f"cgroup version: {monitor.version}")
+    monitor.sample()
+    time.sleep(1)
+    for rate in monitor.sample():
+        cpu = f"{rate.cpu_percent:.1f}%" if rate.cpu_percent is not None else "N/A"
+        memory = f"{rate.memory_current / 1024 ** 2:.1f} MB" if rate.memory_current is not None else "N/A"
+        print(f"{rate.path:<50} CPU: {cpu:>7}  Memory: {memory:>10}")
+
+    print("\nProcesses per cgroup:")
+    for path, pids in monitor.map_processes(psutil.pids()).items():
+        print(f"{path}: {len(pids)} processes")
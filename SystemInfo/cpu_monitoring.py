@@ -1,28 +1,152 @@
 import psutil
+import threading
+from collections import namedtuple
 
-def get_cpu_physical_cores():
-    return psutil.cpu_count(logical=False)
+import procfs
+import static_facts
 
-def get_cpu_logical_cores():
-    return psutil.cpu_count(logical=True)
+CpuUsage = namedtuple("CpuUsage", ["total", "per_core", "user", "system", "iowait", "steal"])
 
-def get_max_cpu_frequency():
-    cpufreq = psutil.cpu_freq()
+def get_cpu_physical_cores(snapshot=None):
+    if snapshot is not None:
+        return snapshot.cpu.physical_cores
+    return static_facts.get_physical_cores()
+
+def get_cpu_logical_cores(snapshot=None):
+    if snapshot is not None:
+        return snapshot.cpu.logical_cores
+    return static_facts.get_logical_cores()
+
+def _get_cpu_freq(snapshot=None):
+    if snapshot is not None:
+        return snapshot.cpu.freq
+    return psutil.cpu_freq()
+
+def get_max_cpu_frequency(snapshot=None):
+    cpufreq = _get_cpu_freq(snapshot)
     return cpufreq.max
 
-def get_min_cpu_frequency():
-    cpufreq = psutil.cpu_freq()
+def get_min_cpu_frequency(snapshot=None):
+    cpufreq = _get_cpu_freq(snapshot)
     return cpufreq.min
 
-def get_current_cpu_frequency():
-    cpufreq = psutil.cpu_freq()
+def get_current_cpu_frequency(snapshot=None):
+    cpufreq = _get_cpu_freq(snapshot)
     return cpufreq.current
 
-def get_cpu_usage_per_core():
-    return psutil.cpu_percent(percpu=True, interval=1)
+class CpuSampler:
+    """
+    Non-blocking CPU utilization sampler.
+
+    Keeps the previous ``cpu_times(percpu=True)`` counters and reports
+    utilization as the delta since the last call, so no sampling interval
+    has to be slept through. The first call is measured against zero, which
+    yields the average utilization since boot instead of a meaningless 0.0.
+    """
+
+    def __init__(self):
+        self._last_times = None
+        self._last_usage = None
+        self._lock = threading.Lock()
+
+    def sample(self, snapshot=None):
+        """
+        Compute utilization since the previous sample.
+
+        Args:
+            snapshot (Snapshot, optional): Read the counters from this snapshot instead of psutil.
+
+        Returns:
+            CpuUsage: Total and per-core busy percentages, plus the user,
+            system, iowait and steal share of total CPU time.
+        """
+        with self._lock:
+            return self._sample(snapshot)
+
+    def _sample(self, snapshot):
+        if snapshot is not None:
+            percpu_times = snapshot.cpu.percpu_times
+        else:
+            percpu_times = procfs.get_source().cpu_times(percpu=True)
+
+        last_times = self._last_times or [None] * len(percpu_times)
+        if len(last_times) != len(percpu_times):
+            # CPUs were hot-plugged; start over from absolute counters.
+            last_times = [None] * len(percpu_times)
+
+        per_core = []
+        totals = {"all": 0.0, "busy": 0.0, "user": 0.0, "system": 0.0, "iowait": 0.0, "steal": 0.0}
+        for current, previous in zip(percpu_times, last_times):
+            delta = _cpu_times_delta(current, previous)
+            per_core.append(_percent(delta["busy"], delta["all"]))
+            for field in totals:
+                totals[field] += delta[field]
+
+        if totals["all"] <= 0 and self._last_usage is not None:
+            # Called again before any clock tick elapsed; keep the baseline.
+            return self._last_usage
+
+        self._last_times = list(percpu_times)
+        self._last_usage = CpuUsage(
+            total=_percent(totals["busy"], totals["all"]),
+            per_core=per_core,
+            user=_percent(totals["user"], totals["all"]),
+            system=_percent(totals["system"], totals["all"]),
+            iowait=_percent(totals["iowait"], totals["all"]),
+            steal=_percent(totals["steal"], totals["all"]),
+        )
+        return self._last_usage
+
+def _cpu_times_delta(current, previous):
+    """
+    Compute the per-field difference between two cpu_times entries.
+
+    Args:
+        current: Current psutil cpu_times entry.
+        previous: Previous entry, or None to measure against zero.
+
+    Returns:
+        dict: Elapsed all, busy, user, system, iowait and steal times.
+    """
+    def field(name):
+        value = getattr(current, name, 0.0)
+        if previous is not None:
+            value -= getattr(previous, name, 0.0)
+        return max(value, 0.0)
+
+    # Guest time is already accounted for in user time on Linux.
+    all_time = sum(field(name) for name in current._fields) - field("guest") - field("guest_nice")
+    idle_time = field("idle") + field("iowait")
+    return {
+        "all": all_time,
+        "busy": all_time - idle_time,
+        "user": field("user") + field("nice"),
+        "system": field("system") + field("irq") + field("softirq"),
+        "iowait": field("iowait"),
+        "steal": field("steal"),
+    }
+
+def _percent(part, whole):
+    if whole <= 0:
+        return 0.0
+    return round(min(max(part / whole * 100, 0.0), 100.0), 1)
+
+_default_sampler = CpuSampler()
+
+def get_cpu_usage_per_core(snapshot=None):
+    return _default_sampler.sample(snapshot).per_core
+
+def get_total_cpu_usage(snapshot=None):
+    return _default_sampler.sample(snapshot).total
 
-def get_total_cpu_usage():
-    return psutil.cpu_percent()
+def get_cpu_usage_breakdown(snapshot=None):
+    usage = _default_sampler.sample(snapshot)
+    return {
+        "user": usage.user,
+        "system": usage.system,
+        "iowait": usage.iowait,
+        "steal": usage.steal,
+    }
 
 if __name__ == "__main__":
     print("Number of physical CPU cores:", get_cpu_physical_cores())
@@ -31,4 +155,5 @@ if __name__ == "__main__":
     print("Min CPU Frequency (MHz):", get_min_cpu_frequency())
     print("Current CPU Frequency (MHz):", get_current_cpu_frequency())
     print("CPU Usage Per Core:", get_cpu_usage_per_core())
-    print("Total CPU Usage:", get_total_cpu_usage())
\ No newline at end of file
+    print("Total CPU Usage:", get_total_cpu_usage())
+    print("CPU Usage Breakdown:", get_cpu_usage_breakdown())
\ No newline at end of file
@@ -1,5 +1,38 @@
+import math
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
 import psutil
 
+import procfs
+
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free", "percent"])
+DiskIORate = namedtuple("DiskIORate", [
+    "device", "read_bytes_per_sec", "write_bytes_per_sec", "read_iops", "write_iops",
+    "await_ms", "utilization", "mountpoints",
+])
+PartitionScan = namedtuple("PartitionScan", ["device", "mountpoint", "fstype", "status", "usage", "st_dev", "fsid"])
+
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_SKIPPED = "skipped"
+
+PSEUDO_FSTYPES = frozenset([
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devpts",
+    "devtmpfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "proc", "pstore", "securityfs",
+    "sysfs", "tracefs",
+])
+
+# Mountpoints whose statvfs call is still hanging from an earlier scan.
+# Scans can run concurrently, so it is only touched under _hung_lock.
+_hung_mounts = {}
+_hung_lock = threading.Lock()
+
 def convert_bytes_to_gb(bytes_value):
     """
     Convert bytes to gigabytes.
@@ -13,10 +46,461 @@ def convert_bytes_to_gb(bytes_value):
     gb_value = bytes_value / (1024 ** 3)  # 1 GB = 1024^3 bytes
     return round(gb_value, 2)
 
-def get_disk_info():
+def used_ratio(usage):
+    """
+    Get the unrounded share of a filesystem in use.
+
+    Like psutil's percent, blocks reserved for root are left out, but the
+    value is not rounded, so slow growth is visible long before it moves
+    the percent by 0.1.
+
+    Args:
+        usage: DiskUsage or psutil disk_usage result.
+
+    Returns:
+        float: used / (used + free), or None for an empty filesystem.
+    """
+    capacity = usage.used + usage.free
+    return usage.used / capacity if capacity else None
+
+
+def _statvfs_usage(mountpoint, started):
+    started[mountpoint] = time.monotonic()
+    st = os.statvfs(mountpoint)
+    total = st.f_blocks * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    # Same formula as psutil/df: the percentage ignores root-reserved blocks.
+    usable = used + free
+    percent = round(used / usable * 100, 1) if usable else 0.0
+    usage = DiskUsage(total=total, used=used, free=free, percent=percent)
+    return usage, os.stat(mountpoint).st_dev, st.f_fsid
+
+class DeviceIndex:
+    """
+    Index of which mountpoints share the same underlying filesystem.
+
+    Bind mounts and repeated mounts of one block device share an ``st_dev``.
+    Once a scan has filled the index, later scans passed the same index only
+    stat one mountpoint per device and reuse its result for the others.
+    """
+
+    def __init__(self):
+        self._by_device = {}
+        self._by_mountpoint = {}
+
+    def update(self, scans):
+        """
+        Rebuild the index from a list of PartitionScan results.
+
+        Args:
+            scans (list): Results of scan_partitions.
+        """
+        by_device = {}
+        by_mountpoint = {}
+        for scan in scans:
+            if scan.status != STATUS_OK:
+                continue
+            by_device.setdefault(scan.st_dev, []).append(scan.mountpoint)
+            by_mountpoint[scan.mountpoint] = (scan.device, scan.st_dev)
+        self._by_device = by_device
+        self._by_mountpoint = by_mountpoint
+
+    def device_of(self, mountpoint, device=None):
+        """
+        Get the st_dev recorded for a mountpoint.
+
+        Args:
+            mountpoint (str): Mountpoint to look up.
+            device (str, optional): Device name currently mounted there; if it
+                differs from the recorded one the entry is treated as unknown.
+
+        Returns:
+            int: The st_dev, or None if the mountpoint is not indexed.
+        """
+        entry = self._by_mountpoint.get(mountpoint)
+        if entry is None or (device is not None and entry[0] != device):
+            return None
+        return entry[1]
+
+    def mountpoints(self, st_dev):
+        """
+        Get every indexed mountpoint of a device.
+
+        Args:
+            st_dev (int): Device id.
+
+        Returns:
+            list: Mountpoints sharing this device.
+        """
+        return list(self._by_device.get(st_dev, []))
+
+    def devices(self):
+        """
+        Get the device to mountpoints mapping.
+
+        Returns:
+            dict: st_dev mapped to the list of its mountpoints.
+        """
+        return {st_dev: list(mountpoints) for st_dev, mountpoints in self._by_device.items()}
+
+_device_index = DeviceIndex()
+
+def unique_filesystems(scans):
+    """
+    Drop scan results that describe a filesystem already listed.
+
+    Two results are the same filesystem if they share the st_dev, the
+    statvfs f_fsid, or the block device they were mounted from.
+
+    Args:
+        scans (iterable): PartitionScan results.
+
+    Returns:
+        list: The first successful scan of each distinct filesystem.
+    """
+    seen_devs = set()
+    seen_fsids = set()
+    seen_block_devices = set()
+    unique = []
+    for scan in scans:
+        if scan.status != STATUS_OK:
+            continue
+        block_device = os.path.realpath(scan.device) if scan.device.startswith("/dev/") else None
+        if (scan.st_dev in seen_devs or (scan.fsid and scan.fsid in seen_fsids)
+                or (block_device is not None and block_device in seen_block_devices)):
+            continue
+        seen_devs.add(scan.st_dev)
+        if scan.fsid:
+            seen_fsids.add(scan.fsid)
+        if block_device is not None:
+            seen_block_devices.add(block_device)
+        unique.append(scan)
+    return unique
+
+def _run_daemon_pool(jobs, max_workers):
+    """
+    Run jobs on a bounded set of daemon threads.
+
+    concurrent.futures.ThreadPoolExecutor joins its workers at interpreter
+    exit, so a statvfs call stuck on a dead mount would hang shutdown too.
+    Daemon workers are simply abandoned instead; the caller starts a
+    replacement with the returned function so the queued jobs keep moving.
+
+    Args:
+        jobs (list): (callable, args) pairs.
+        max_workers (int): Number of worker threads to start with.
+
+    Returns:
+        tuple: (futures, add_worker) with one Future per job, in job order,
+        and a function that starts one more worker.
+    """
+    work = queue.Queue()
+    futures = []
+    for func, args in jobs:
+        future = Future()
+        futures.append(future)
+        work.put((future, func, args))
+
+    def worker():
+        while True:
+            try:
+                future, func, args = work.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def add_worker():
+        if not work.empty():
+            threading.Thread(target=worker, name="disk-scan", daemon=True).start()
+
+    for _ in range(min(max_workers, len(futures))):
+        add_worker()
+    return futures, add_worker
+
+def scan_partitions(timeout=2.0, max_workers=8, all_partitions=False,
+                    exclude_fstypes=PSEUDO_FSTYPES, include_fstypes=None, exclude_prefixes=(),
+                    index=None):
+    """
+    Read the usage of every partition concurrently with a per-mount timeout.
+
+    A hung NFS or FUSE mount is reported with status "timeout" instead of
+    blocking the scan. Its worker thread cannot be interrupted, so a
+    replacement worker is started for the mounts queued behind it, and the
+    mount is remembered and skipped by later scans until the call returns.
+    Mounts that never got a worker before the overall deadline are reported
+    as "skipped", not "timeout".
+
+    Args:
+        timeout (float): Seconds a single statvfs call may take.
+        max_workers (int): Size of the thread pool.
+        all_partitions (bool): Passed to psutil.disk_partitions as ``all``.
+        exclude_fstypes (iterable): Filesystem types to skip.
+        include_fstypes (iterable, optional): If given, only scan these filesystem types.
+        exclude_prefixes (iterable): Mountpoint prefixes to skip.
+        index (DeviceIndex, optional): Stat only one mountpoint per already
+            indexed device, then refresh the index with the results.
+
+    Returns:
+        list: PartitionScan entries in partition order.
+    """
+    partitions = []
+    for partition in psutil.disk_partitions(all=all_partitions):
+        if partition.fstype in exclude_fstypes:
+            continue
+        if include_fstypes is not None and partition.fstype not in include_fstypes:
+            continue
+        if any(partition.mountpoint.startswith(prefix) for prefix in exclude_prefixes):
+            continue
+        partitions.append(partition)
+
+    results = {}
+    started = {}
+    mountpoints = []
+    aliases = {}
+    representatives = {}
+    for partition in partitions:
+        st_dev = index.device_of(partition.mountpoint, partition.device) if index is not None else None
+        if st_dev is not None:
+            if st_dev in representatives:
+                aliases[partition.mountpoint] = representatives[st_dev]
+                continue
+            representatives[st_dev] = partition.mountpoint
+        with _hung_lock:
+            hung = _hung_mounts.get(partition.mountpoint)
+            if hung is not None and not hung.done():
+                results[partition.mountpoint] = (STATUS_TIMEOUT, None, None, None)
+                continue
+            _hung_mounts.pop(partition.mountpoint, None)
+        mountpoints.append(partition.mountpoint)
+
+    jobs = [(_statvfs_usage, (mountpoint, started)) for mountpoint in mountpoints]
+    pool_futures, add_worker = _run_daemon_pool(jobs, max_workers)
+    futures = dict(zip(pool_futures, mountpoints))
+
+    # Worst case every batch of workers runs into the timeout.
+    deadline = time.monotonic() + timeout * max(math.ceil(len(futures) / max_workers), 1)
+    pending = set(futures)
+    while pending:
+        now = time.monotonic()
+        expiries = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+        wait_for = min(expiries + [deadline]) - now
+        done, pending = wait(pending, timeout=max(wait_for, 0.01), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            mountpoint = futures[future]
+            try:
+                results[mountpoint] = (STATUS_OK,) + future.result()
+            except Exception:
+                results[mountpoint] = (STATUS_ERROR, None, None, None)
+
+        now = time.monotonic()
+        for future in list(pending):
+            mountpoint = futures[future]
+            start = started.get(mountpoint)
+            if start is not None:
+                if now - start > timeout:
+                    pending.discard(future)
+                    with _hung_lock:
+                        _hung_mounts[mountpoint] = future
+                    results[mountpoint] = (STATUS_TIMEOUT, None, None, None)
+                    add_worker()
+            elif now >= deadline and future.cancel():
+                pending.discard(future)
+                results[mountpoint] = (STATUS_SKIPPED, None, None, None)
+
+    for mountpoint, representative in aliases.items():
+        results[mountpoint] = results[representative]
+
+    scans = []
+    for partition in partitions:
+        status, usage, st_dev, fsid = results[partition.mountpoint]
+        scans.append(PartitionScan(
+            device=partition.device,
+            mountpoint=partition.mountpoint,
+            fstype=partition.fstype,
+            status=status,
+            usage=usage,
+            st_dev=st_dev,
+            fsid=fsid,
+        ))
+
+    if index is not None:
+        index.update(scans)
+    return scans
+
+def _iter_partition_usage(snapshot=None):
+    """
+    Yield the scan result of each partition.
+
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
+    Yields:
+        PartitionScan: One entry per partition, including slow or failed ones.
+    """
+    if snapshot is not None:
+        yield from snapshot.disk.partitions
+        return
+
+    yield from scan_partitions(index=_device_index)
+
+def _block_device_name(device):
+    """
+    Get the kernel block device name (as used by disk_io_counters) of a device path.
+
+    Args:
+        device (str): Device path such as /dev/sda1 or /dev/mapper/root.
+
+    Returns:
+        str: Kernel name such as sda1 or dm-0.
+    """
+    return os.path.basename(os.path.realpath(device))
+
+def _parent_disk(name):
+    """
+    Get the whole disk a partition belongs to, using sysfs on Linux.
+
+    Args:
+        name (str): Kernel block device name.
+
+    Returns:
+        str: The parent disk name, or None if this is not a partition.
+    """
+    path = os.path.realpath(os.path.join("/sys/class/block", name))
+    if os.path.exists(os.path.join(path, "partition")):
+        return os.path.basename(os.path.dirname(path))
+    return None
+
+def map_devices_to_mountpoints(partitions=None):
+    """
+    Map kernel block device names to the mountpoints on them.
+
+    Whole disks are also mapped to the mountpoints of their partitions.
+
+    Args:
+        partitions (iterable, optional): Partitions or PartitionScan results.
+            Defaults to psutil.disk_partitions().
+
+    Returns:
+        dict: Device name mapped to a list of mountpoints.
+    """
+    if partitions is None:
+        partitions = psutil.disk_partitions()
+
+    mapping = {}
+    for partition in partitions:
+        if not partition.device.startswith("/dev/"):
+            continue
+        name = _block_device_name(partition.device)
+        mapping.setdefault(name, []).append(partition.mountpoint)
+        parent = _parent_disk(name)
+        if parent is not None:
+            mapping.setdefault(parent, []).append(partition.mountpoint)
+    return mapping
+
+class DiskIORates:
+    """
+    Per-disk I/O throughput and latency computed from counter deltas.
+
+    The first sample is measured against zero since boot, so it reports the
+    average rates since boot instead of nothing. Reading the counters and
+    replacing the previous ones happen under a lock, so one instance can be
+    sampled from several threads.
+    """
+
+    def __init__(self):
+        self._last_counters = {}
+        self._last_time = None
+        self._lock = threading.Lock()
+
+    def sample(self, snapshot=None):
+        """
+        Compute rates since the previous sample.
+
+        Args:
+            snapshot (Snapshot, optional): Read counters and partitions from this snapshot.
+
+        Returns:
+            list: DiskIORate entries, one per device.
+        """
+        # Mapping devices may scan the partitions; keep it outside the lock.
+        mountpoints = map_devices_to_mountpoints(snapshot.disk.partitions if snapshot is not None else None)
+        with self._lock:
+            return self._sample(snapshot, mountpoints)
+
+    def _sample(self, snapshot, mountpoints):
+        if snapshot is not None:
+            counters = snapshot.disk.io_counters or {}
+            now = snapshot.timestamp
+        else:
+            counters = procfs.get_source().disk_io_counters(perdisk=True) or {}
+            now = time.time()
+
+        last_time = self._last_time if self._last_time is not None else psutil.boot_time()
+        elapsed = now - last_time
+
+        rates = []
+        for device, current in counters.items():
+            previous = self._last_counters.get(device)
+
+            def delta(field):
+                value = getattr(current, field, 0)
+                if previous is not None:
+                    value -= getattr(previous, field, 0)
+                # Counters can wrap or be reset when a device is re-attached.
+                return max(value, 0)
+
+            operations = delta("read_count") + delta("write_count")
+            io_time = delta("read_time") + delta("write_time")
+            rates.append(DiskIORate(
+                device=device,
+                read_bytes_per_sec=delta("read_bytes") / elapsed if elapsed > 0 else 0.0,
+                write_bytes_per_sec=delta("write_bytes") / elapsed if elapsed > 0 else 0.0,
+                read_iops=delta("read_count") / elapsed if elapsed > 0 else 0.0,
+                write_iops=delta("write_count") / elapsed if elapsed > 0 else 0.0,
+                await_ms=io_time / operations if operations else 0.0,
+                # busy_time is in milliseconds and only reported on Linux.
+                utilization=min(delta("busy_time") / (elapsed * 10), 100.0) if elapsed > 0 else 0.0,
+                mountpoints=mountpoints.get(device, []),
+            ))
+
+        self._last_counters = counters
+        self._last_time = now
+        return rates
+
+_default_io_rates = DiskIORates()
+
+def get_disk_io_rates(snapshot=None):
+    """
+    Get per-disk I/O rates since the previous call.
+
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
+    Returns:
+        list: A list containing dictionaries with I/O rates for each disk.
+    """
+    try:
+        return [rate._asdict() for rate in _default_io_rates.sample(snapshot)]
+    except Exception as e:
+        print(f"Error getting disk I/O rates: {e}")
+        return []
+
+def get_disk_info(snapshot=None):
     """
     Get disk information including total, used, and free disk space for all disks.
 
+    Each filesystem is counted once, even if it is mounted several times.
+
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         dict: A dictionary containing disk information.
     """
@@ -27,52 +511,62 @@ def get_disk_info():
     }
 
     try:
-        partitions = psutil.disk_partitions()
-        for partition in partitions:
-            partition_info = psutil.disk_usage(partition.mountpoint)
-            total_disk_info["total"] += partition_info.total
-            total_disk_info["used"] += partition_info.used
-            total_disk_info["free"] += partition_info.free
+        for partition in unique_filesystems(_iter_partition_usage(snapshot)):
+            total_disk_info["total"] += partition.usage.total
+            total_disk_info["used"] += partition.usage.used
+            total_disk_info["free"] += partition.usage.free
 
     except Exception as e:
         print(f"Error getting disk information: {e}")
 
     return total_disk_info
 
-def get_disk_usage_percentage():
+def get_disk_usage_percentage(snapshot=None):
     """
     Get the current disk usage as a percentage for all disks.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         float: Current disk usage percentage.
     """
     try:
-        disk_usage_percentage = psutil.disk_usage('/').percent
+        if snapshot is not None and snapshot.disk.usage.get('/') is not None:
+            disk_usage_percentage = snapshot.disk.usage['/'].percent
+        else:
+            disk_usage_percentage = psutil.disk_usage('/').percent
     except Exception as e:
         print(f"Error getting disk usage percentage: {e}")
         disk_usage_percentage = None
 
     return disk_usage_percentage
 
-def get_individual_disk_info():
+def get_individual_disk_info(snapshot=None):
     """
     Get information about each individual disk.
 
+    Mounts that timed out or failed are listed with their status and no sizes.
+
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         list: A list containing dictionaries with information for each disk.
     """
     individual_disk_info = []
 
     try:
-        partitions = psutil.disk_partitions()
-        for partition in partitions:
-            partition_info = psutil.disk_usage(partition.mountpoint)
+        for partition in _iter_partition_usage(snapshot):
+            usage = partition.usage
             disk_info = {
                 "device": partition.device,
                 "mountpoint": partition.mountpoint,
-                "total": convert_bytes_to_gb(partition_info.total),
-                "used": convert_bytes_to_gb(partition_info.used),
-                "free": convert_bytes_to_gb(partition_info.free),
+                "status": partition.status,
+                "total": convert_bytes_to_gb(usage.total) if usage else None,
+                "used": convert_bytes_to_gb(usage.used) if usage else None,
+                "free": convert_bytes_to_gb(usage.free) if usage else None,
+                "percent": usage.percent if usage else None,
             }
             individual_disk_info.append(disk_info)
 
@@ -99,6 +593,16 @@ if __name__ == "__main__":
         for disk in individual_disk_info:
             print(f"\nDevice: {disk['device']}")
             print(f"Mountpoint: {disk['mountpoint']}")
+            print(f"Status: {disk['status']}")
             print(f"Total: {disk['total']} GB")
             print(f"Used: {disk['used']} GB")
             print(f"Free: {disk['free']} GB")
+
+    disk_io_rates = get_disk_io_rates()
+    if disk_io_rates:
+        print("\nDisk I/O Rates (since boot):")
+        for rate in disk_io_rates:
+            print(f"\nDevice: {rate['device']} {rate['mountpoints']}")
+            print(f"Read: {rate['read_bytes_per_sec'] / 1024 ** 2:.2f} MB/s, {rate['read_iops']:.1f} IOPS")
+            print(f"Write: {rate['write_bytes_per_sec'] / 1024 ** 2:.2f} MB/s, {rate['write_iops']:.1f} IOPS")
+            print(f"Await: {rate['await_ms']:.2f} ms, Utilization: {rate['utilization']:.1f}%")
@@ -0,0 +1,228 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from timeseries import MetricStore, SystemMetricsCollector
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json"
+
+# Local-only by default: the metrics reveal process names, mounts and
+# interfaces. 9100 is node_exporter's port, so it is left to node_exporter.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9110
+
+# Metric name prefix mapped to the Prometheus family prefix and the label
+# taken from the middle part of the name, e.g. "disk.sda.utilization".
+LABELLED_METRICS = (
+    ("cpu.core.", "systeminfo_cpu_core", "core"),
+    ("collector.", "systeminfo_collector", "collector"),
+    ("disk.", "systeminfo_disk", "device"),
+    ("net.", "systeminfo_network", "interface"),
+    ("mount.", "systeminfo_filesystem", "mountpoint"),
+    ("gpu.", "systeminfo_gpu", "gpu"),
+)
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_name(name):
+    """
+    Translate a collector metric name into a Prometheus family and labels.
+
+    Args:
+        name (str): Metric name such as "cpu.total" or "net.eth0.bytes_sent_per_sec".
+
+    Returns:
+        tuple: (family name, label string), the label string possibly empty.
+    """
+    for prefix, family, label in LABELLED_METRICS:
+        if name.startswith(prefix):
+            rest = name[len(prefix):]
+            if "." in rest:
+                value, field = rest.rsplit(".", 1)
+                return f"{family}_{field}", f'{{{label}="{_escape_label(value)}"}}'
+            return family, f'{{{label}="{_escape_label(rest)}"}}'
+    return "systeminfo_" + name.replace(".", "_"), ""
+
+
+def render_prometheus(values):
+    """
+    Render metric values in the Prometheus text exposition format.
+
+    Args:
+        values (dict): Metric name mapped to value.
+
+    Returns:
+        bytes: The rendered page.
+    """
+    families = {}
+    for name, value in values.items():
+        if value is None:
+            continue
+        family, labels = prometheus_name(name)
+        families.setdefault(family, []).append(f"{family}{labels} {float(value)!r}")
+
+    lines = []
+    for family in sorted(families):
+        lines.append(f"# TYPE {family} gauge")
+        lines.extend(families[family])
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
+def render_json(values, timestamp):
+    """
+    Render metric values as JSON.
+
+    Args:
+        values (dict): Metric name mapped to value.
+        timestamp (float): Collection time.
+
+    Returns:
+        bytes: The rendered document.
+    """
+    return json.dumps({"timestamp": timestamp, "metrics": values}, sort_keys=True).encode()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    # Every response has a Content-Length, so scrapers can keep the
+    # connection open between scrapes.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            self._send(self.server.exporter.prometheus_page, PROMETHEUS_CONTENT_TYPE)
+        elif path in ("/metrics.json", "/json"):
+            self._send(self.server.exporter.json_page, JSON_CONTENT_TYPE)
+        else:
+            self._send(b"Not Found\n", "text/plain", status=404)
+
+    def _send(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsExporter:
+    """
+    HTTP endpoint serving the current metrics as Prometheus text and JSON.
+
+    Metrics are collected by a background thread once per interval and
+    rendered into cached bytes right away. Request handlers only send those
+    bytes, so any number of concurrent scrapes never triggers extra psutil
+    or nvidia-smi work.
+
+    Args:
+        collector (SystemMetricsCollector, optional): Source of the metric
+            values. Defaults to one recording into a small MetricStore.
+        interval (float): Seconds between collections.
+        host (str): Address to listen on. Defaults to loopback only; pass
+            "0.0.0.0" or "::" to serve other hosts, e.g. a FleetAggregator.
+        port (int): Port to listen on; 0 picks a free port.
+    """
+
+    def __init__(self, collector=None, interval=5.0, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.collector = collector or SystemMetricsCollector(MetricStore(retention=720))
+        self.interval = interval
+        self.host = host
+        self.port = port
+        self.prometheus_page = b""
+        self.json_page = b"{}"
+        self.last_values = {}
+        self._server = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def address(self):
+        """
+        The (host, port) the server is bound to, or None before start.
+        """
+        return self._server.server_address if self._server is not None else None
+
+    def collect_once(self):
+        """
+        Collect and render the metrics once, replacing the cached pages.
+        """
+        try:
+            values = self.collector.collect()
+        except Exception as e:
+            print(f"Error collecting metrics for export: {e}")
+            return
+        timestamp = time.time()
+        self.last_values = values
+        # Each page is replaced by a single assignment, so handlers always
+        # see a complete page.
+        self.prometheus_page = render_prometheus(values)
+        self.json_page = render_json(values, timestamp)
+
+    def _collect_loop(self):
+        while not self._stop.wait(self.interval):
+            self.collect_once()
+
+    def start(self):
+        """
+        Collect once, then start the collection thread and the HTTP server.
+
+        Returns:
+            tuple: The (host, port) the server is bound to.
+        """
+        self.collect_once()
+        self._server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.exporter = self
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._collect_loop, name="metrics-collector", daemon=True),
+            threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self.address
+
+    def stop(self):
+        """
+        Stop the HTTP server and the collection thread.
+        """
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve SystemInfo metrics over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help="address to listen on; use 0.0.0.0 to allow scrapes from other hosts")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between collections")
+    args = parser.parse_args(argv)
+
+    exporter = MetricsExporter(interval=args.interval, host=args.host, port=args.port)
+    host, port = exporter.start()
+    print(f"Serving metrics on http://{host}:{port}/metrics and /metrics.json")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        exporter.stop()
+        print("\nMetrics exporter stopped.")
+
+
+if __name__ == "__main__":
+    main()
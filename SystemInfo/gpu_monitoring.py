@@ -1,33 +1,239 @@
-import GPUtil
+import subprocess
+import threading
+import time
+from collections import namedtuple
 
-def get_gpu_temperature():
-    try:
-        gpus = GPUtil.getGPUs()
-        if gpus:
-            return gpus[0].temperature
-    except Exception:
-        pass
-    return None
-
-def get_gpu_memory_used():
-    try:
-        gpus = GPUtil.getGPUs()
-        if gpus:
-            return gpus[0].memoryUsed
-    except Exception:
-        pass
-    return None
-
-def get_gpu_load():
+GpuInfo = namedtuple("GpuInfo", ["index", "name", "temperature", "memory_used", "memory_total", "load"])
+
+NVIDIA_SMI_FIELDS = "index,name,temperature.gpu,memory.used,memory.total,utilization.gpu"
+
+
+class GPUtilBackend:
+    """
+    Query every GPU through GPUtil (one nvidia-smi spawn per query).
+    """
+
+    def __call__(self):
+        # Imported here so that loading this module never requires GPUtil.
+        import GPUtil
+        return [
+            GpuInfo(
+                index=gpu.id,
+                name=gpu.name,
+                temperature=gpu.temperature,
+                memory_used=gpu.memoryUsed,
+                memory_total=gpu.memoryTotal,
+                load=gpu.load * 100,
+            )
+            for gpu in GPUtil.getGPUs()
+        ]
+
+
+class NvidiaSmiBackend:
+    """
+    Query every GPU by running nvidia-smi directly.
+
+    Args:
+        command (str): nvidia-smi executable; point this at a fake script to
+            test without a GPU.
+        timeout (float): Seconds to wait for nvidia-smi before giving up.
+    """
+
+    def __init__(self, command="nvidia-smi", timeout=5.0):
+        self.command = command
+        self.timeout = timeout
+
+    def __call__(self):
+        output = subprocess.check_output(
+            [self.command, f"--query-gpu={NVIDIA_SMI_FIELDS}", "--format=csv,noheader,nounits"],
+            timeout=self.timeout,
+            universal_newlines=True,
+        )
+        return parse_nvidia_smi(output)
+
+
+def parse_nvidia_smi(output):
+    """
+    Parse the CSV output of nvidia-smi --query-gpu.
+
+    Fields that are missing or reported as "[N/A]" come back as None; rows
+    without a readable index are skipped.
+
+    Args:
+        output (str): Output of nvidia-smi with --format=csv,noheader,nounits.
+
+    Returns:
+        list: GpuInfo entries.
+    """
+    width = len(GpuInfo._fields)
+    devices = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        values = [v.strip() for v in line.split(",")]
+        values += [""] * (width - len(values))
+        index, name, temperature, memory_used, memory_total, load = values[:width]
+        try:
+            index = int(index)
+        except ValueError:
+            continue
+        devices.append(GpuInfo(
+            index=index,
+            name=name or None,
+            temperature=_parse_float(temperature),
+            memory_used=_parse_float(memory_used),
+            memory_total=_parse_float(memory_total),
+            load=_parse_float(load),
+        ))
+    return devices
+
+
+def _parse_float(value):
     try:
-        gpus = GPUtil.getGPUs()
-        if gpus:
-            return gpus[0].load * 100
-    except Exception:
-        pass
-    return None
+        return float(value)
+    except ValueError:
+        # nvidia-smi reports "[N/A]" for unsupported fields; missing ones are "".
+        return None
+
+
+class GpuPoller:
+    """
+    Poll all GPUs in a background thread and cache the results.
+
+    One backend query is made per interval, no matter how many getters read
+    the cache. Cached devices older than ``max_age`` are treated as missing.
+
+    Args:
+        backend (callable, optional): Returns a list of GpuInfo. Defaults to GPUtilBackend.
+        interval (float): Seconds between background queries.
+        max_age (float, optional): Staleness window in seconds. Defaults to twice the interval.
+    """
+
+    def __init__(self, backend=None, interval=1.0, max_age=None):
+        self.backend = backend or GPUtilBackend()
+        self.interval = interval
+        self.max_age = max_age if max_age is not None else interval * 2
+        self.last_error = None
+        self._devices = []
+        self._updated = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """
+        Run one backend query and update the cache.
+
+        Returns:
+            list: The devices returned by the backend, or an empty list on error.
+        """
+        try:
+            devices = list(self.backend())
+        except Exception as e:
+            self.last_error = e
+            return []
+
+        with self._lock:
+            self._devices = devices
+            self._updated = time.monotonic()
+            self.last_error = None
+        return devices
+
+    def start(self):
+        """
+        Fill the cache once, then start the background polling thread if it
+        is not already running.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.poll()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gpu-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background polling thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def get_devices(self):
+        """
+        Get the cached devices, querying synchronously if the background
+        thread is not running and nothing fresh is cached.
+
+        Returns:
+            list: Cached GpuInfo entries, or an empty list if they are stale.
+        """
+        if self._thread is None and not self._is_fresh():
+            self.poll()
+        with self._lock:
+            return list(self._devices) if self._is_fresh() else []
+
+    def get_device(self, index=0):
+        """
+        Get a single cached device.
+
+        Args:
+            index (int): GPU index as reported by the backend.
+
+        Returns:
+            GpuInfo: The device, or None if it is unknown or stale.
+        """
+        for device in self.get_devices():
+            if device.index == index:
+                return device
+        return None
+
+    def _is_fresh(self):
+        return self._updated is not None and time.monotonic() - self._updated <= self.max_age
+
+
+_default_poller = None
+_default_lock = threading.Lock()
+
+
+def get_default_poller():
+    """
+    Get the shared poller used by the module-level getters, starting it on first use.
+
+    Returns:
+        GpuPoller: The shared poller.
+    """
+    global _default_poller
+    with _default_lock:
+        if _default_poller is None:
+            poller = GpuPoller()
+            poller.start()
+            _default_poller = poller
+        return _default_poller
+
+
+def get_gpu_temperature(index=0):
+    device = get_default_poller().get_device(index)
+    return device.temperature if device else None
+
+def get_gpu_memory_used(index=0):
+    device = get_default_poller().get_device(index)
+    return device.memory_used if device else None
+
+def get_gpu_load(index=0):
+    device = get_default_poller().get_device(index)
+    return device.load if device else None
+
+def get_all_gpus_info():
+    return [device._asdict() for device in get_default_poller().get_devices()]
 
 if __name__ == "__main__":
     print("GPU Temperature (°C):", get_gpu_temperature())
     print("GPU Memory Used (MB):", get_gpu_memory_used())
-    print("GPU Load (%):", get_gpu_load())
\ No newline at end of file
+    print("GPU Load (%):", get_gpu_load())
+    for gpu in get_all_gpus_info():
+        print(f"GPU {gpu['index']} ({gpu['name']}): {gpu['temperature']} °C, {gpu['memory_used']} MB, {gpu['load']}%")
@@ -0,0 +1,257 @@
+import functools
+import importlib
+import inspect
+import threading
+import time
+import tracemalloc
+from types import FunctionType
+
+MODULES = (
+    "cpu_monitoring",
+    "disk_monitoring",
+    "gpu_monitoring",
+    "memory_monitoring",
+    "network_monitoring",
+    "process_monitoring",
+    "system_monitoring",
+    "snapshot",
+)
+
+
+class CollectorStats:
+    """
+    Call counters and timings of every instrumented collector.
+
+    "total_seconds" includes the time spent in instrumented collectors
+    called from within, so nested collectors are counted in each caller;
+    "self_seconds" excludes it and sums to the real time spent. Allocated
+    bytes are inclusive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, elapsed, error=False, allocated=None, self_elapsed=None):
+        """
+        Add one call to a collector's counters.
+
+        Args:
+            name (str): Collector name, "module.function" or "module.Class.method".
+            elapsed (float): Wall time of the call in seconds.
+            error (bool): Whether the call raised.
+            allocated (int, optional): Net bytes allocated during the call.
+            self_elapsed (float, optional): Wall time outside nested
+                collectors. Defaults to elapsed.
+        """
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None:
+                entry = self._stats[name] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_seconds": 0.0,
+                    "self_seconds": 0.0,
+                    "last_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "allocated_bytes": 0,
+                }
+            entry["calls"] += 1
+            entry["total_seconds"] += elapsed
+            entry["self_seconds"] += elapsed if self_elapsed is None else self_elapsed
+            entry["last_seconds"] = elapsed
+            if elapsed > entry["max_seconds"]:
+                entry["max_seconds"] = elapsed
+            if error:
+                entry["errors"] += 1
+            if allocated is not None:
+                entry["allocated_bytes"] += allocated
+
+    def get(self, name):
+        """
+        Get the counters of one collector.
+
+        Args:
+            name (str): Collector name.
+
+        Returns:
+            dict: A copy of its counters, or None if it was never called.
+        """
+        with self._lock:
+            entry = self._stats.get(name)
+            return dict(entry) if entry is not None else None
+
+    def as_dict(self):
+        """
+        Get the counters of every collector.
+
+        Returns:
+            dict: Collector name mapped to a copy of its counters.
+        """
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._stats.items()}
+
+    def top(self, n=10, key="total_seconds"):
+        """
+        Get the collectors with the highest value of one counter.
+
+        Args:
+            n (int): Number of collectors to return.
+            key (str): Counter to sort by.
+
+        Returns:
+            list: (name, counters) pairs, highest first.
+        """
+        return sorted(self.as_dict().items(), key=lambda item: item[1][key], reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+stats = CollectorStats()
+
+_originals = []
+_track_allocations = False
+# Per thread, the time spent in nested collectors of each active call.
+_active = threading.local()
+
+
+def _wrap(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nested = getattr(_active, "nested", None)
+        if nested is None:
+            nested = _active.nested = []
+        tracing = _track_allocations and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        nested.append(0.0)
+        start = time.perf_counter()
+        error = False
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = nested.pop()
+            if nested:
+                nested[-1] += elapsed
+            allocated = tracemalloc.get_traced_memory()[0] - before if tracing else None
+            stats.record(name, elapsed, error, allocated, elapsed - inner)
+    return wrapper
+
+
+def _instrumentable(value):
+    """
+    Check whether a function can be timed by wrapping it.
+
+    Generator and coroutine functions return before any of their body has
+    run, so a wrapper would only time the creation of the generator.
+    """
+    return (isinstance(value, FunctionType)
+            and not inspect.isgeneratorfunction(value)
+            and not inspect.iscoroutinefunction(value)
+            and not inspect.isasyncgenfunction(value))
+
+
+def _patch(owner, attribute, name):
+    original = owner.__dict__[attribute]
+    _originals.append((owner, attribute, original))
+    setattr(owner, attribute, _wrap(name, original))
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def enable(modules=MODULES, track_allocations=False):
+    """
+    Wrap the public functions and methods of the monitoring modules.
+
+    Instrumentation replaces module and class attributes, so it has no cost
+    at all while disabled. Code that imported a function by name before
+    ``enable`` keeps calling the unwrapped original. Modules that cannot be
+    imported (e.g. gpu_monitoring without GPUtil) are skipped, and so are
+    generator and coroutine functions.
+
+    Args:
+        modules (iterable): Module names to instrument.
+        track_allocations (bool): Also count allocated bytes; starts tracemalloc,
+            which slows every allocation in the process.
+    """
+    global _track_allocations
+    if is_enabled():
+        return
+    _track_allocations = track_allocations
+    if track_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    for module_name in modules:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        for attribute, value in list(vars(module).items()):
+            if attribute.startswith("_") or getattr(value, "__module__", None) != module_name:
+                continue
+            if _instrumentable(value):
+                _patch(module, attribute, f"{module_name}.{attribute}")
+            elif isinstance(value, type) and not issubclass(value, tuple):
+                for method_name, method in list(vars(value).items()):
+                    if not method_name.startswith("_") and _instrumentable(method):
+                        _patch(value, method_name, f"{module_name}.{attribute}.{method_name}")
+
+
+def disable():
+    """
+    Restore every wrapped function and method.
+    """
+    global _track_allocations
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+    if _track_allocations and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _track_allocations = False
+
+
+def export_values():
+    """
+    Flatten the counters into metric values for stores and exporters.
+
+    Returns:
+        dict: Names like "collector.cpu_monitoring.get_total_cpu_usage.calls"
+        mapped to values; empty while instrumentation is disabled.
+    """
+    if not is_enabled():
+        return {}
+    values = {}
+    for name, entry in stats.as_dict().items():
+        for field in ("calls", "errors", "total_seconds", "self_seconds", "last_seconds"):
+            values[f"collector.{name}.{field}"] = entry[field]
+        if _track_allocations:
+            values[f"collector.{name}.allocated_bytes"] = entry["allocated_bytes"]
+    return values
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    enable()
+    import cpu_monitoring
+    import disk_monitoring
+    import memory_monitoring
+    import process_monitoring
+
+    for _ in range(3):
+        cpu_monitoring.get_cpu_usage_per_core()
+        memory_monitoring.get_memory_info()
+        disk_monitoring.get_individual_disk_info()
+        process_monitoring.list_running_processes()
+
+    print(f"{'Collector':<55} {'Calls':>6} {'Total (ms)':>11} {'Self (ms)':>10} {'Last (ms)':>10}")
+    for name, entry in stats.top(10, key="self_seconds"):
+        print(f"{name:<55} {entry['calls']:>6} {entry['total_seconds'] * 1000:>11.2f} "
+              f"{entry['self_seconds'] * 1000:>10.2f} {entry['last_seconds'] * 1000:>10.2f}")
+    disable()
@@ -1,4 +1,26 @@
+import os
 import psutil
+import time
+from collections import namedtuple
+
+import procfs
+import process_monitoring
+
+MemoryPressure = namedtuple("MemoryPressure", [
+    "some_avg10", "some_avg60", "some_avg300", "some_total",
+    "full_avg10", "full_avg60", "full_avg300", "full_total",
+])
+VmstatRates = namedtuple("VmstatRates", [
+    "page_faults_per_sec", "major_faults_per_sec", "swap_in_per_sec", "swap_out_per_sec",
+])
+ProcessFootprint = namedtuple("ProcessFootprint", ["pid", "name", "rss", "pss", "uss", "swap"])
+
+VMSTAT_FIELDS = {
+    b"pgfault": "page_faults_per_sec",
+    b"pgmajfault": "major_faults_per_sec",
+    b"pswpin": "swap_in_per_sec",
+    b"pswpout": "swap_out_per_sec",
+}
 
 def convert_bytes_to_gb(bytes_value):
     """
@@ -13,10 +35,13 @@ def convert_bytes_to_gb(bytes_value):
     gb_value = bytes_value / (1024 ** 3)  # 1 GB = 1024^3 bytes
     return round(gb_value, 2)
 
-def get_memory_info():
+def get_memory_info(snapshot=None):
     """
     Get memory information including total, used, and free memory.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         dict: A dictionary containing memory information.
     """
@@ -27,7 +52,7 @@ def get_memory_info():
     }
 
     try:
-        virtual_memory = psutil.virtual_memory()
+        virtual_memory = snapshot.memory.virtual if snapshot is not None else procfs.get_source().virtual_memory()
         memory_info["total"] = convert_bytes_to_gb(virtual_memory.total)
         memory_info["used"] = convert_bytes_to_gb(virtual_memory.used)
         memory_info["free"] = convert_bytes_to_gb(virtual_memory.free)
@@ -36,25 +61,32 @@ def get_memory_info():
 
     return memory_info
 
-def get_memory_usage_percentage():
+def get_memory_usage_percentage(snapshot=None):
     """
     Get the current memory usage as a percentage.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         float: Current memory usage percentage.
     """
     try:
-        memory_usage_percentage = psutil.virtual_memory().percent
+        virtual_memory = snapshot.memory.virtual if snapshot is not None else procfs.get_source().virtual_memory()
+        memory_usage_percentage = virtual_memory.percent
     except Exception as e:
         print(f"Error getting memory usage percentage: {e}")
         memory_usage_percentage = None
 
     return memory_usage_percentage
 
-def get_swap_space_info():
+def get_swap_space_info(snapshot=None):
     """
     Get swap space information including total, used, and free swap space.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         dict: A dictionary containing swap space information.
     """
@@ -65,7 +97,7 @@ def get_swap_space_info():
     }
 
     try:
-        swap_memory = psutil.swap_memory()
+        swap_memory = snapshot.memory.swap if snapshot is not None else psutil.swap_memory()
         swap_info["total"] = convert_bytes_to_gb(swap_memory.total)
         swap_info["used"] = convert_bytes_to_gb(swap_memory.used)
         swap_info["free"] = convert_bytes_to_gb(swap_memory.free)
@@ -74,6 +106,218 @@ def get_swap_space_info():
 
     return swap_info
 
+def get_memory_breakdown(snapshot=None):
+    """
+    Get an unrounded breakdown of memory, including available versus cached.
+
+    "available" is what can be allocated without swapping; "cached" is page
+    cache the kernel can reclaim, most of which is counted as available.
+    Fields the platform does not report are None.
+
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
+    Returns:
+        dict: A dictionary of memory figures in bytes.
+    """
+    breakdown = dict.fromkeys(["total", "available", "used", "free", "cached", "buffers", "shared",
+                               "active", "inactive"])
+    try:
+        virtual_memory = snapshot.memory.virtual if snapshot is not None else procfs.get_source().virtual_memory()
+        for field in breakdown:
+            breakdown[field] = getattr(virtual_memory, field, None)
+    except Exception as e:
+        print(f"Error getting memory breakdown: {e}")
+
+    return breakdown
+
+def get_memory_pressure(proc_root="/proc"):
+    """
+    Get kernel pressure stall information (PSI) for memory.
+
+    "some" is the share of time at least one task was stalled on memory,
+    "full" the share of time all non-idle tasks were; the averages are
+    percentages over 10, 60 and 300 seconds and the totals microseconds.
+
+    Args:
+        proc_root (str): Where procfs is mounted.
+
+    Returns:
+        MemoryPressure: The pressure figures, or None on kernels without PSI.
+    """
+    try:
+        with open(os.path.join(proc_root, "pressure", "memory")) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    values = {}
+    for line in lines:
+        kind, *fields = line.split()
+        for field in fields:
+            key, _, value = field.partition("=")
+            values[f"{kind}_{key}"] = int(value) if key == "total" else float(value)
+    # Older kernels have no "full" line for memory.
+    return MemoryPressure(*[values.get(field) for field in MemoryPressure._fields])
+
+class VmstatSampler:
+    """
+    Page-fault and swap rates computed from /proc/vmstat deltas.
+
+    The first sample is measured against zero since boot, so it reports the
+    average rates since boot instead of nothing. Swap rates are in pages
+    per second.
+
+    Args:
+        proc_root (str): Where procfs is mounted.
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self.path = os.path.join(proc_root, "vmstat")
+        self._last_counters = None
+        self._last_time = None
+
+    def _read(self):
+        counters = {}
+        with open(self.path, "rb") as f:
+            for line in f:
+                name, _, value = line.partition(b" ")
+                field = VMSTAT_FIELDS.get(name)
+                if field is not None:
+                    counters[field] = int(value)
+        return counters
+
+    def sample(self):
+        """
+        Compute rates since the previous sample.
+
+        Returns:
+            VmstatRates: Rates per second; fields missing from vmstat are None.
+        """
+        counters = self._read()
+        now = time.time()
+        last_time = self._last_time if self._last_time is not None else psutil.boot_time()
+        elapsed = now - last_time
+        previous = self._last_counters or {}
+
+        rates = {}
+        for field in VmstatRates._fields:
+            if field not in counters:
+                rates[field] = None
+                continue
+            delta = max(counters[field] - previous.get(field, 0), 0)
+            rates[field] = delta / elapsed if elapsed > 0 else 0.0
+
+        self._last_counters = counters
+        self._last_time = now
+        return VmstatRates(**rates)
+
+_default_vmstat = None
+
+def get_vmstat_rates():
+    """
+    Get page-fault and swap-in/out rates since the previous call.
+
+    Returns:
+        dict: A dictionary of rates per second, or an empty dict on error.
+    """
+    global _default_vmstat
+    try:
+        if _default_vmstat is None:
+            _default_vmstat = VmstatSampler()
+        return _default_vmstat.sample()._asdict()
+    except Exception as e:
+        print(f"Error getting vmstat rates: {e}")
+        return {}
+
+class FootprintScanner:
+    """
+    Opt-in PSS/USS scan of the processes using the most memory.
+
+    Each scan ranks all processes by RSS, which is cheap, and reads
+    /proc/<pid>/smaps_rollup only for the top N. The kernel walks every
+    page table entry to produce smaps_rollup, so results are cached per pid
+    and re-read only when the process's RSS changed (or the pid was reused).
+
+    Args:
+        n (int): Number of processes to scan.
+        proc_root (str): Where procfs is mounted.
+    """
+
+    def __init__(self, n=10, proc_root="/proc"):
+        self.n = n
+        self.proc_root = proc_root
+        self.reads = 0
+        self._cache = {}
+
+    def _read_rollup(self, pid):
+        values = {}
+        with open(os.path.join(self.proc_root, str(pid), "smaps_rollup"), "rb") as f:
+            for line in f:
+                name, _, rest = line.partition(b":")
+                fields = rest.split()
+                if len(fields) == 2 and fields[1] == b"kB":
+                    values[name] = int(fields[0]) * 1024
+        return values
+
+    def _footprint(self, row):
+        try:
+            values = self._read_rollup(row.pid)
+            uss = values.get(b"Private_Clean", 0) + values.get(b"Private_Dirty", 0)
+            return ProcessFootprint(row.pid, row.name, row.rss, values.get(b"Pss"), uss, values.get(b"Swap"))
+        except FileNotFoundError:
+            # Kernels before 4.14 have no smaps_rollup; psutil parses smaps instead.
+            info = psutil.Process(row.pid).memory_full_info()
+            return ProcessFootprint(row.pid, row.name, row.rss, getattr(info, "pss", None), info.uss,
+                                    getattr(info, "swap", None))
+
+    def scan(self):
+        """
+        Get PSS and USS for the top N processes by RSS.
+
+        Returns:
+            list: ProcessFootprint entries, highest RSS first; processes that
+            exited or cannot be read are left out.
+        """
+        cache = {}
+        footprints = []
+        for row in process_monitoring.top_processes(self.n, key="memory"):
+            key = (row.pid, row.create_time)
+            cached = self._cache.get(key)
+            if cached is not None and cached.rss == row.rss:
+                footprint = cached
+            else:
+                try:
+                    footprint = self._footprint(row)
+                except (OSError, psutil.Error):
+                    continue
+                self.reads += 1
+            cache[key] = footprint
+            footprints.append(footprint)
+        self._cache = cache
+        return footprints
+
+_default_scanner = None
+
+def get_process_footprints(n=10):
+    """
+    Get PSS and USS of the top N processes by RSS.
+
+    Args:
+        n (int): Number of processes to scan.
+
+    Returns:
+        list: A list containing dictionaries with the footprint of each process, in bytes.
+    """
+    global _default_scanner
+    try:
+        if _default_scanner is None or _default_scanner.n != n:
+            _default_scanner = FootprintScanner(n)
+        return [footprint._asdict() for footprint in _default_scanner.scan()]
+    except Exception as e:
+        print(f"Error getting process footprints: {e}")
+        return []
+
 if __name__ == "__main__":
     # Example usage and demonstration
     memory_info = get_memory_info()
@@ -91,3 +335,23 @@ if __name__ == "__main__":
     print(f"Total Swap Space: {swap_info['total']} GB")
     print(f"Used Swap Space: {swap_info['used']} GB")
     print(f"Free Swap Space: {swap_info['free']} GB")
+
+    breakdown = get_memory_breakdown()
+    print("\nMemory Breakdown:")
+    print(f"Available: {process_monitoring.format_bytes(breakdown['available'])}")
+    print(f"Cached: {process_monitoring.format_bytes(breakdown['cached'] or 0)}")
+
+    pressure = get_memory_pressure()
+    if pressure is not None:
+        print(f"\nMemory Pressure: some {pressure.some_avg10}%, full {pressure.full_avg10}% (10 s average)")
+
+    get_vmstat_rates()
+    time.sleep(1)
+    rates = get_vmstat_rates()
+    print(f"Page Faults: {rates['page_faults_per_sec']:.0f}/s, Major: {rates['major_faults_per_sec']:.0f}/s")
+    print(f"Swap In/Out: {rates['swap_in_per_sec']:.0f}/{rates['swap_out_per_sec']:.0f} pages/s")
+
+    print("\nTop 5 Processes by Footprint:")
+    for footprint in get_process_footprints(5):
+        print(f"PID: {footprint['pid']}, Name: {footprint['name']}, RSS: {process_monitoring.format_bytes(footprint['rss'])}, "
+              f"PSS: {process_monitoring.format_bytes(footprint['pss'] or 0)}, USS: {process_monitoring.format_bytes(footprint['uss'])}")
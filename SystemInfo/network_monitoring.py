@@ -1,5 +1,16 @@
 import psutil
+import socket
+import threading
 import time
+from collections import namedtuple
+
+import procfs
+
+InterfaceRate = namedtuple("InterfaceRate", [
+    "timestamp", "name", "status", "speed", "mtu",
+    "bytes_sent_per_sec", "bytes_recv_per_sec", "packets_sent_per_sec", "packets_recv_per_sec",
+    "errors_in", "errors_out", "drops_in", "drops_out",
+])
 
 
 def convert_bytes_to_gb(bytes_value):
@@ -16,17 +27,20 @@ def convert_bytes_to_gb(bytes_value):
     return round(gb_value, 2)
 
 
-def get_network_interfaces_info():
+def get_network_interfaces_info(snapshot=None):
     """
     Get detailed information about network interfaces.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         list: A list containing dictionaries with information for each network interface.
     """
     network_interfaces_info = []
 
     try:
-        interfaces = psutil.net_if_stats()
+        interfaces = snapshot.network.if_stats if snapshot is not None else psutil.net_if_stats()
         for interface, stats in interfaces.items():
             interface_info = {
                 "name": interface,
@@ -43,10 +57,13 @@ def get_network_interfaces_info():
     return network_interfaces_info
 
 
-def get_bandwidth_usage():
+def get_bandwidth_usage(snapshot=None):
     """
     Get current network bandwidth usage.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         dict: A dictionary containing network bandwidth usage information.
     """
@@ -56,7 +73,7 @@ def get_bandwidth_usage():
     }
 
     try:
-        io_counters = psutil.net_io_counters()
+        io_counters = snapshot.network.io_counters if snapshot is not None else procfs.get_source().net_io_counters()
         bandwidth_usage["sent"] = convert_bytes_to_gb(io_counters.bytes_sent)
         bandwidth_usage["received"] = convert_bytes_to_gb(io_counters.bytes_recv)
 
@@ -66,19 +83,23 @@ def get_bandwidth_usage():
     return bandwidth_usage
 
 
-def get_connection_status(remote_address="www.google.com", port=80):
+def get_connection_status(remote_address="www.google.com", port=80, timeout=3.0):
     """
-    Check the connection status to a remote address.
+    Check the connection status to a remote address with a TCP connect.
+
+    For many targets at once, with latency statistics, see network_probe.TcpProber.
 
     Args:
         remote_address (str): Remote address to check connection status.
         port (int): Port to check the connection.
+        timeout (float): Seconds to wait for the connection.
 
     Returns:
         bool: True if the connection is successful, False otherwise.
     """
     try:
-        connection_status = psutil.net_if_stats().get(remote_address) is not None
+        with socket.create_connection((remote_address, port), timeout=timeout):
+            connection_status = True
     except Exception as e:
         print(f"Error checking connection status: {e}")
         connection_status = False
@@ -86,10 +107,38 @@ def get_connection_status(remote_address="www.google.com", port=80):
     return connection_status
 
 
-def get_packets_sent_received():
+def get_socket_states(kind="inet"):
+    """
+    Count local sockets per protocol and TCP state.
+
+    Args:
+        kind (str): Connection kind passed to psutil.net_connections.
+
+    Returns:
+        dict: "tcp", "tcp6", "udp" or "udp6" mapped to a dict of state
+        (e.g. "ESTABLISHED", "LISTEN", "NONE" for UDP) to count.
+    """
+    states = {}
+    try:
+        for connection in psutil.net_connections(kind=kind):
+            protocol = "tcp" if connection.type == socket.SOCK_STREAM else "udp"
+            if connection.family == socket.AF_INET6:
+                protocol += "6"
+            counts = states.setdefault(protocol, {})
+            counts[connection.status] = counts.get(connection.status, 0) + 1
+    except Exception as e:
+        print(f"Error getting socket states: {e}")
+
+    return states
+
+
+def get_packets_sent_received(snapshot=None):
     """
     Get the total number of packets sent and received.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         dict: A dictionary containing the number of packets sent and received.
     """
@@ -99,7 +148,7 @@ def get_packets_sent_received():
     }
 
     try:
-        io_counters = psutil.net_io_counters()
+        io_counters = snapshot.network.io_counters if snapshot is not None else procfs.get_source().net_io_counters()
         packets_info["packets_sent"] = io_counters.packets_sent
         packets_info["packets_received"] = io_counters.packets_recv
 
@@ -109,6 +158,120 @@ def get_packets_sent_received():
     return packets_info
 
 
+class NetworkIORates:
+    """
+    Per-interface network rates computed from net_io_counters(pernic=True) deltas.
+
+    Interface stats (status, speed, MTU) rarely change, so they are only
+    re-read every ``stats_interval`` seconds. The first sample is measured
+    against zero since boot. Samples are taken under a lock, so one
+    instance can be shared between threads.
+
+    Args:
+        stats_interval (float): Seconds between net_if_stats refreshes.
+    """
+
+    def __init__(self, stats_interval=30):
+        self.stats_interval = stats_interval
+        self._last_counters = {}
+        self._last_time = None
+        self._if_stats = {}
+        self._if_stats_time = None
+        self._lock = threading.Lock()
+
+    def _get_if_stats(self, now):
+        if self._if_stats_time is None or now - self._if_stats_time >= self.stats_interval:
+            self._if_stats = psutil.net_if_stats()
+            self._if_stats_time = now
+        return self._if_stats
+
+    def sample(self, snapshot=None):
+        """
+        Compute rates since the previous sample.
+
+        Args:
+            snapshot (Snapshot, optional): Read counters and interface stats from this snapshot.
+
+        Returns:
+            list: InterfaceRate entries, one per interface.
+        """
+        with self._lock:
+            return self._sample(snapshot)
+
+    def _sample(self, snapshot):
+        if snapshot is not None:
+            counters = snapshot.network.pernic_io_counters or {}
+            now = snapshot.timestamp
+            if_stats = snapshot.network.if_stats
+        else:
+            counters = procfs.get_source().net_io_counters(pernic=True)
+            now = time.time()
+            if_stats = self._get_if_stats(now)
+
+        last_time = self._last_time if self._last_time is not None else psutil.boot_time()
+        elapsed = now - last_time
+
+        rates = []
+        for name, current in counters.items():
+            previous = self._last_counters.get(name)
+
+            def delta(field):
+                value = getattr(current, field)
+                if previous is not None:
+                    value -= getattr(previous, field)
+                # Counters are reset when an interface is re-created.
+                return max(value, 0)
+
+            def per_sec(field):
+                return delta(field) / elapsed if elapsed > 0 else 0.0
+
+            stats = if_stats.get(name)
+            rates.append(InterfaceRate(
+                timestamp=now,
+                name=name,
+                status=('Up' if stats.isup else 'Down') if stats else 'Unknown',
+                speed=stats.speed if stats else None,
+                mtu=stats.mtu if stats else None,
+                bytes_sent_per_sec=per_sec("bytes_sent"),
+                bytes_recv_per_sec=per_sec("bytes_recv"),
+                packets_sent_per_sec=per_sec("packets_sent"),
+                packets_recv_per_sec=per_sec("packets_recv"),
+                errors_in=delta("errin"),
+                errors_out=delta("errout"),
+                drops_in=delta("dropin"),
+                drops_out=delta("dropout"),
+            ))
+
+        self._last_counters = counters
+        self._last_time = now
+        return rates
+
+
+def stream_interface_rates(interval=1, duration=None, stats_interval=30):
+    """
+    Yield per-interface network rates at a fixed interval.
+
+    Args:
+        interval (float): Time interval between measurements.
+        duration (float, optional): Total duration; runs forever if None.
+        stats_interval (float): Seconds between interface stats refreshes.
+
+    Yields:
+        InterfaceRate: One record per interface per interval.
+    """
+    rates = NetworkIORates(stats_interval=stats_interval)
+    rates.sample()
+    next_tick = time.monotonic()
+    end_time = next_tick + duration if duration is not None else None
+
+    while end_time is None or time.monotonic() < end_time:
+        # Sleep until the next tick, not a full interval after the work,
+        # so the sampling cost does not add up to drift.
+        next_tick += interval
+        time.sleep(max(next_tick - time.monotonic(), 0))
+        yield from rates.sample()
+
+
 def real_time_network_monitoring(interval=1, duration=10):
     """
     Perform real-time network monitoring.
@@ -117,25 +280,20 @@ def real_time_network_monitoring(interval=1, duration=10):
         interval (int): Time interval between measurements.
         duration (int): Total duration of monitoring.
     """
-    end_time = time.time() + duration
-
     try:
         print("\nReal-time Network Monitoring:")
-        print("{:<15} {:<10} {:<10} {:<10}".format("Interface", "Status", "Sent (GB)", "Received (GB)"))
-
-        while time.time() < end_time:
-            bandwidth_usage = get_bandwidth_usage()
-            network_interfaces = get_network_interfaces_info()
-
-            for interface in network_interfaces:
-                print("{:<15} {:<10} {:<10} {:<10}".format(
-                    interface['name'],
-                    interface['status'],
-                    bandwidth_usage['sent'],
-                    bandwidth_usage['received']
-                ))
-
-            time.sleep(interval)
+        print("{:<15} {:<10} {:<15} {:<15} {:<8} {:<8}".format(
+            "Interface", "Status", "Sent (KB/s)", "Received (KB/s)", "Errors", "Drops"))
+
+        for rate in stream_interface_rates(interval=interval, duration=duration):
+            print("{:<15} {:<10} {:<15.2f} {:<15.2f} {:<8} {:<8}".format(
+                rate.name,
+                rate.status,
+                rate.bytes_sent_per_sec / 1024,
+                rate.bytes_recv_per_sec / 1024,
+                rate.errors_in + rate.errors_out,
+                rate.drops_in + rate.drops_out,
+            ))
 
     except KeyboardInterrupt:
         print("\nReal-time network monitoring stopped.")
@@ -160,6 +318,10 @@ if __name__ == "__main__":
     connection_status = get_connection_status()
     print("\nConnection Status to www.google.com: {}".format('Connected' if connection_status else 'Disconnected'))
 
+    print("\nSocket States:")
+    for protocol, counts in get_socket_states().items():
+        print("{}: {}".format(protocol, ", ".join("{} {}".format(state, count) for state, count in sorted(counts.items()))))
+
     packets_info = get_packets_sent_received()
     print("\nPackets Sent/Received:")
     print("Packets Sent: {}".format(packets_info['packets_sent']))
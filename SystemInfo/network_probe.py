@@ -0,0 +1,230 @@
+import asyncio
+import math
+import os
+import socket
+import time
+from collections import namedtuple
+
+from timeseries import RingBuffer, summarize
+
+ProbeResult = namedtuple("ProbeResult", ["target", "ok", "latency_ms", "error", "timestamp"])
+
+
+def parse_target(target):
+    """
+    Split a probe target into host and port.
+
+    Args:
+        target (str or tuple): "host:port", "[v6addr]:port" or (host, port).
+
+    Returns:
+        tuple: (host, port).
+    """
+    if isinstance(target, tuple):
+        return target[0], int(target[1])
+    host, _, port = target.rpartition(":")
+    return host.strip("[]"), int(port)
+
+
+class TcpProber:
+    """
+    Concurrent TCP connect prober with rolling latency statistics.
+
+    Each probe resolves every target, then opens a TCP connection and
+    closes it right after the handshake; the handshake time alone is the
+    latency. All targets are probed from one event loop, with at most
+    ``max_concurrency`` targets in flight, and resolving and connecting are
+    each bounded by ``timeout``. Any error is recorded as a failed probe of
+    its own target.
+
+    Latencies are kept per target in a fixed-size RingBuffer; failed probes
+    are stored as NaN so they count towards the loss rate but not the
+    percentiles.
+
+    Args:
+        targets (iterable): Targets, see parse_target.
+        timeout (float): Seconds allowed per resolution and per connect.
+        max_concurrency (int): Most targets in flight at once.
+        window (float): Seconds of history used by ``stats``.
+        capacity (int): Samples kept per target.
+    """
+
+    def __init__(self, targets, timeout=2.0, max_concurrency=100, window=300.0, capacity=1024):
+        self.targets = [parse_target(target) for target in targets]
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.window = window
+        self.capacity = capacity
+        self._history = {}
+
+    @staticmethod
+    def _name(target):
+        host, port = target
+        return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+    async def _probe_one(self, target, semaphore):
+        name = self._name(target)
+        host, port = target
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            try:
+                addresses = await asyncio.wait_for(
+                    loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), self.timeout
+                )
+            except asyncio.TimeoutError:
+                return ProbeResult(name, False, None, f"resolving timed out after {self.timeout} s", time.time())
+            except Exception as e:
+                return ProbeResult(name, False, None, self._error(e), time.time())
+
+            # Like socket.create_connection, try every address in turn (e.g.
+            # ::1 then 127.0.0.1), all within one timeout. Only the successful
+            # handshake is timed, not name resolution or failed attempts.
+            deadline = loop.time() + self.timeout
+            error = None
+            for family, kind, proto, _, address in addresses:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    error = None
+                    break
+                try:
+                    sock = socket.socket(family, kind, proto)
+                except Exception as e:
+                    error = e
+                    continue
+                try:
+                    sock.setblocking(False)
+                    start = time.perf_counter()
+                    await asyncio.wait_for(loop.sock_connect(sock, address), remaining)
+                    latency_ms = (time.perf_counter() - start) * 1000
+                    return ProbeResult(name, True, latency_ms, None, time.time())
+                except asyncio.TimeoutError:
+                    error = None
+                    break
+                except Exception as e:
+                    error = e
+                finally:
+                    sock.close()
+        if error is None:
+            return ProbeResult(name, False, None, f"timed out after {self.timeout} s", time.time())
+        return ProbeResult(name, False, None, self._error(error), time.time())
+
+    @staticmethod
+    def _error(e):
+        if isinstance(e, socket.gaierror):
+            return e.strerror
+        if isinstance(e, OSError) and e.errno:
+            return os.strerror(e.errno)
+        return f"{type(e).__name__}: {e}"
+
+    def _record(self, result):
+        history = self._history.get(result.target)
+        if history is None:
+            history = self._history[result.target] = RingBuffer(self.capacity)
+        history.append(result.latency_ms if result.ok else math.nan, result.timestamp)
+
+    async def probe(self):
+        """
+        Probe every target once.
+
+        Returns:
+            list: ProbeResult entries, in the order of the targets.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*[self._probe_one(target, semaphore) for target in self.targets])
+        for result in results:
+            self._record(result)
+        return results
+
+    async def run(self, interval=10.0, count=None):
+        """
+        Probe every interval and yield the results.
+
+        Args:
+            interval (float): Seconds between probes.
+            count (int, optional): Stop after this many probes.
+
+        Yields:
+            list: ProbeResult entries of one probe.
+        """
+        next_tick = time.monotonic()
+        probed = 0
+        while count is None or probed < count:
+            yield await self.probe()
+            probed += 1
+            next_tick += interval
+            await asyncio.sleep(max(next_tick - time.monotonic(), 0))
+
+    def stats(self, now=None, percentiles=(50, 95, 99)):
+        """
+        Summarize the connect latencies of the rolling window.
+
+        Args:
+            now (float, optional): End of the window. Defaults to now.
+            percentiles (iterable): Latency percentiles to include.
+
+        Returns:
+            dict: Target mapped to count, failures, loss_percent and
+            min/max/mean/percentile latencies in milliseconds.
+        """
+        since = (time.time() if now is None else now) - self.window
+        stats = {}
+        for target, history in self._history.items():
+            samples = history.values(since)
+            latencies = [value for value in samples if not math.isnan(value)]
+            failures = len(samples) - len(latencies)
+            summary = summarize(latencies, percentiles)
+            summary["count"] = len(samples)
+            summary["failures"] = failures
+            summary["loss_percent"] = failures / len(samples) * 100 if samples else None
+            stats[target] = summary
+        return stats
+
+
+def probe_targets(targets, timeout=2.0, max_concurrency=100):
+    """
+    Probe targets once from synchronous code.
+
+    Args:
+        targets (iterable): Targets, see parse_target.
+        timeout (float): Seconds allowed per resolution and per connect.
+        max_concurrency (int): Most targets in flight at once.
+
+    Returns:
+        list: ProbeResult entries, in the order of the targets.
+    """
+    return asyncio.run(TcpProber(targets, timeout, max_concurrency).probe())
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration: probe a few local listening sockets
+    # plus a closed port.
+    import sys
+
+    listeners = []
+    targets = sys.argv[1:]
+    if not targets:
+        for _ in range(3):
+            listener = socket.socket()
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(128)
+            listeners.append(listener)
+            targets.append(f"127.0.0.1:{listener.getsockname()[1]}")
+        targets.append("127.0.0.1:1")
+
+    async def main():
+        prober = TcpProber(targets, timeout=1.0)
+        async for results in prober.run(interval=0.5, count=5):
+            for result in results:
+                status = f"{result.latency_ms:.3f} ms" if result.ok else f"failed ({result.error})"
+                print(f"{result.target:<22} {status}")
+        print("\nLatency over the window:")
+        for target, summary in prober.stats().items():
+            p50 = f"{summary['p50']:.3f} ms" if summary["p50"] is not None else "N/A"
+            p99 = f"{summary['p99']:.3f} ms" if summary["p99"] is not None else "N/A"
+            print(f"{target:<22} p50 {p50}, p99 {p99}, loss {summary['loss_percent']:.0f}%")
+
+    try:
+        asyncio.run(main())
+    finally:
+        for listener in listeners:
+            listener.close()
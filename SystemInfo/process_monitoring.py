@@ -1,51 +1,422 @@
+import heapq
 import psutil
-import platform
+import threading
 import time
+from collections import namedtuple
 
-def list_running_processes():
+import cgroup_monitoring
+
+ProcessUsage = namedtuple("ProcessUsage", ["pid", "cpu_percent", "rss", "read_bytes", "write_bytes", "num_threads"])
+
+class ProcessRow:
+    """
+    Raw, unformatted values of one process.
+    """
+
+    __slots__ = ("pid", "name", "cpu_percent", "rss", "create_time")
+
+    def __init__(self, pid, name, cpu_percent, rss, create_time):
+        self.pid = pid
+        self.name = name
+        self.cpu_percent = cpu_percent
+        self.rss = rss
+        self.create_time = create_time
+
+    def format(self):
+        """
+        Format the row for display.
+
+        Returns:
+            dict: The same keys list_running_processes returns.
+        """
+        return {
+            "PID": self.pid,
+            "Name": self.name,
+            "CPU Percent": self.cpu_percent,
+            "Memory Usage": format_bytes(self.rss) if self.rss is not None else None,
+            "Create Time": (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.create_time))
+                            if self.create_time is not None else None)
+        }
+
+def _read_field(method):
+    """
+    Call a Process method, returning None if access is denied.
+    """
+    try:
+        return method()
+    except psutil.AccessDenied:
+        return None
+
+def _start_marker(process):
+    """
+    Read the start time of the process that now owns the pid.
+
+    Process.create_time() is cached per object, so it cannot reveal a reused
+    pid. On Linux the start time field of /proc/<pid>/stat is read instead;
+    inside oneshot() that file was already read for cpu_percent, so the
+    check costs no extra system call.
+
+    Returns:
+        The start time in clock ticks, or None where this is not supported.
+    """
+    parse_stat = getattr(getattr(process, "_proc", None), "_parse_stat_file", None)
+    if parse_stat is None:
+        return None
+    return parse_stat()["create_time"]
+
+class ProcessTable:
+    """
+    Process table that keeps psutil.Process objects across refreshes.
+
+    psutil measures cpu_percent against the previous call on the same
+    Process object, so keeping them cached is what makes the CPU column
+    meaningful. Only exited pids are pruned; a reused pid is detected by a
+    changed start time and gets a fresh Process and row. Fields that cannot
+    be read (AccessDenied) are None, as with psutil.process_iter.
+    """
+
+    def __init__(self):
+        self._processes = {}
+        self._rows = {}
+        self._starts = {}
+
+    def _read(self, process, row):
+        """
+        Read one process into a new row, or update its existing row.
+
+        Returns:
+            ProcessRow: The row, or None if the pid now belongs to another process.
+        """
+        with process.oneshot():
+            cpu_percent = _read_field(process.cpu_percent)
+            start = _start_marker(process)
+            if row is not None:
+                if start is not None:
+                    reused = start != self._starts.get(process.pid)
+                else:
+                    reused = not process.is_running()
+                if reused:
+                    return None
+            self._starts[process.pid] = start
+            memory = _read_field(process.memory_info)
+            rss = memory.rss if memory is not None else None
+            if row is None:
+                return ProcessRow(process.pid, _read_field(process.name), cpu_percent, rss,
+                                  _read_field(process.create_time))
+            row.cpu_percent = cpu_percent
+            row.rss = rss
+            return row
+
+    def refresh(self):
+        """
+        Re-read every running process.
+
+        Returns:
+            list: ProcessRow entries for the running processes.
+        """
+        rows = {}
+        for pid in psutil.pids():
+            process = self._processes.get(pid)
+            row = self._rows.get(pid)
+            try:
+                if process is None:
+                    process = psutil.Process(pid)
+                row = self._read(process, row)
+                if row is None:
+                    # The pid was reused by a new process.
+                    process = psutil.Process(pid)
+                    row = self._read(process, None)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+                continue
+            self._processes[pid] = process
+            rows[pid] = row
+
+        for pid in set(self._processes) - set(rows):
+            del self._processes[pid]
+            self._starts.pop(pid, None)
+        self._rows = rows
+        return list(rows.values())
+
+    def rows(self):
+        """
+        Get the rows from the last refresh.
+
+        Returns:
+            list: ProcessRow entries.
+        """
+        return list(self._rows.values())
+
+    def __len__(self):
+        return len(self._rows)
+
+_default_table = ProcessTable()
+
+# Attribute fetched while streaming, and how to get the sort value from it.
+TOP_PROCESS_KEYS = {
+    "cpu": ("cpu_percent", lambda value: value),
+    "memory": ("memory_info", lambda value: value.rss),
+}
+
+def top_processes(n=20, key="cpu"):
+    """
+    Get the top N processes by CPU or memory usage.
+
+    Only the attribute the key needs is read while streaming over all
+    processes, and a bounded heap keeps the best N. Name, memory and create
+    time are fetched for those N only.
+
+    psutil.process_iter reuses its Process objects between calls, so CPU
+    percent is measured since the previous call; on the first call it is 0.0.
+
+    Args:
+        n (int): Number of processes to return.
+        key (str): "cpu" or "memory".
+
+    Returns:
+        list: ProcessRow entries, highest first.
+    """
+    attr, value_of = TOP_PROCESS_KEYS[key]
+    heap = []
+    for process in psutil.process_iter([attr]):
+        value = process.info[attr]
+        if value is None:
+            continue
+        entry = (value_of(value), process.pid, process)
+        if len(heap) < n:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    rows = []
+    for value, pid, process in sorted(heap, key=lambda entry: entry[:2], reverse=True):
+        try:
+            with process.oneshot():
+                cpu_percent = value if key == "cpu" else process.cpu_percent()
+                rss = value if key == "memory" else process.memory_info().rss
+                rows.append(ProcessRow(pid, process.name(), cpu_percent, rss, process.create_time()))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return rows
+
+def list_running_processes(snapshot=None):
     """
     List information about running processes.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         list: List of dictionaries containing process details.
     """
     try:
+        if snapshot is None:
+            return [row.format() for row in _default_table.refresh()]
+
         processes = []
-        for process in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'create_time']):
+        for info in snapshot.process.processes:
             processes.append({
-                "PID": process.info['pid'],
-                "Name": process.info['name'],
-                "CPU Percent": process.info['cpu_percent'],
-                "Memory Usage": format_bytes(process.info['memory_info'].rss),
-                "Create Time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(process.info['create_time']))
+                "PID": info['pid'],
+                "Name": info['name'],
+                "CPU Percent": info['cpu_percent'],
+                "Memory Usage": format_bytes(info['memory_info'].rss),
+                "Create Time": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(info['create_time']))
             })
         return processes
     except Exception as e:
         print(f"Error listing running processes: {e}")
         return []
 
+def processes_by_cgroup(rows=None, monitor=None):
+    """
+    Group processes by the cgroup (container, systemd unit) they run in.
+
+    Args:
+        rows (list, optional): ProcessRow entries. Defaults to a refresh of
+            the module-wide process table.
+        monitor (CgroupMonitor, optional): Monitor used for the lookups,
+            which caches them per (pid, create_time). Defaults to the shared one.
+
+    Returns:
+        dict: Cgroup path mapped to the list of its ProcessRow entries.
+    """
+    try:
+        if rows is None:
+            rows = _default_table.refresh()
+        monitor = monitor or cgroup_monitoring.get_default_monitor()
+        return monitor.map_processes(rows)
+    except Exception as e:
+        print(f"Error grouping processes by cgroup: {e}")
+        return {}
+
+class ProcessSampler:
+    """
+    Sample the resource usage of many processes with one shared interval.
+
+    CPU times of every requested pid are recorded together. If a pid has no
+    previous snapshot, the sampler waits a single interval for all of them;
+    pids sampled before are measured against their last snapshot without
+    waiting at all. Snapshots of processes that have exited are dropped on
+    every collect, so the table never outgrows the running processes.
+
+    One sampler can be shared between threads; ``prime`` and ``collect``
+    hold a lock, and only the wait in ``sample`` runs unlocked.
+    """
+
+    def __init__(self):
+        self._baselines = {}
+        self._lock = threading.Lock()
+
+    def _read_cpu(self, pid):
+        process = psutil.Process(pid)
+        with process.oneshot():
+            cpu_times = process.cpu_times()
+            return process, process.create_time(), cpu_times.user + cpu_times.system
+
+    def sample(self, pids, interval=1.0):
+        """
+        Get CPU, RSS, I/O and thread counts for a batch of processes.
+
+        Args:
+            pids (iterable): Process IDs to sample.
+            interval (float): Seconds to wait when a pid has no previous snapshot.
+
+        Returns:
+            dict: pid mapped to ProcessUsage. Pids that do not exist or exit
+            while being sampled are left out.
+        """
+        pids = list(pids)
+        if self.prime(pids):
+            time.sleep(interval)
+        return self.collect(pids)
+
+    def prime(self, pids):
+        """
+        Record a CPU baseline for pids that do not have one yet.
+
+        Args:
+            pids (iterable): Process IDs.
+
+        Returns:
+            bool: True if any baseline was recorded, meaning the caller
+            should wait an interval before collecting.
+        """
+        with self._lock:
+            return self._prime(pids)
+
+    def _prime(self, pids):
+        recorded = False
+        now = time.monotonic()
+        for pid in pids:
+            if pid in self._baselines:
+                continue
+            try:
+                _, create_time, cpu_time = self._read_cpu(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            self._baselines[pid] = (create_time, cpu_time, now)
+            recorded = True
+        return recorded
+
+    def collect(self, pids):
+        """
+        Measure primed pids against their baselines without waiting.
+
+        Baselines of pids that no longer exist are dropped, whether or not
+        they were requested.
+
+        Args:
+            pids (iterable): Process IDs.
+
+        Returns:
+            dict: pid mapped to ProcessUsage.
+        """
+        with self._lock:
+            return self._collect(pids)
+
+    def _collect(self, pids):
+        running = set(psutil.pids())
+        for pid in [pid for pid in self._baselines if pid not in running]:
+            del self._baselines[pid]
+
+        usage = {}
+        now = time.monotonic()
+        for pid in pids:
+            baseline = self._baselines.get(pid)
+            if baseline is None:
+                continue
+            try:
+                process, create_time, cpu_time = self._read_cpu(pid)
+                if create_time != baseline[0]:
+                    # The pid was reused; start a new baseline next time.
+                    del self._baselines[pid]
+                    continue
+                with process.oneshot():
+                    rss = process.memory_info().rss
+                    num_threads = process.num_threads()
+                    try:
+                        io_counters = process.io_counters()
+                    except (psutil.AccessDenied, AttributeError):
+                        io_counters = None
+            except psutil.NoSuchProcess:
+                del self._baselines[pid]
+                continue
+            except psutil.AccessDenied:
+                # Possibly transient; keep the baseline for the next collect.
+                continue
+
+            elapsed = now - baseline[2]
+            usage[pid] = ProcessUsage(
+                pid=pid,
+                cpu_percent=round((cpu_time - baseline[1]) / elapsed * 100, 1) if elapsed > 0 else 0.0,
+                rss=rss,
+                read_bytes=io_counters.read_bytes if io_counters else None,
+                write_bytes=io_counters.write_bytes if io_counters else None,
+                num_threads=num_threads,
+            )
+            self._baselines[pid] = (create_time, cpu_time, now)
+        return usage
+
+_default_sampler = ProcessSampler()
+
+def sample_processes(pids, interval=1.0):
+    """
+    Get resource usage for many processes at once.
+
+    Args:
+        pids (iterable): Process IDs.
+        interval (float): Shared wait used only for pids sampled for the first time.
+
+    Returns:
+        dict: pid mapped to ProcessUsage; exited pids are dropped.
+    """
+    try:
+        return _default_sampler.sample(pids, interval)
+    except Exception as e:
+        print(f"Error sampling processes: {e}")
+        return {}
+
 def process_resource_usage(pid):
     """
     Get resource usage (CPU, Memory) for a specific process.
 
+    Only the first call for a pid waits one second; later calls measure
+    against the previous one.
+
     Args:
         pid (int): Process ID.
 
     Returns:
         dict: Dictionary containing resource usage details.
     """
-    try:
-        process = psutil.Process(pid)
-        cpu_percent = process.cpu_percent(interval=1)
-        memory_info = process.memory_info()
-        return {
-            "PID": pid,
-            "CPU Percent": cpu_percent,
-            "Memory Usage": format_bytes(memory_info.rss),
-        }
-    except Exception as e:
-        print(f"Error getting resource usage for process {pid}: {e}")
+    usage = sample_processes([pid]).get(pid)
+    if usage is None:
+        print(f"Error getting resource usage for process {pid}: process not found")
         return {}
+    return {
+        "PID": pid,
+        "CPU Percent": usage.cpu_percent,
+        "Memory Usage": format_bytes(usage.rss),
+    }
 
 def terminate_process(pid):
     """
@@ -85,6 +456,11 @@ if __name__ == "__main__":
     for process in running_processes:
         print(f"PID: {process['PID']}, Name: {process['Name']}, CPU Percent: {process['CPU Percent']}, Memory Usage: {process['Memory Usage']}, Create Time: {process['Create Time']}")
 
+    print("\nTop 5 Processes by Memory:")
+    for row in top_processes(5, key="memory"):
+        process = row.format()
+        print(f"PID: {process['PID']}, Name: {process['Name']}, Memory Usage: {process['Memory Usage']}")
+
     # Example: Get resource usage for a specific process
     if running_processes:
         pid_to_check = running_processes[0]['PID']
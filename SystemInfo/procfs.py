@@ -0,0 +1,296 @@
+import os
+import sys
+import threading
+from collections import namedtuple
+
+import psutil
+
+CpuTimes = namedtuple("CpuTimes", [
+    "user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal", "guest", "guest_nice",
+])
+VirtualMemory = namedtuple("VirtualMemory", [
+    "total", "available", "percent", "used", "free", "active", "inactive", "buffers", "cached", "shared", "slab",
+])
+NetIOCounters = namedtuple("NetIOCounters", [
+    "bytes_sent", "bytes_recv", "packets_sent", "packets_recv", "errin", "errout", "dropin", "dropout",
+])
+DiskIOCounters = namedtuple("DiskIOCounters", [
+    "read_count", "write_count", "read_bytes", "write_bytes", "read_time", "write_time",
+    "read_merged_count", "write_merged_count", "busy_time",
+])
+
+# /proc/diskstats always counts 512-byte sectors, whatever the device uses.
+SECTOR_SIZE = 512
+
+
+class ProcFile:
+    """
+    A /proc file kept open and re-read with pread into a reusable buffer.
+
+    Args:
+        path (str): File to open.
+        size (int): Initial buffer size; it grows when a read fills it.
+    """
+
+    def __init__(self, path, size=16384):
+        self.path = path
+        self.lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buffer = bytearray(size)
+
+    def read(self):
+        """
+        Re-read the file from offset 0.
+
+        seq_file based files such as /proc/net/dev return roughly a page per
+        read, so reading continues until a read returns no data. Callers
+        that share the object between threads must hold ``lock`` until they
+        are done with the buffer.
+
+        Returns:
+            tuple: (buffer, length) where buffer[:length] is the file content.
+        """
+        n = 0
+        while True:
+            if n == len(self._buffer):
+                self._buffer.extend(bytes(len(self._buffer)))
+            with memoryview(self._buffer) as view:
+                got = os.preadv(self._fd, [view[n:]], n)
+            if got == 0:
+                return self._buffer, n
+            n += got
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _lines(buffer, n, start=0):
+    """
+    Yield the lines of buffer[start:n] without the trailing newline.
+    """
+    pos = start
+    while pos < n:
+        eol = buffer.find(b"\n", pos, n)
+        if eol < 0:
+            eol = n
+        yield buffer[pos:eol]
+        pos = eol + 1
+
+
+def _meminfo_value(buffer, n, key):
+    """
+    Find one "Key:   value kB" entry and return it in bytes, or None.
+    """
+    i = buffer.find(key, 0, n)
+    if i < 0:
+        return None
+    start = i + len(key)
+    eol = buffer.find(b"\n", start, n)
+    fields = buffer[start:eol if eol >= 0 else n].split()
+    value = int(fields[0])
+    return value * 1024 if len(fields) > 1 else value
+
+
+class ProcBackend:
+    """
+    Linux fast path for the hottest psutil calls.
+
+    Keeps /proc/stat, /proc/meminfo, /proc/net/dev and /proc/diskstats open
+    and parses them straight from a reusable buffer. The methods mirror the
+    psutil functions they replace and return tuples with the same field
+    names, so callers can use either interchangeably.
+
+    Args:
+        proc_root (str): Where procfs is mounted; point this at a directory
+            of fixture files to parse recorded data.
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self.proc_root = proc_root
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._files = {}
+        for name in ("stat", "meminfo", "net/dev", "diskstats"):
+            self._files[name] = ProcFile(os.path.join(proc_root, name))
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+    def cpu_times(self, percpu=False):
+        """
+        Equivalent of psutil.cpu_times.
+
+        Args:
+            percpu (bool): Return one entry per CPU instead of the total.
+
+        Returns:
+            CpuTimes or list: CPU times in seconds.
+        """
+        f = self._files["stat"]
+        ticks = self._clock_ticks
+        result = []
+        with f.lock:
+            buffer, n = f.read()
+            for line in _lines(buffer, n):
+                if not line.startswith(b"cpu"):
+                    break
+                is_total = line.startswith(b"cpu ")
+                if is_total == percpu:
+                    continue
+                values = [int(v) / ticks for v in line.split()[1:11]]
+                values.extend([0.0] * (10 - len(values)))
+                result.append(CpuTimes(*values))
+        return result if percpu else result[0]
+
+    def virtual_memory(self):
+        """
+        Equivalent of psutil.virtual_memory, using the same formulas.
+
+        Returns:
+            VirtualMemory: Memory statistics in bytes.
+        """
+        f = self._files["meminfo"]
+        with f.lock:
+            buffer, n = f.read()
+            total = _meminfo_value(buffer, n, b"MemTotal:")
+            free = _meminfo_value(buffer, n, b"MemFree:")
+            available = _meminfo_value(buffer, n, b"MemAvailable:")
+            buffers = _meminfo_value(buffer, n, b"Buffers:") or 0
+            cached = (_meminfo_value(buffer, n, b"\nCached:") or 0) + (_meminfo_value(buffer, n, b"SReclaimable:") or 0)
+            shared = _meminfo_value(buffer, n, b"Shmem:") or 0
+            active = _meminfo_value(buffer, n, b"\nActive:") or 0
+            inactive = _meminfo_value(buffer, n, b"\nInactive:") or 0
+            slab = _meminfo_value(buffer, n, b"\nSlab:") or 0
+
+        if not available or available > total:
+            # Pre-3.14 kernels and some containers; psutil falls back the same way.
+            available = free + buffers + cached if not available else free
+        used = total - available
+        percent = round(used / total * 100, 1) if total else 0.0
+        return VirtualMemory(total, available, percent, used, free, active, inactive, buffers, cached, shared, slab)
+
+    def net_io_counters(self, pernic=False):
+        """
+        Equivalent of psutil.net_io_counters.
+
+        Args:
+            pernic (bool): Return a dict of per-interface counters instead of the total.
+
+        Returns:
+            NetIOCounters or dict: Network counters.
+        """
+        f = self._files["net/dev"]
+        counters = {}
+        with f.lock:
+            buffer, n = f.read()
+            # The first two lines are column headers.
+            start = buffer.find(b"\n", buffer.find(b"\n", 0, n) + 1, n) + 1
+            for line in _lines(buffer, n, start):
+                colon = line.rfind(b":")
+                if colon < 0:
+                    continue
+                fields = line[colon + 1:].split()
+                counters[line[:colon].strip().decode()] = NetIOCounters(
+                    bytes_sent=int(fields[8]),
+                    bytes_recv=int(fields[0]),
+                    packets_sent=int(fields[9]),
+                    packets_recv=int(fields[1]),
+                    errin=int(fields[2]),
+                    errout=int(fields[10]),
+                    dropin=int(fields[3]),
+                    dropout=int(fields[11]),
+                )
+        if pernic:
+            return counters
+        return NetIOCounters(*[sum(column) for column in zip(*counters.values())]) if counters else None
+
+    def disk_io_counters(self, perdisk=False):
+        """
+        Equivalent of psutil.disk_io_counters.
+
+        Args:
+            perdisk (bool): Return a dict of per-device counters instead of the
+                total over whole disks.
+
+        Returns:
+            DiskIOCounters or dict: Disk counters.
+        """
+        f = self._files["diskstats"]
+        counters = {}
+        with f.lock:
+            buffer, n = f.read()
+            for line in _lines(buffer, n):
+                fields = line.split()
+                if len(fields) >= 14:
+                    (reads, reads_merged, read_sectors, read_time, writes, writes_merged,
+                     write_sectors, write_time, _, busy_time) = map(int, fields[3:13])
+                elif len(fields) == 7:
+                    reads, read_sectors, writes, write_sectors = map(int, fields[3:7])
+                    read_time = write_time = reads_merged = writes_merged = busy_time = 0
+                else:
+                    continue
+                counters[fields[2].decode()] = DiskIOCounters(
+                    read_count=reads,
+                    write_count=writes,
+                    read_bytes=read_sectors * SECTOR_SIZE,
+                    write_bytes=write_sectors * SECTOR_SIZE,
+                    read_time=read_time,
+                    write_time=write_time,
+                    read_merged_count=reads_merged,
+                    write_merged_count=writes_merged,
+                    busy_time=busy_time,
+                )
+        if perdisk:
+            return counters
+        # Like psutil, only count whole disks so partitions are not added twice.
+        disks = [c for name, c in counters.items() if os.path.exists(os.path.join("/sys/block", name))]
+        return DiskIOCounters(*[sum(column) for column in zip(*disks)]) if disks else None
+
+
+_backend = None
+_backend_checked = False
+_backend_lock = threading.Lock()
+
+
+def get_source():
+    """
+    Get the fastest available source for the hot metrics.
+
+    Returns:
+        ProcBackend or module: The /proc backend on Linux, otherwise the
+        psutil module itself. Both offer cpu_times, virtual_memory,
+        net_io_counters and disk_io_counters.
+    """
+    global _backend, _backend_checked
+    if not _backend_checked:
+        with _backend_lock:
+            if not _backend_checked:
+                if sys.platform.startswith("linux"):
+                    try:
+                        _backend = ProcBackend()
+                    except (OSError, AttributeError):
+                        # /proc is not mounted or os.preadv is unavailable.
+                        _backend = None
+                _backend_checked = True
+    return _backend or psutil
+
+
+if __name__ == "__main__":
+    # Benchmark of the /proc backend against psutil
+    import timeit
+
+    backend = ProcBackend()
+    calls = [
+        ("cpu_times(percpu=True)", lambda s: s.cpu_times(percpu=True)),
+        ("virtual_memory()", lambda s: s.virtual_memory()),
+        ("net_io_counters(pernic=True)", lambda s: s.net_io_counters(pernic=True)),
+        ("disk_io_counters(perdisk=True)", lambda s: s.disk_io_counters(perdisk=True)),
+    ]
+    number = 2000
+    print(f"{'Call':<32} {'psutil (us)':>12} {'procfs (us)':>12} {'Speedup':>8}")
+    for name, call in calls:
+        psutil_time = min(timeit.repeat(lambda: call(psutil), number=number, repeat=3)) / number * 1e6
+        procfs_time = min(timeit.repeat(lambda: call(backend), number=number, repeat=3)) / number * 1e6
+        print(f"{name:<32} {psutil_time:>12.1f} {procfs_time:>12.1f} {psutil_time / procfs_time:>7.1f}x")
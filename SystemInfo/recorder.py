@@ -0,0 +1,324 @@
+import glob
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import time
+
+MAGIC = b"SYSINFO1"
+# Magic, then the length of the JSON schema that follows.
+PREAMBLE = struct.Struct("<8sI")
+ALIGNMENT = 8
+
+
+class SegmentWriter:
+    """
+    Append-only writer of one segment file.
+
+    The file starts with a small header describing the schema: the magic
+    bytes, the length of a JSON document listing the columns, the document
+    itself and zero padding up to an 8-byte boundary. After the header every
+    record is a fixed-width row of little-endian float64 values, the
+    timestamp followed by one value per column. Missing values are NaN.
+
+    Args:
+        path (str): Segment file to create; it must not exist yet.
+        columns (list): Metric names stored in this segment.
+    """
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._row = struct.Struct(f"<{len(self.columns) + 1}d")
+        # "x" so that an existing segment is never truncated.
+        self._file = open(path, "xb")
+
+        schema = json.dumps({"columns": self.columns, "dtype": "<f8", "timestamp": True}).encode()
+        header_size = PREAMBLE.size + len(schema)
+        padding = -header_size % ALIGNMENT
+        self._file.write(PREAMBLE.pack(MAGIC, len(schema) + padding))
+        self._file.write(schema + b" " * padding)
+        # Make the header visible to readers right away; until the first
+        # flush it would sit in the file buffer and the segment look empty.
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.size = header_size + padding
+
+    def write(self, values, timestamp):
+        """
+        Append one record.
+
+        Args:
+            values (dict): Metric name mapped to value; unknown names are ignored.
+            timestamp (float): Record time.
+        """
+        row = [math.nan] * (len(self.columns) + 1)
+        row[0] = timestamp
+        for name, value in values.items():
+            i = self._index.get(name)
+            if i is not None and value is not None:
+                row[i + 1] = value
+        self._file.write(self._row.pack(*row))
+        self.size += self._row.size
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class SnapshotRecorder:
+    """
+    Record metric values into size-rotated binary segment files.
+
+    A new segment is started when the current one reaches
+    ``max_segment_bytes``, or when a metric appears that the current schema
+    does not have (for example a hot-plugged disk). Each new segment's
+    columns are the metrics of the record that started it. Has the same
+    ``record_many`` interface as MetricStore, so a SystemMetricsCollector
+    can write straight to it.
+
+    Args:
+        directory (str): Directory for the segment files.
+        prefix (str): Segment file name prefix.
+        max_segment_bytes (int): Size at which segments rotate.
+    """
+
+    def __init__(self, directory, prefix="metrics", max_segment_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_segment_bytes = max_segment_bytes
+        self._segment = None
+        self._sequence = next_sequence(directory, prefix)
+        os.makedirs(directory, exist_ok=True)
+
+    def _rotate(self, columns):
+        if self._segment is not None:
+            self._segment.close()
+        while True:
+            path = os.path.join(self.directory, f"{self.prefix}-{self._sequence:06d}.bin")
+            self._sequence += 1
+            try:
+                self._segment = SegmentWriter(path, columns)
+                return
+            except FileExistsError:
+                # Another recorder wrote into the same directory meanwhile.
+                continue
+
+    def record_many(self, values, timestamp=None):
+        """
+        Append one record of metric values.
+
+        Args:
+            values (dict): Metric name mapped to value.
+            timestamp (float, optional): Record time. Defaults to now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        segment = self._segment
+        if (segment is None or not values.keys() <= segment._index.keys()
+                or segment.size >= self.max_segment_bytes):
+            # The new schema has only the current metrics, so metrics that
+            # went away do not leave NaN columns in every later segment.
+            self._rotate(sorted(values))
+        self._segment.write(values, timestamp)
+
+    def flush(self):
+        if self._segment is not None:
+            self._segment.flush()
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SegmentReader:
+    """
+    Memory-mapped, zero-copy reader of one segment file.
+
+    Columns are exposed as NumPy views into the mapping; nothing is parsed
+    or copied. A trailing partial record from an interrupted write is
+    ignored. Drop the returned arrays before calling ``close``.
+
+    Args:
+        path (str): Segment file to open.
+    """
+
+    def __init__(self, path):
+        # numpy is only needed for reading, so recording works without it.
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("numpy is required to read recorded segments")
+        self.path = path
+        if not has_header(path):
+            raise ValueError(f"{path} has no complete header yet")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, schema_size = PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a recorded segment")
+        schema = json.loads(bytes(self._mmap[PREAMBLE.size:PREAMBLE.size + schema_size]))
+        self.columns = schema["columns"]
+
+        offset = PREAMBLE.size + schema_size
+        width = len(self.columns) + 1
+        count = (len(self._mmap) - offset) // (width * 8)
+        self._data = numpy.frombuffer(self._mmap, dtype="<f8", count=count * width, offset=offset)
+        self._data = self._data.reshape(count, width)
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    @property
+    def timestamps(self):
+        return self._data[:, 0]
+
+    def column(self, name):
+        """
+        Get the values of one metric.
+
+        Args:
+            name (str): Metric name.
+
+        Returns:
+            numpy.ndarray: A strided view into the mapped file.
+        """
+        return self._data[:, self.columns.index(name) + 1]
+
+    def as_dict(self):
+        """
+        Get every column.
+
+        Returns:
+            dict: Metric name mapped to its array, plus "timestamp".
+        """
+        columns = {"timestamp": self.timestamps}
+        for i, name in enumerate(self.columns):
+            columns[name] = self._data[:, i + 1]
+        return columns
+
+    def close(self):
+        self._data = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Arrays handed out are still alive; the mapping is released with them.
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def segment_paths(directory, prefix="metrics"):
+    """
+    Get the segment files of a recording in write order.
+
+    Args:
+        directory (str): Recording directory.
+        prefix (str): Segment file name prefix.
+
+    Returns:
+        list: Segment file paths.
+    """
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}-*.bin")))
+
+
+def has_header(path):
+    """
+    Check whether a segment file holds its complete header.
+
+    A segment that was just created, or whose writer died right away, can
+    be shorter than its header; it cannot be mapped or read yet.
+
+    Args:
+        path (str): Segment file.
+
+    Returns:
+        bool: True if the preamble and schema are all there.
+    """
+    try:
+        with open(path, "rb") as f:
+            preamble = f.read(PREAMBLE.size)
+            if len(preamble) < PREAMBLE.size:
+                return False
+            _, schema_size = PREAMBLE.unpack(preamble)
+            return os.fstat(f.fileno()).st_size >= PREAMBLE.size + schema_size
+    except OSError:
+        return False
+
+
+def next_sequence(directory, prefix="metrics"):
+    """
+    Get the sequence number for the next segment of a recording.
+
+    Old segments may have been deleted by retention, so this is one past
+    the highest existing sequence number, not the number of segments.
+
+    Args:
+        directory (str): Recording directory.
+        prefix (str): Segment file name prefix.
+
+    Returns:
+        int: The next sequence number.
+    """
+    pattern = re.compile(re.escape(prefix) + r"-(\d+)\.bin$")
+    highest = -1
+    for path in segment_paths(directory, prefix):
+        match = pattern.match(os.path.basename(path))
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest + 1
+
+
+def read_recording(directory, prefix="metrics"):
+    """
+    Open every segment of a recording.
+
+    Segments without a complete header yet are skipped, so a recording can
+    be read while the recorder is still writing it.
+
+    Args:
+        directory (str): Recording directory.
+        prefix (str): Segment file name prefix.
+
+    Returns:
+        list: SegmentReader objects in write order.
+    """
+    return [SegmentReader(path) for path in segment_paths(directory, prefix) if has_header(path)]
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    import tempfile
+
+    from timeseries import SystemMetricsCollector
+
+    directory = tempfile.mkdtemp(prefix="systeminfo-")
+    with SnapshotRecorder(directory) as recorder:
+        collector = SystemMetricsCollector(recorder)
+        for _ in range(5):
+            collector.collect()
+            time.sleep(1)
+
+    print(f"Recorded to {directory}")
+    for segment in read_recording(directory):
+        print(f"{os.path.basename(segment.path)}: {len(segment)} records, {len(segment.columns)} metrics")
+        print(f"CPU Total: {segment.column('cpu.total')}")
+        print(f"Memory Percent: {segment.column('memory.percent')}")
+        segment.close()
@@ -0,0 +1,239 @@
+import heapq
+import itertools
+import threading
+import time
+
+import cpu_monitoring
+import disk_monitoring
+import memory_monitoring
+import network_monitoring
+import process_monitoring
+import system_monitoring
+
+
+class Job:
+    """
+    A collector run by the scheduler.
+
+    Args:
+        name (str): Key of the collector's result.
+        func (callable): Collector called without arguments.
+        period (float): Seconds between runs, before any back-off.
+        static (bool): Run once and keep the result for good.
+    """
+
+    def __init__(self, name, func, period, static=False):
+        self.name = name
+        self.func = func
+        self.period = period
+        self.static = static
+        self.runs = 0
+        self.last_run = None
+        self.last_error = None
+
+
+class AdaptiveScheduler:
+    """
+    Runs each collector at its own period and slows down under a CPU budget.
+
+    Every ``budget_window`` seconds the scheduler compares the CPU time this
+    process used (all threads, from time.process_time) with the wall time
+    that passed. Above ``cpu_budget`` the periods of all periodic jobs are
+    doubled, up to ``max_backoff`` times their configured value; below half
+    the budget they are halved back towards normal.
+
+    Args:
+        cpu_budget (float): Allowed CPU time as a fraction of one core, e.g.
+            0.02 for 2%.
+        budget_window (float): Seconds of history behind each budget check.
+        max_backoff (float): Largest factor applied to the periods.
+        on_result (callable, optional): Called as on_result(name, value)
+            after every successful run.
+    """
+
+    def __init__(self, cpu_budget=0.05, budget_window=10.0, max_backoff=16.0, on_result=None):
+        self.cpu_budget = cpu_budget
+        self.budget_window = budget_window
+        self.max_backoff = max_backoff
+        self.on_result = on_result
+        self.backoff = 1.0
+        self.cpu_usage = 0.0
+        self.results = {}
+        self._jobs = {}
+        self._queue = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._window_start = (time.monotonic(), time.process_time())
+
+    def add(self, name, func, period, static=False):
+        """
+        Register a collector; it first runs on the next scheduler pass.
+
+        Args:
+            name (str): Key of the collector's result.
+            func (callable): Collector called without arguments.
+            period (float): Seconds between runs.
+            static (bool): Run once and keep the result for good.
+
+        Returns:
+            Job: The registered job.
+        """
+        job = Job(name, func, period, static)
+        with self._lock:
+            self._jobs[name] = job
+            heapq.heappush(self._queue, (time.monotonic(), next(self._counter), job))
+        self._wakeup.set()
+        return job
+
+    def remove(self, name):
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _check_budget(self, now):
+        start_wall, start_cpu = self._window_start
+        elapsed = now - start_wall
+        if elapsed < self.budget_window:
+            return
+        cpu = time.process_time()
+        self.cpu_usage = (cpu - start_cpu) / elapsed
+        if self.cpu_usage > self.cpu_budget:
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        elif self.cpu_usage < self.cpu_budget / 2:
+            self.backoff = max(self.backoff / 2, 1.0)
+        self._window_start = (now, cpu)
+
+    def run_pending(self):
+        """
+        Run every job that is due.
+
+        Returns:
+            float: Seconds until the next job is due, or None if there is none.
+        """
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                if not self._queue:
+                    return None
+                due, _, job = self._queue[0]
+                if due > now:
+                    return due - now
+                heapq.heappop(self._queue)
+                if self._jobs.get(job.name) is not job:
+                    # Removed or replaced since it was queued.
+                    continue
+
+            try:
+                value = job.func()
+            except Exception as e:
+                print(f"Error running collector {job.name}: {e}")
+                job.last_error = e
+            else:
+                job.last_error = None
+                self.results[job.name] = value
+                if self.on_result is not None:
+                    self.on_result(job.name, value)
+            job.runs += 1
+            job.last_run = time.monotonic()
+
+            self._check_budget(job.last_run)
+            if not job.static or job.last_error is not None:
+                # A failed static job is retried at its period.
+                with self._lock:
+                    if self._jobs.get(job.name) is job:
+                        next_run = job.last_run + job.period * self.backoff
+                        heapq.heappush(self._queue, (next_run, next(self._counter), job))
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = self.run_pending()
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def start(self):
+        """
+        Run the scheduler in a daemon thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="systeminfo-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def default_scheduler(fast=1.0, medium=10.0, slow=30.0, cpu_budget=0.05, gpu=False, on_result=None):
+    """
+    Build a scheduler with the usual SystemInfo collectors.
+
+    Static facts run once; CPU, memory, disk I/O and network rates run every
+    ``fast`` seconds; filesystem usage and interface details every
+    ``medium``; the process scan every ``slow``.
+
+    Args:
+        fast (float): Period of the volatile counters.
+        medium (float): Period of filesystem usage and interface details.
+        slow (float): Period of the process scan.
+        cpu_budget (float): Allowed CPU time as a fraction of one core.
+        gpu (bool): Also collect GPU metrics (imports gpu_monitoring).
+        on_result (callable, optional): Called as on_result(name, value).
+
+    Returns:
+        AdaptiveScheduler: The scheduler, not yet started.
+    """
+    scheduler = AdaptiveScheduler(cpu_budget=cpu_budget, on_result=on_result)
+
+    scheduler.add("os", system_monitoring.get_operating_system_details, slow, static=True)
+    scheduler.add("architecture", system_monitoring.get_system_architecture, slow, static=True)
+    scheduler.add("kernel", system_monitoring.get_kernel_version, slow, static=True)
+    scheduler.add("physical_cores", cpu_monitoring.get_cpu_physical_cores, slow, static=True)
+    scheduler.add("logical_cores", cpu_monitoring.get_cpu_logical_cores, slow, static=True)
+
+    network_rates = network_monitoring.NetworkIORates(stats_interval=medium)
+    scheduler.add("cpu", cpu_monitoring._default_sampler.sample, fast)
+    scheduler.add("memory", memory_monitoring.get_memory_info, fast)
+    scheduler.add("disk_io", disk_monitoring.get_disk_io_rates, fast)
+    scheduler.add("network", network_rates.sample, fast)
+
+    scheduler.add("disks", disk_monitoring.get_individual_disk_info, medium)
+    scheduler.add("interfaces", network_monitoring.get_network_interfaces_info, medium)
+
+    scheduler.add("processes", process_monitoring.top_processes, slow)
+
+    if gpu:
+        import gpu_monitoring
+        scheduler.add("gpus", gpu_monitoring.get_all_gpus_info, fast)
+    return scheduler
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    def show(name, value):
+        if name == "cpu":
+            print(f"CPU Usage: {value.total}%")
+        elif name == "memory":
+            print(f"Memory: {value['used']} / {value['total']} GB")
+        elif name == "processes":
+            print(f"Top processes: {[row.name for row in value[:5]]}")
+        elif name in ("os", "architecture", "kernel", "physical_cores", "logical_cores"):
+            print(f"{name}: {value}")
+
+    scheduler = default_scheduler(fast=1.0, medium=5.0, slow=10.0, on_result=show)
+    scheduler.start()
+    try:
+        time.sleep(12)
+    finally:
+        scheduler.stop()
+    print(f"Agent CPU usage: {scheduler.cpu_usage * 100:.2f}% (back-off x{scheduler.backoff:g})")
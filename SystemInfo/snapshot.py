@@ -0,0 +1,134 @@
+import time
+from collections import namedtuple
+
+import psutil
+
+import disk_monitoring
+import procfs
+import static_facts
+
+CpuData = namedtuple("CpuData", ["physical_cores", "logical_cores", "freq", "times", "percpu_times"])
+MemoryData = namedtuple("MemoryData", ["virtual", "swap"])
+DiskData = namedtuple("DiskData", ["partitions", "usage", "io_counters"])
+NetworkData = namedtuple("NetworkData", ["io_counters", "pernic_io_counters", "if_stats", "if_addrs"])
+ProcessData = namedtuple("ProcessData", ["processes"])
+SystemData = namedtuple("SystemData", ["uname", "architecture", "processor", "boot_time", "battery", "users"])
+
+PROCESS_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_info', 'create_time']
+
+
+def _safe(func, default=None):
+    """
+    Call a psutil function, returning a default value if it fails.
+
+    Args:
+        func (callable): Function to call without arguments.
+        default: Value returned when the call raises.
+
+    Returns:
+        The result of the call, or the default value.
+    """
+    try:
+        return func()
+    except Exception as e:
+        print(f"Error collecting snapshot data from {getattr(func, '__name__', func)}: {e}")
+        return default
+
+
+class Snapshot:
+    """
+    Collect every metric source exactly once per tick.
+
+    Each underlying psutil call is made a single time per refresh and the
+    results are kept in typed records (``cpu``, ``memory``, ``disk``,
+    ``network``, ``process`` and ``system``). The getters in the other
+    monitoring modules accept a ``snapshot`` argument and read from these
+    records instead of calling psutil again.
+
+    Args:
+        processes (bool): Whether to include the process table, which is the
+            most expensive source on busy hosts.
+    """
+
+    def __init__(self, processes=True):
+        self.include_processes = processes
+        self.timestamp = None
+        self.cpu = None
+        self.memory = None
+        self.disk = None
+        self.network = None
+        self.process = None
+        self.system = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Re-read every metric source once and replace the stored records.
+
+        Returns:
+            Snapshot: This snapshot, to allow chaining.
+        """
+        source = procfs.get_source()
+        self.timestamp = time.time()
+        self.cpu = self._collect_cpu(source)
+        self.memory = MemoryData(
+            virtual=_safe(source.virtual_memory),
+            swap=_safe(psutil.swap_memory),
+        )
+        self.disk = self._collect_disk(source)
+        self.network = NetworkData(
+            io_counters=_safe(source.net_io_counters),
+            pernic_io_counters=_safe(lambda: source.net_io_counters(pernic=True), {}),
+            if_stats=_safe(psutil.net_if_stats, {}),
+            if_addrs=_safe(psutil.net_if_addrs, {}),
+        )
+        self.process = ProcessData(processes=self._collect_processes() if self.include_processes else [])
+        self.system = self._collect_system()
+        return self
+
+    def _collect_cpu(self, source):
+        percpu_times = _safe(lambda: source.cpu_times(percpu=True), [])
+        return CpuData(
+            physical_cores=_safe(static_facts.get_physical_cores),
+            logical_cores=_safe(static_facts.get_logical_cores),
+            freq=_safe(psutil.cpu_freq),
+            times=_safe(source.cpu_times),
+            percpu_times=percpu_times,
+        )
+
+    def _collect_disk(self, source):
+        partitions = _safe(lambda: disk_monitoring.scan_partitions(index=disk_monitoring._device_index), [])
+        usage = {partition.mountpoint: partition.usage for partition in partitions}
+        io_counters = _safe(lambda: source.disk_io_counters(perdisk=True), {})
+        return DiskData(partitions=partitions, usage=usage, io_counters=io_counters)
+
+    def _collect_processes(self):
+        processes = []
+        try:
+            for process in psutil.process_iter(PROCESS_ATTRS):
+                processes.append(process.info)
+        except Exception as e:
+            print(f"Error collecting process snapshot: {e}")
+        return processes
+
+    def _collect_system(self):
+        return SystemData(
+            uname=static_facts.get_uname(),
+            architecture=static_facts.get_architecture(),
+            processor=static_facts.get_processor(),
+            boot_time=_safe(psutil.boot_time),
+            battery=_safe(psutil.sensors_battery),
+            users=_safe(psutil.users, []),
+        )
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    snapshot = Snapshot()
+    print(f"Snapshot taken at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot.timestamp))}")
+    print(f"CPU Cores: {snapshot.cpu.physical_cores} physical, {snapshot.cpu.logical_cores} logical")
+    print(f"Memory Usage: {snapshot.memory.virtual.percent}%")
+    print(f"Partitions: {len(snapshot.disk.partitions)}")
+    print(f"Network Interfaces: {len(snapshot.network.if_stats)}")
+    print(f"Processes: {len(snapshot.process.processes)}")
+    print(f"Operating System: {snapshot.system.uname.system} {snapshot.system.uname.release}")
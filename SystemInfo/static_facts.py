@@ -0,0 +1,124 @@
+import os
+import struct
+import threading
+from collections import namedtuple
+
+import psutil
+
+StaticFacts = namedtuple("StaticFacts", ["uname", "architecture", "processor", "physical_cores", "logical_cores"])
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _cached(key, compute):
+    """
+    Compute a fact on first use and return the stored value afterwards.
+    """
+    try:
+        return _cache[key]
+    except KeyError:
+        pass
+    with _lock:
+        if key not in _cache:
+            _cache[key] = compute()
+        return _cache[key]
+
+
+def clear():
+    """
+    Forget every cached fact, e.g. after a CPU hotplug.
+    """
+    with _lock:
+        _cache.clear()
+
+
+def _uname():
+    # platform pulls in re and friends; only pay for it when a fact is asked for.
+    import platform
+    return platform.uname()
+
+
+def _processor():
+    # platform.processor() runs `uname -p` on Linux.
+    import platform
+    try:
+        return platform.processor()
+    except Exception as e:
+        print(f"Error getting processor name: {e}")
+        return ""
+
+
+def get_uname():
+    """
+    Get the platform.uname() result.
+
+    Returns:
+        uname_result: System, node, release, version and machine.
+    """
+    return _cached("uname", _uname)
+
+
+def get_architecture():
+    """
+    Get the pointer width of the running interpreter, e.g. "64bit".
+
+    This is what platform.architecture() reports for the interpreter,
+    without running `file` on the executable.
+
+    Returns:
+        str: Architecture bits.
+    """
+    return _cached("architecture", lambda: f"{struct.calcsize('P') * 8}bit")
+
+
+def get_processor():
+    """
+    Get the processor name.
+
+    Returns:
+        str: Processor name, possibly empty.
+    """
+    return _cached("processor", _processor)
+
+
+def get_physical_cores():
+    return _cached("physical_cores", lambda: psutil.cpu_count(logical=False))
+
+
+def get_logical_cores():
+    return _cached("logical_cores", lambda: psutil.cpu_count(logical=True) or os.cpu_count())
+
+
+def get_static_facts():
+    """
+    Get every fact that does not change while the process runs.
+
+    Returns:
+        StaticFacts: uname, architecture, processor and core counts.
+    """
+    return StaticFacts(
+        uname=get_uname(),
+        architecture=get_architecture(),
+        processor=get_processor(),
+        physical_cores=get_physical_cores(),
+        logical_cores=get_logical_cores(),
+    )
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    import time
+
+    start = time.perf_counter()
+    facts = get_static_facts()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    get_static_facts()
+    second = time.perf_counter() - start
+
+    print(f"Operating System: {facts.uname.system} {facts.uname.release}")
+    print(f"Architecture: {facts.architecture}")
+    print(f"Processor: {facts.processor}")
+    print(f"Cores: {facts.physical_cores} physical, {facts.logical_cores} logical")
+    print(f"First lookup: {first * 1000:.2f} ms, cached lookup: {second * 1000000:.1f} us")
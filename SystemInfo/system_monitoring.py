@@ -1,74 +1,103 @@
 import psutil
-import platform
+import socket
 import time
 
+import static_facts
 
-def get_operating_system_details():
+
+def get_operating_system_details(snapshot=None):
     """
     Get details about the operating system.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         str: Operating system details.
     """
-    os_details = platform.uname()
+    os_details = snapshot.system.uname if snapshot is not None else static_facts.get_uname()
     return f"{os_details.system} {os_details.release} {os_details.version}"
 
 
-def get_system_architecture():
+def get_system_architecture(snapshot=None):
     """
     Get the system architecture.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         str: System architecture.
     """
-    return platform.architecture()[0]
+    if snapshot is not None:
+        return snapshot.system.architecture
+    return static_facts.get_architecture()
 
 
-def get_kernel_version():
+def get_kernel_version(snapshot=None):
     """
     Get the kernel version.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         str: Kernel version.
     """
-    return platform.uname().version
+    uname = snapshot.system.uname if snapshot is not None else static_facts.get_uname()
+    return uname.version
 
 
-def get_system_uptime():
+def get_system_uptime(snapshot=None):
     """
     Get the system uptime.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         float: System uptime in seconds.
     """
+    if snapshot is not None:
+        return snapshot.timestamp - snapshot.system.boot_time
     return time.time() - psutil.boot_time()
 
 
-def get_hardware_information():
+def get_hardware_information(snapshot=None):
     """
     Get hardware information.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         str: Hardware information.
     """
     try:
-        cpu_info = platform.processor()
-        memory_info = psutil.virtual_memory()
+        if snapshot is not None:
+            cpu_info = snapshot.system.processor
+            memory_info = snapshot.memory.virtual
+        else:
+            cpu_info = static_facts.get_processor()
+            memory_info = psutil.virtual_memory()
         return f"CPU: {cpu_info}\nRAM: {format_bytes(memory_info.total)}"
     except Exception as e:
         print(f"Error getting hardware information: {e}")
         return "N/A"
 
 
-def get_battery_information():
+def get_battery_information(snapshot=None):
     """
     Get information about the battery.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         str: Battery information.
     """
     try:
-        battery = psutil.sensors_battery()
+        battery = snapshot.system.battery if snapshot is not None else psutil.sensors_battery()
         if battery:
             return f"Battery: {battery.percent}% ({'Plugged In' if battery.power_plugged else 'Not Plugged In'})"
         else:
@@ -78,15 +107,18 @@ def get_battery_information():
         return "N/A"
 
 
-def get_network_interfaces():
+def get_network_interfaces(snapshot=None):
     """
     Get details about network interfaces.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         list: List of dictionaries containing network interface details.
     """
     try:
-        interfaces = psutil.net_if_addrs()
+        interfaces = snapshot.network.if_addrs if snapshot is not None else psutil.net_if_addrs()
         interface_details = []
         for name, addresses in interfaces.items():
             details = {"Name": name}
@@ -100,15 +132,19 @@ def get_network_interfaces():
         return []
 
 
-def get_user_information():
+def get_user_information(snapshot=None):
     """
     Get information about the current logged-in user.
 
+    Args:
+        snapshot (Snapshot, optional): Read from this snapshot instead of psutil.
+
     Returns:
         str: User information.
     """
     try:
-        user = psutil.users()[0]
+        users = snapshot.system.users if snapshot is not None else psutil.users()
+        user = users[0]
         return f"User: {user.name} (Terminal: {user.terminal})"
     except Exception as e:
         print(f"Error getting user information: {e}")
@@ -0,0 +1,570 @@
+import math
+import time
+from array import array
+
+import cpu_monitoring
+import disk_monitoring
+import instrumentation
+import memory_monitoring
+import network_monitoring
+from snapshot import Snapshot
+
+
+class RingBuffer:
+    """
+    Fixed-size, array-backed buffer of (timestamp, value) samples.
+
+    Both columns are preallocated ``array('d')`` objects, so appending is
+    O(1) and memory use never grows once the buffer is created. When full,
+    the oldest sample is overwritten.
+
+    Args:
+        capacity (int): Number of samples kept.
+    """
+
+    def __init__(self, capacity):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, value, timestamp=None):
+        """
+        Add a sample, overwriting the oldest one when the buffer is full.
+
+        Args:
+            value (float): Sample value.
+            timestamp (float, optional): Sample time. Defaults to now.
+        """
+        self._timestamps[self._next] = time.time() if timestamp is None else timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _indices(self):
+        start = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            yield (start + offset) % self.capacity
+
+    def items(self, since=None):
+        """
+        Get samples in chronological order.
+
+        Args:
+            since (float, optional): Only return samples at or after this time.
+
+        Returns:
+            list: (timestamp, value) pairs.
+        """
+        samples = []
+        for i in self._indices():
+            if since is None or self._timestamps[i] >= since:
+                samples.append((self._timestamps[i], self._values[i]))
+        return samples
+
+    def values(self, since=None):
+        """
+        Get sample values in chronological order.
+
+        Args:
+            since (float, optional): Only return samples at or after this time.
+
+        Returns:
+            list: Sample values.
+        """
+        return [value for _, value in self.items(since)]
+
+    def last(self):
+        """
+        Get the newest sample.
+
+        Returns:
+            tuple: (timestamp, value), or None if the buffer is empty.
+        """
+        if not self._count:
+            return None
+        i = (self._next - 1) % self.capacity
+        return self._timestamps[i], self._values[i]
+
+
+def percentile(sorted_values, p):
+    """
+    Linear-interpolated percentile of already sorted values.
+
+    Args:
+        sorted_values (list): Values in ascending order.
+        p (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile, or None for an empty list.
+    """
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * p / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(values, percentiles=(50, 95, 99)):
+    """
+    Compute min, max, mean and percentiles of a list of values.
+
+    Args:
+        values (list): Sample values.
+        percentiles (iterable): Percentiles to include, as "p50" etc.
+
+    Returns:
+        dict: Summary statistics; values are None when there are no samples.
+    """
+    summary = {"count": len(values), "min": None, "max": None, "mean": None}
+    for p in percentiles:
+        summary[f"p{p:g}"] = None
+    if not values:
+        return summary
+
+    ordered = sorted(values)
+    summary["min"] = ordered[0]
+    summary["max"] = ordered[-1]
+    summary["mean"] = sum(ordered) / len(ordered)
+    for p in percentiles:
+        summary[f"p{p:g}"] = percentile(ordered, p)
+    return summary
+
+
+class MetricStore:
+    """
+    In-process time-series store with one ring buffer per metric.
+
+    A metric that gets no sample for ``retention`` consecutive
+    ``record_many`` calls (e.g. a removed veth, device or mount) has nothing
+    left in its window and is dropped, so the store does not grow with
+    every name ever seen.
+
+    Args:
+        retention (int): Samples kept per metric.
+    """
+
+    def __init__(self, retention=3600):
+        self.retention = retention
+        self._series = {}
+        self._last_seen = {}
+        self._generation = 0
+
+    def record(self, name, value, timestamp=None):
+        """
+        Append a sample to a metric, creating its buffer on first use.
+
+        Args:
+            name (str): Metric name.
+            value (float): Sample value; None is ignored.
+            timestamp (float, optional): Sample time. Defaults to now.
+        """
+        if value is None:
+            return
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = RingBuffer(self.retention)
+        series.append(value, timestamp)
+        self._last_seen[name] = self._generation
+
+    def record_many(self, values, timestamp=None):
+        """
+        Append one sample to each of several metrics, then drop idle metrics.
+
+        Args:
+            values (dict): Metric name mapped to value.
+            timestamp (float, optional): Shared sample time. Defaults to now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self._generation += 1
+        for name, value in values.items():
+            self.record(name, value, timestamp)
+        self.expire()
+
+    def expire(self):
+        """
+        Drop metrics without a sample in the last ``retention`` record_many calls.
+
+        Returns:
+            list: Names of the dropped metrics.
+        """
+        oldest = self._generation - self.retention
+        expired = [name for name, seen in self._last_seen.items() if seen <= oldest]
+        for name in expired:
+            del self._series[name]
+            del self._last_seen[name]
+        return expired
+
+    def metrics(self):
+        """
+        Get the names of all recorded metrics.
+
+        Returns:
+            list: Metric names, sorted.
+        """
+        return sorted(self._series)
+
+    def series(self, name):
+        """
+        Get the ring buffer of a metric.
+
+        Args:
+            name (str): Metric name.
+
+        Returns:
+            RingBuffer: The buffer, or None if the metric is unknown.
+        """
+        return self._series.get(name)
+
+    def query(self, name, window=None, percentiles=(50, 95, 99), now=None):
+        """
+        Summarize a metric over a time window.
+
+        Args:
+            name (str): Metric name.
+            window (float, optional): Seconds back from now; None means all retained samples.
+            percentiles (iterable): Percentiles to include.
+            now (float, optional): End of the window. Defaults to the current time.
+
+        Returns:
+            dict: Summary statistics as returned by summarize.
+        """
+        series = self._series.get(name)
+        if series is None:
+            return summarize([], percentiles)
+        since = None
+        if window is not None:
+            since = (time.time() if now is None else now) - window
+        return summarize(series.values(since), percentiles)
+
+
+DEFAULT_TIERS = (
+    (1, 3600),      # 1 second buckets for an hour
+    (60, 1440),     # 1 minute buckets for a day
+    (3600, 24 * 7), # 1 hour buckets for a week
+)
+
+
+class RollupTier:
+    """
+    Fixed-size ring of aggregated buckets at one resolution.
+
+    Each bucket keeps the min, max, sum and count of the samples that fell
+    into it. Samples update the open bucket in place; it is written to the
+    ring only when a sample for a later bucket arrives.
+
+    Args:
+        resolution (float): Bucket width in seconds.
+        capacity (int): Number of closed buckets kept.
+    """
+
+    def __init__(self, resolution, capacity):
+        self.resolution = resolution
+        self.capacity = capacity
+        self._starts = array('d', bytes(8 * capacity))
+        self._mins = array('d', bytes(8 * capacity))
+        self._maxs = array('d', bytes(8 * capacity))
+        self._sums = array('d', bytes(8 * capacity))
+        self._counts = array('L', bytes(array('L').itemsize * capacity))
+        self._next = 0
+        self._count = 0
+        self._open = None
+
+    @property
+    def span(self):
+        """
+        Seconds of history this tier can hold.
+        """
+        return self.resolution * self.capacity
+
+    def add(self, value, timestamp):
+        """
+        Fold a sample into its bucket.
+
+        Args:
+            value (float): Sample value.
+            timestamp (float): Sample time.
+        """
+        start = float(timestamp - timestamp % self.resolution)
+        bucket = self._open
+        if bucket is not None and bucket[0] == start:
+            if value < bucket[1]:
+                bucket[1] = value
+            if value > bucket[2]:
+                bucket[2] = value
+            bucket[3] += value
+            bucket[4] += 1
+            return
+        if bucket is not None and start < bucket[0]:
+            # Out-of-order sample for an already closed bucket; drop it.
+            return
+        if bucket is not None:
+            self._close(bucket)
+        self._open = [start, value, value, value, 1]
+
+    def _close(self, bucket):
+        i = self._next
+        self._starts[i], self._mins[i], self._maxs[i], self._sums[i], self._counts[i] = bucket
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def oldest(self):
+        """
+        Get the start of the oldest bucket held.
+
+        Returns:
+            float: Bucket start time, or None if the tier is empty.
+        """
+        if self._count:
+            return self._starts[(self._next - self._count) % self.capacity]
+        if self._open is not None:
+            return self._open[0]
+        return None
+
+    def buckets(self, start=None, end=None):
+        """
+        Get the buckets overlapping a time range, including the open one.
+
+        Args:
+            start (float, optional): Range start.
+            end (float, optional): Range end.
+
+        Returns:
+            list: Dictionaries with start, min, max, mean and count.
+        """
+        rows = []
+        first = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            i = (first + offset) % self.capacity
+            rows.append((self._starts[i], self._mins[i], self._maxs[i], self._sums[i], self._counts[i]))
+        if self._open is not None:
+            rows.append(tuple(self._open))
+
+        result = []
+        for bucket_start, low, high, total, count in rows:
+            if start is not None and bucket_start + self.resolution <= start:
+                continue
+            if end is not None and bucket_start > end:
+                continue
+            result.append({
+                "start": bucket_start,
+                "min": low,
+                "max": high,
+                "mean": total / count,
+                "count": count,
+            })
+        return result
+
+
+class RollupStore:
+    """
+    Multi-resolution metric history for long runs.
+
+    Every sample is folded into each tier's open bucket as it arrives, so
+    rollups are incremental and history is never rescanned. Memory is fixed
+    by the tier capacities. Has the same ``record``/``record_many``
+    interface as MetricStore, so SystemMetricsCollector can feed it. A
+    metric whose last sample is older than the longest tier's span is
+    dropped, like an idle metric in MetricStore.
+
+    Args:
+        tiers (iterable): (resolution seconds, bucket count) pairs, finest first.
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS):
+        self.tiers = tuple(sorted(tiers))
+        self.span = max(resolution * capacity for resolution, capacity in self.tiers)
+        self._series = {}
+        self._last_seen = {}
+
+    def record(self, name, value, timestamp=None):
+        """
+        Fold a sample into every tier of a metric.
+
+        Args:
+            name (str): Metric name.
+            value (float): Sample value; None is ignored.
+            timestamp (float, optional): Sample time. Defaults to now.
+        """
+        if value is None:
+            return
+        tiers = self._series.get(name)
+        if tiers is None:
+            tiers = self._series[name] = [RollupTier(resolution, capacity) for resolution, capacity in self.tiers]
+        timestamp = time.time() if timestamp is None else timestamp
+        for tier in tiers:
+            tier.add(value, timestamp)
+        self._last_seen[name] = timestamp
+
+    def record_many(self, values, timestamp=None):
+        """
+        Fold one sample into each of several metrics, then drop idle metrics.
+
+        Args:
+            values (dict): Metric name mapped to value.
+            timestamp (float, optional): Shared sample time. Defaults to now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        for name, value in values.items():
+            self.record(name, value, timestamp)
+        self.expire(timestamp)
+
+    def expire(self, now=None):
+        """
+        Drop metrics whose last sample has left every tier.
+
+        Args:
+            now (float, optional): Current time. Defaults to now.
+
+        Returns:
+            list: Names of the dropped metrics.
+        """
+        oldest = (time.time() if now is None else now) - self.span
+        expired = [name for name, seen in self._last_seen.items() if seen < oldest]
+        for name in expired:
+            del self._series[name]
+            del self._last_seen[name]
+        return expired
+
+    def metrics(self):
+        """
+        Get the names of all recorded metrics.
+
+        Returns:
+            list: Metric names, sorted.
+        """
+        return sorted(self._series)
+
+    def select_tier(self, name, start, resolution=None):
+        """
+        Pick the coarsest tier that is fine enough and still covers the range.
+
+        Args:
+            name (str): Metric name.
+            start (float): Range start.
+            resolution (float, optional): Coarsest acceptable bucket width.
+
+        Returns:
+            RollupTier: The chosen tier, or None if the metric is unknown.
+        """
+        tiers = self._series.get(name)
+        if not tiers:
+            return None
+        candidates = [t for t in tiers if resolution is None or t.resolution <= resolution] or tiers[:1]
+        covering = [t for t in candidates if t.oldest() is not None and t.oldest() <= start]
+        if covering:
+            # Without a requested resolution, return as much detail as the range allows.
+            return covering[-1] if resolution is not None else covering[0]
+        # Nothing reaches back far enough; use the tier with the longest history.
+        return min(candidates, key=lambda t: t.oldest() if t.oldest() is not None else math.inf)
+
+    def query(self, name, start, end=None, resolution=None):
+        """
+        Get aggregated buckets of a metric over a time range.
+
+        Args:
+            name (str): Metric name.
+            start (float): Range start.
+            end (float, optional): Range end. Defaults to now.
+            resolution (float, optional): Coarsest acceptable bucket width; the
+                finest tier covering the range is used if not given.
+
+        Returns:
+            dict: The chosen resolution and its list of buckets.
+        """
+        tier = self.select_tier(name, start, resolution)
+        if tier is None:
+            return {"resolution": None, "buckets": []}
+        return {"resolution": tier.resolution, "buckets": tier.buckets(start, end)}
+
+
+class SystemMetricsCollector:
+    """
+    Record the metrics of every monitoring module into a MetricStore or RollupStore.
+
+    Holds its own delta samplers, so CPU, disk and network rates are
+    measured between consecutive ``collect`` calls.
+
+    Args:
+        store (MetricStore or RollupStore): Store to record into.
+        gpu_poller (GpuPoller, optional): Also record GPU load and memory from this poller.
+    """
+
+    def __init__(self, store, gpu_poller=None):
+        self.store = store
+        self.gpu_poller = gpu_poller
+        self._cpu = cpu_monitoring.CpuSampler()
+        self._disk = disk_monitoring.DiskIORates()
+        self._network = network_monitoring.NetworkIORates()
+
+    def collect(self, snapshot=None):
+        """
+        Take one sample of every metric.
+
+        Args:
+            snapshot (Snapshot, optional): Snapshot to read from; one without
+                the process table is taken if not given.
+
+        Returns:
+            dict: The recorded metric values.
+        """
+        if snapshot is None:
+            snapshot = Snapshot(processes=False)
+
+        values = {}
+        cpu = self._cpu.sample(snapshot)
+        values["cpu.total"] = cpu.total
+        for core, percent in enumerate(cpu.per_core):
+            values[f"cpu.core.{core}"] = percent
+        values["memory.percent"] = memory_monitoring.get_memory_usage_percentage(snapshot)
+        if snapshot.memory.swap is not None:
+            values["swap.percent"] = snapshot.memory.swap.percent
+
+        for partition in disk_monitoring.unique_filesystems(snapshot.disk.partitions):
+            values[f"mount.{partition.mountpoint}.percent"] = partition.usage.percent
+            values[f"mount.{partition.mountpoint}.used_ratio"] = disk_monitoring.used_ratio(partition.usage)
+
+        for rate in self._disk.sample(snapshot):
+            values[f"disk.{rate.device}.read_bytes_per_sec"] = rate.read_bytes_per_sec
+            values[f"disk.{rate.device}.write_bytes_per_sec"] = rate.write_bytes_per_sec
+            values[f"disk.{rate.device}.utilization"] = rate.utilization
+
+        for rate in self._network.sample(snapshot):
+            values[f"net.{rate.name}.bytes_sent_per_sec"] = rate.bytes_sent_per_sec
+            values[f"net.{rate.name}.bytes_recv_per_sec"] = rate.bytes_recv_per_sec
+
+        if self.gpu_poller is not None:
+            for device in self.gpu_poller.get_devices():
+                values[f"gpu.{device.index}.load"] = device.load
+                values[f"gpu.{device.index}.memory_used"] = device.memory_used
+
+        # Collector timings, when instrumentation is enabled.
+        values.update(instrumentation.export_values())
+
+        self.store.record_many(values, snapshot.timestamp)
+        return values
+
+
+if __name__ == "__main__":
+    # Example usage and demonstration
+    store = MetricStore(retention=60)
+    collector = SystemMetricsCollector(store)
+    for _ in range(5):
+        collector.collect()
+        time.sleep(1)
+
+    print("Metric History (last 5 seconds):")
+    for name in ("cpu.total", "memory.percent"):
+        summary = store.query(name, window=5)
+        print(f"{name}: min {summary['min']}, max {summary['max']}, mean {summary['mean']:.2f}, p95 {summary['p95']}")
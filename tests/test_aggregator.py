@@ -0,0 +1,177 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import aggregator
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.status == 200:
+            body = json.dumps({"timestamp": 1000.0, "metrics": self.server.metrics}).encode()
+        else:
+            body = b"Internal Server Error\n"
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubAgent:
+    """
+    A local stand-in exporter that counts connections and requests.
+    """
+
+    def __init__(self, metrics, status=200):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = 0
+        self.server.metrics = metrics
+        self.server.status = status
+        self.server.drop_connections = False
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def endpoint(self):
+        return "127.0.0.1:%d" % self.server.server_address[1]
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fleet():
+    agents = [
+        StubAgent({"cpu.total": 10.0 * (i + 1), f"mount./data{i}.percent": 50.0 + i, "gpu.0.load": 5.0 * i})
+        for i in range(3)
+    ]
+    failing = StubAgent({}, status=500)
+
+    # Accepts connections (the kernel completes the handshake) but never answers.
+    hanging = socket.socket()
+    hanging.bind(("127.0.0.1", 0))
+    hanging.listen(16)
+
+    # Nothing listens on this port any more.
+    dead = socket.socket()
+    dead.bind(("127.0.0.1", 0))
+    dead_port = dead.getsockname()[1]
+    dead.close()
+
+    yield {
+        "agents": agents,
+        "failing": failing,
+        "hanging": "127.0.0.1:%d" % hanging.getsockname()[1],
+        "dead": "127.0.0.1:%d" % dead_port,
+    }
+    for agent in agents + [failing]:
+        agent.stop()
+    hanging.close()
+
+
+def test_poll_isolates_slow_and_dead_hosts(fleet):
+    agents = fleet["agents"]
+    endpoints = [agent.endpoint for agent in agents] + [fleet["failing"].endpoint, fleet["hanging"], fleet["dead"]]
+    timeout = 0.5
+
+    async def main():
+        fleet_aggregator = aggregator.FleetAggregator(endpoints, timeout=timeout)
+        try:
+            polls = []
+            for _ in range(3):
+                start = time.monotonic()
+                results = await fleet_aggregator.poll()
+                polls.append((time.monotonic() - start, results))
+            return polls
+        finally:
+            await fleet_aggregator.close()
+
+    polls = asyncio.run(main())
+
+    for elapsed, results in polls:
+        # The hanging host costs one timeout for the whole poll, not per host.
+        assert elapsed < timeout + 0.4
+        for agent in agents:
+            result = results[agent.endpoint]
+            assert result.ok
+            assert result.latency < timeout
+        assert results[fleet["hanging"]].error == f"timed out after {timeout} s"
+        assert not results[fleet["dead"]].ok
+        assert results[fleet["failing"].endpoint].error == "HTTP 500"
+
+    # One keep-alive connection per healthy agent, reused by every poll.
+    for agent in agents:
+        assert agent.server.connections == 1
+        assert agent.server.requests == 3
+    # An HTTP error is an answer: no retry, and the connection is kept.
+    assert fleet["failing"].server.requests == 3
+    assert fleet["failing"].server.connections == 1
+
+    summary = aggregator.fleet_summary(polls[-1][1], n=2)
+    assert summary["hottest_cpus"] == [(agents[2].endpoint, 30.0), (agents[1].endpoint, 20.0)]
+    assert summary["fullest_disks"] == [(agents[2].endpoint, "/data2", 52.0), (agents[1].endpoint, "/data1", 51.0)]
+    assert summary["gpu_loads"] == [(agents[2].endpoint, "0", 10.0), (agents[1].endpoint, "0", 5.0)]
+    assert summary["reachable"] == sorted(agent.endpoint for agent in agents)
+    assert summary["unreachable"] == sorted([fleet["failing"].endpoint, fleet["hanging"], fleet["dead"]])
+
+
+def test_http_status_error_is_not_retried(fleet):
+    failing = fleet["failing"]
+
+    async def main():
+        connection = aggregator.AgentConnection(*aggregator.parse_endpoint(failing.endpoint))
+        try:
+            for _ in range(2):
+                with pytest.raises(aggregator.HTTPStatusError) as error:
+                    await connection.get("/metrics.json")
+                assert error.value.status == 500
+        finally:
+            await connection.close()
+
+    asyncio.run(main())
+    assert failing.server.requests == 2
+    assert failing.server.connections == 1
+
+
+def test_reconnects_once_after_the_agent_drops_the_connection(fleet):
+    agent = fleet["agents"][0]
+    # Close every connection after one response, without a Connection:
+    # close header, like an agent's idle timeout.
+    agent.server.drop_connections = True
+
+    async def main():
+        connection = aggregator.AgentConnection(*aggregator.parse_endpoint(agent.endpoint))
+        try:
+            bodies = [await connection.get("/metrics.json") for _ in range(3)]
+        finally:
+            await connection.close()
+        return [json.loads(body) for body in bodies]
+
+    documents = asyncio.run(main())
+    assert [document["metrics"]["cpu.total"] for document in documents] == [10.0] * 3
+    assert agent.server.requests == 3
+    assert agent.server.connections == 3
@@ -0,0 +1,155 @@
+import math
+import queue
+
+import pytest
+
+import alerts
+
+METRIC = "mount./data.used_ratio"
+
+
+def _feed(rule, series, start=1000.0):
+    fired = []
+    for i, value in enumerate(series):
+        alert = rule.evaluate(METRIC, value, start + i)
+        if alert is not None:
+            fired.append(alert)
+    return fired
+
+
+@pytest.mark.parametrize("step_at", [10, 1800, 3700, 7000])
+def test_flat_series_with_one_quantization_step_does_not_fire(step_at):
+    # Two hours at 1 Hz of a disk that is not filling, except for one
+    # rounding step of 0.1% somewhere in the series.
+    series = [0.800 if i < step_at else 0.801 for i in range(7200)]
+    rule = alerts.DiskFillRule(horizon_hours=24)
+
+    assert _feed(rule, series) == []
+    assert rule.forecast()[METRIC] is None or rule.forecast()[METRIC] > 24
+
+
+def test_no_forecast_before_min_span():
+    rule = alerts.DiskFillRule(horizon_hours=24, min_span=3600)
+    # Filling at 10% per hour: full in 2 hours, but only 10 minutes seen.
+    series = [0.8 + i * 0.1 / 3600 for i in range(600)]
+
+    assert _feed(rule, series) == []
+    assert rule.forecast()[METRIC] is None
+
+
+def test_steady_fill_fires_and_resolves():
+    rule = alerts.DiskFillRule(horizon_hours=24, min_span=3600)
+    # 1% per hour from 50%: about 48 hours left, not yet within the horizon.
+    series = [0.5 + i * 0.01 / 3600 for i in range(7200)]
+    assert _feed(rule, series) == []
+    assert rule.forecast()[METRIC] == pytest.approx(48, rel=0.01)
+
+    # The fill speeds up to 5% per hour: full in about 10 hours.
+    level = series[-1]
+    series = [level + i * 0.05 / 3600 for i in range(1, 4 * 3600)]
+    fired = _feed(rule, series, start=1000.0 + 7200)
+    assert [alert.state for alert in fired] == [alerts.FIRING]
+    assert fired[0].message.startswith("disk_fill: /data full in ")
+    assert 0 < fired[0].value <= 24
+
+    # The disk stops filling; the alert resolves.
+    level = series[-1]
+    fired = _feed(rule, [level] * 24 * 3600, start=1000.0 + 7200 + 4 * 3600)
+    assert [alert.state for alert in fired] == [alerts.RESOLVED]
+
+
+def test_estimator_decays_by_elapsed_time():
+    # The same trend sampled at 1 Hz and every 10 s gives the same slope.
+    fast = alerts.FillRateEstimator(half_life=3600)
+    slow = alerts.FillRateEstimator(half_life=3600)
+    for i in range(7200):
+        fast.add(float(i), 0.2 + i * 1e-6)
+        if i % 10 == 0:
+            slow.add(float(i), 0.2 + i * 1e-6)
+
+    assert fast.slope == pytest.approx(1e-6)
+    assert slow.slope == pytest.approx(1e-6)
+    assert fast.span == 7199
+    assert fast.seconds_until(1.0) == pytest.approx((1.0 - fast.last_value) / 1e-6)
+    assert math.isclose(fast.seconds_until(0.0), 0.0)
+
+
+def _states(rule, metric, samples, start=1000.0):
+    return [getattr(rule.evaluate(metric, value, start + i), "state", None) for i, value in enumerate(samples)]
+
+
+def test_threshold_hysteresis_fires_once_and_resolves_past_the_gap():
+    rule = alerts.ThresholdRule("cpu_high", "cpu.total", above=90, hysteresis=10)
+    assert _states(rule, "cpu.total", [50, 95, 99, 91, 85, 81, 80, 95]) == [
+        None, alerts.FIRING, None, None, None, None, alerts.RESOLVED, alerts.FIRING]
+
+    low = alerts.ThresholdRule("free_low", "memory.available_percent", below=10, hysteresis=5)
+    assert _states(low, "memory.available_percent", [20, 5, 12, 15]) == [None, alerts.FIRING, None, alerts.RESOLVED]
+
+
+def test_threshold_for_seconds_sustain_and_reset():
+    rule = alerts.ThresholdRule("cpu_high", "cpu.total", above=90, for_seconds=3)
+    # The dip at t=3 restarts the sustain window.
+    assert _states(rule, "cpu.total", [95, 95, 95, 50, 95, 95, 95, 95]) == [
+        None, None, None, None, None, None, None, alerts.FIRING]
+
+
+def test_rule_state_is_per_matching_metric():
+    rule = alerts.ThresholdRule("filesystem_full", "mount.*.percent", above=95)
+    assert rule.matches("mount./data.percent")
+    assert not rule.matches("mount./data.used_ratio")
+    assert rule.evaluate("mount./data.percent", 99, 1000.0).state == alerts.FIRING
+    assert rule.evaluate("mount./home.percent", 99, 1000.0).state == alerts.FIRING
+    rule.forget("mount./data.percent")
+    assert sorted(rule._states) == ["mount./home.percent"]
+
+
+def test_rate_rule_smooths_with_an_ewma():
+    rule = alerts.RateRule("swap_growing", "swap.percent", max_rate=4, smoothing=0.5)
+    # Rates per second: -, 10, 0, 0, 10.
+    rates = []
+    for i, value in enumerate([0, 10, 10, 10, 20]):
+        alert = rule.evaluate("swap.percent", value, 1000.0 + i)
+        rates.append(rule._states["swap.percent"].rate)
+        if alert is not None:
+            rates.append(alert.state)
+    assert rates == [None, 10.0, alerts.FIRING, 5.0, 2.5, alerts.RESOLVED, 6.25, alerts.FIRING]
+
+    # Samples that do not move time forward are skipped.
+    assert rule.evaluate("swap.percent", 100, 1004.0) is None
+    assert rule._states["swap.percent"].rate == 6.25
+
+
+def test_engine_delivers_to_queue_and_callbacks():
+    delivered = queue.Queue()
+    engine = alerts.AlertEngine([alerts.ThresholdRule("cpu_high", "cpu.total", above=90)], alert_queue=delivered)
+    seen = []
+    engine.subscribe(lambda alert: 1 / 0)
+    engine.subscribe(seen.append)
+
+    fired = engine.process({"cpu.total": 95.0, "memory.percent": 50.0, "swap.percent": None}, 1000.0)
+    assert [alert.state for alert in fired] == [alerts.FIRING]
+    # A failing callback does not stop delivery to the others.
+    assert seen == fired
+    assert delivered.get_nowait() == fired[0]
+    assert engine.process({"cpu.total": 96.0}, 1001.0) == []
+    assert delivered.empty()
+
+    engine.add_rule(alerts.ThresholdRule("memory_high", "memory.percent", above=40))
+    assert [alert.rule for alert in engine.process({"memory.percent": 50.0}, 1002.0)] == ["memory_high"]
+
+
+def test_engine_forgets_metrics_that_went_idle():
+    rule = alerts.ThresholdRule("filesystem_full", "mount.*.percent", above=95)
+    engine = alerts.AlertEngine([rule], retention=60)
+    engine.process({"mount./data.percent": 99.0, "mount./mnt/usb.percent": 99.0}, 1000.0)
+
+    # The USB disk was unplugged; /data keeps reporting.
+    engine.process({"mount./data.percent": 99.0}, 1060.0)
+    assert sorted(rule._states) == ["mount./data.percent", "mount./mnt/usb.percent"]
+    engine.process({"mount./data.percent": 99.0}, 1061.0)
+    assert sorted(rule._states) == ["mount./data.percent"]
+    assert sorted(engine._matches) == ["mount./data.percent"]
+
+    assert engine.expire(now=1200.0) == ["mount./data.percent"]
+    assert rule._states == {}
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import benchmark
+import disk_monitoring
+
+
+def test_import_does_not_install_an_audit_hook():
+    # Hooks cannot be removed, so check in a fresh interpreter.
+    directory = os.path.dirname(benchmark.__file__)
+    code = f"import sys; sys.path.insert(0, {directory!r}); import benchmark; print(benchmark._hook_installed)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
+
+
+def test_count_events_installs_the_hook_lazily(tmp_path):
+    with benchmark.count_events() as events:
+        open(tmp_path / "file", "w").close()
+    assert benchmark._hook_installed
+    assert events["open"] >= 1
+
+
+def test_synthetic_mounts_are_scanned_as_distinct_filesystems():
+    with benchmark.synthetic_mounts(5) as fake:
+        index = disk_monitoring.DeviceIndex()
+        disk_monitoring.scan_partitions(index=index)
+        scans = disk_monitoring.scan_partitions(index=index)
+    fake_mountpoints = {partition.mountpoint for partition in fake}
+    fake_scans = [scan for scan in scans if scan.mountpoint in fake_mountpoints]
+    assert len({scan.st_dev for scan in fake_scans}) == 5
+    unique = {scan.mountpoint for scan in disk_monitoring.unique_filesystems(scans)}
+    assert fake_mountpoints <= unique
@@ -0,0 +1,201 @@
+import os
+
+import pytest
+
+import cgroup_monitoring
+
+
+def _write(root, path, text):
+    path = os.path.join(str(root), path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cgroup_monitoring.time, "monotonic", clock)
+    return clock
+
+
+def _v2_cgroup(root, path, usage_usec, memory, rbytes, wbytes, memory_max="max"):
+    directory = path.lstrip("/")
+    _write(root, os.path.join(directory, "cpu.stat"),
+           f"usage_usec {usage_usec}\nuser_usec {usage_usec * 3 // 4}\nsystem_usec {usage_usec // 4}\n"
+           "nr_periods 0\nnr_throttled 0\nthrottled_usec 0\n")
+    _write(root, os.path.join(directory, "memory.current"), f"{memory}\n")
+    _write(root, os.path.join(directory, "memory.max"), f"{memory_max}\n")
+    _write(root, os.path.join(directory, "io.stat"),
+           f"8:0 rbytes={rbytes} wbytes={wbytes} rios=10 wios=20 dbytes=0 dios=0\n"
+           f"253:0 rbytes={rbytes} wbytes=0 rios=5 wios=0 dbytes=0 dios=0\n")
+
+
+@pytest.fixture
+def v2_root(tmp_path):
+    root = tmp_path / "cgroup2"
+    _write(root, "cgroup.controllers", "cpuset cpu io memory pids\n")
+    _v2_cgroup(root, "/system.slice/sshd.service", 1000000, 8 << 20, 4096, 8192, memory_max=str(64 << 20))
+    _v2_cgroup(root, "/user.slice", 5000000, 512 << 20, 0, 0)
+    return root
+
+
+@pytest.fixture
+def v1_root(tmp_path):
+    root = tmp_path / "cgroup1"
+    group = "docker/abc123"
+    _write(root, f"cpu,cpuacct/{group}/cpuacct.usage", "2000000000\n")
+    _write(root, f"cpu,cpuacct/{group}/cpuacct.stat", "user 150\nsystem 50\n")
+    _write(root, f"cpu,cpuacct/{group}/cpu.stat", "nr_periods 10\nnr_throttled 2\nthrottled_time 300000000\n")
+    _write(root, f"memory/{group}/memory.usage_in_bytes", f"{100 << 20}\n")
+    _write(root, f"memory/{group}/memory.limit_in_bytes", "9223372036854771712\n")
+    _write(root, f"blkio/{group}/blkio.throttle.io_service_bytes",
+           "8:0 Read 4096\n8:0 Write 12288\n8:0 Sync 0\n8:0 Async 0\n8:0 Total 16384\n"
+           "8:16 Read 4096\n8:16 Write 0\nTotal 20480\n")
+    _write(root, f"blkio/{group}/blkio.throttle.io_serviced",
+           "8:0 Read 1\n8:0 Write 3\n8:0 Total 4\nTotal 4\n")
+    return root
+
+
+def test_v2_detection_and_listing(v2_root):
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v2_root))
+    assert monitor.version == 2
+    assert monitor.list_cgroups() == ["/", "/system.slice", "/system.slice/sshd.service", "/user.slice"]
+    assert cgroup_monitoring.CgroupMonitor(root=str(v2_root), max_depth=1).list_cgroups() == [
+        "/", "/system.slice", "/user.slice"]
+
+
+def test_v2_read(v2_root):
+    counters = cgroup_monitoring.CgroupMonitor(root=str(v2_root)).read("/system.slice/sshd.service")
+    assert counters.cpu_usec == 1000000
+    assert counters.cpu_user_usec == 750000
+    assert counters.cpu_system_usec == 250000
+    assert counters.throttled_usec == 0
+    assert counters.memory_current == 8 << 20
+    assert counters.memory_limit == 64 << 20
+    assert (counters.read_bytes, counters.write_bytes) == (8192, 8192)
+    assert (counters.read_ops, counters.write_ops) == (15, 20)
+
+    unlimited = cgroup_monitoring.CgroupMonitor(root=str(v2_root)).read("/user.slice")
+    assert unlimited.memory_limit is None
+
+
+def test_v2_rates(v2_root, clock):
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v2_root))
+    path = "/system.slice/sshd.service"
+    first, = monitor.sample([path])
+    assert first.cpu_percent is None
+    assert first.read_bytes_per_sec is None
+    assert first.memory_percent == pytest.approx(12.5)
+
+    # Half a CPU second and 1 MB read over two seconds.
+    _v2_cgroup(v2_root, path, 1500000, 16 << 20, 4096 + (512 << 10), 8192, memory_max=str(64 << 20))
+    clock.now += 2
+    second, = monitor.sample([path])
+    assert second.cpu_percent == pytest.approx(25.0)
+    assert second.user_percent == pytest.approx(18.75)
+    assert second.system_percent == pytest.approx(6.25)
+    assert second.read_bytes_per_sec == pytest.approx(512 << 10)
+    assert second.write_bytes_per_sec == 0
+    assert second.memory_percent == pytest.approx(25.0)
+
+    # A re-created cgroup starts its counters again; rates never go negative.
+    _v2_cgroup(v2_root, path, 100, 16 << 20, 0, 0, memory_max=str(64 << 20))
+    clock.now += 1
+    third, = monitor.sample([path])
+    assert third.cpu_percent == 0
+    assert third.read_bytes_per_sec == 0
+
+
+def test_v1_read(v1_root):
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v1_root))
+    monitor._ticks = 100
+    assert monitor.version == 1
+    assert "/docker/abc123" in monitor.list_cgroups()
+
+    counters = monitor.read("/docker/abc123")
+    assert counters.cpu_usec == 2000000
+    assert counters.cpu_user_usec == 1500000
+    assert counters.cpu_system_usec == 500000
+    assert counters.throttled_usec == 300000
+    assert counters.memory_current == 100 << 20
+    assert counters.memory_limit is None
+    assert (counters.read_bytes, counters.write_bytes) == (8192, 12288)
+    assert (counters.read_ops, counters.write_ops) == (1, 3)
+
+
+def test_v1_rates(v1_root, clock):
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v1_root))
+    monitor.sample(["/docker/abc123"])
+    _write(v1_root, "cpu,cpuacct/docker/abc123/cpuacct.usage", "4000000000\n")
+    _write(v1_root, "memory/docker/abc123/memory.limit_in_bytes", f"{200 << 20}\n")
+    clock.now += 4
+    rate, = monitor.sample(["/docker/abc123"])
+    assert rate.cpu_percent == pytest.approx(50.0)
+    assert rate.memory_percent == pytest.approx(50.0)
+    assert rate.read_bytes_per_sec == 0
+
+
+def test_cgroup_of_and_map_processes_v2(v2_root, tmp_path):
+    proc = tmp_path / "proc"
+    _write(proc, "1/cgroup", "0::/init.scope\n")
+    _write(proc, "100/cgroup", "0::/system.slice/sshd.service\n")
+    _write(proc, "101/cgroup", "0::/system.slice/sshd.service\n")
+    # A hybrid host lists v1 hierarchies next to the unified one.
+    _write(proc, "200/cgroup", "12:memory:/user.slice\n0::/user.slice/session-1.scope\n")
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v2_root), proc_root=str(proc))
+
+    assert monitor.cgroup_of(200) == "/user.slice/session-1.scope"
+    assert monitor.cgroup_of(999) is None
+    assert monitor.map_processes([1, 100, 101, 200, 999]) == {
+        "/init.scope": [1],
+        "/system.slice/sshd.service": [100, 101],
+        "/user.slice/session-1.scope": [200],
+    }
+
+    # A pid that left the list is looked up afresh when it comes back.
+    monitor.map_processes([1])
+    _write(proc, "100/cgroup", "0::/user.slice\n")
+    assert monitor.map_processes([100]) == {"/user.slice": [100]}
+
+
+def test_cgroup_of_v1_prefers_the_most_specific_path(v1_root, tmp_path):
+    proc = tmp_path / "proc"
+    _write(proc, "42/cgroup",
+           "12:pids:/docker/abc123/extra\n"
+           "8:memory:/docker/abc123\n"
+           "4:cpu,cpuacct:/docker/abc123\n"
+           "3:blkio:/\n"
+           "1:name=systemd:/system.slice/docker.service\n")
+    _write(proc, "43/cgroup", "4:cpu,cpuacct:/\n8:memory:/\n")
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v1_root), proc_root=str(proc))
+
+    assert monitor.cgroup_of(42) == "/docker/abc123"
+    assert monitor.cgroup_of(43) == "/"
+    assert monitor.map_processes([42, 43]) == {"/docker/abc123": [42], "/": [43]}
+
+
+def test_map_processes_notices_a_recycled_pid(v2_root, tmp_path):
+    from process_monitoring import ProcessRow
+
+    proc = tmp_path / "proc"
+    _write(proc, "100/cgroup", "0::/system.slice/sshd.service\n")
+    monitor = cgroup_monitoring.CgroupMonitor(root=str(v2_root), proc_root=str(proc))
+    sshd = ProcessRow(100, "sshd", 0.0, 1 << 20, 1000.0)
+    assert monitor.map_processes([sshd]) == {"/system.slice/sshd.service": [sshd]}
+
+    # The same process again comes from the cache.
+    _write(proc, "100/cgroup", "0::/user.slice\n")
+    assert monitor.map_processes([sshd]) == {"/system.slice/sshd.service": [sshd]}
+
+    # sshd exited and pid 100 went to a new process within one refresh.
+    shell = ProcessRow(100, "bash", 0.0, 1 << 20, 2000.0)
+    assert monitor.map_processes([shell]) == {"/user.slice": [shell]}
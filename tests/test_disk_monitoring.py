@@ -0,0 +1,172 @@
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+import disk_monitoring
+
+Partition = namedtuple("Partition", ["device", "mountpoint", "fstype", "opts"])
+
+
+@pytest.fixture
+def stub_mounts(monkeypatch):
+    """
+    Fake partitions whose statvfs blocks for mountpoints starting with /hung.
+    """
+    release = threading.Event()
+    mounts = []
+
+    def disk_partitions(all=False):
+        return [Partition(f"/dev/stub{i}", mountpoint, "ext4", "rw") for i, mountpoint in enumerate(mounts)]
+
+    def statvfs_usage(mountpoint, started):
+        started[mountpoint] = time.monotonic()
+        if mountpoint.startswith("/hung"):
+            release.wait()
+        usage = disk_monitoring.DiskUsage(total=100, used=40, free=60, percent=40.0)
+        return usage, hash(mountpoint), 0
+
+    monkeypatch.setattr(disk_monitoring.psutil, "disk_partitions", disk_partitions)
+    monkeypatch.setattr(disk_monitoring, "_statvfs_usage", statvfs_usage)
+    monkeypatch.setattr(disk_monitoring, "_hung_mounts", {})
+    yield mounts
+    release.set()
+
+
+def _statuses(scans):
+    return {scan.mountpoint: scan.status for scan in scans}
+
+
+def test_healthy_mount_behind_hung_one_with_one_worker(stub_mounts):
+    stub_mounts[:] = ["/hung", "/data", "/home"]
+    statuses = _statuses(disk_monitoring.scan_partitions(timeout=0.2, max_workers=1))
+    assert statuses == {"/hung": "timeout", "/data": "ok", "/home": "ok"}
+
+
+def test_many_hung_mounts_do_not_starve_healthy_ones(stub_mounts):
+    stub_mounts[:] = [f"/hung{i}" for i in range(10)] + ["/data", "/home"]
+    start = time.monotonic()
+    statuses = _statuses(disk_monitoring.scan_partitions(timeout=0.2, max_workers=4))
+
+    assert all(statuses[f"/hung{i}"] == "timeout" for i in range(10))
+    assert statuses["/data"] == "ok"
+    assert statuses["/home"] == "ok"
+    assert time.monotonic() - start < 0.2 * 3 + 0.5
+
+
+def test_hung_mount_is_not_retried_while_still_hanging(stub_mounts):
+    stub_mounts[:] = ["/hung", "/data"]
+    disk_monitoring.scan_partitions(timeout=0.2, max_workers=1)
+
+    start = time.monotonic()
+    statuses = _statuses(disk_monitoring.scan_partitions(timeout=0.2, max_workers=1))
+    assert statuses == {"/hung": "timeout", "/data": "ok"}
+    assert time.monotonic() - start < 0.2
+
+
+def test_mounts_that_never_start_are_skipped(monkeypatch):
+    # A pool that never runs anything: every job stays queued.
+    futures = []
+
+    def idle_pool(jobs, max_workers):
+        futures.extend(disk_monitoring.Future() for _ in jobs)
+        return list(futures), lambda: None
+
+    monkeypatch.setattr(disk_monitoring.psutil, "disk_partitions",
+                        lambda all=False: [Partition("/dev/stub0", "/data", "ext4", "rw")])
+    monkeypatch.setattr(disk_monitoring, "_run_daemon_pool", idle_pool)
+    monkeypatch.setattr(disk_monitoring, "_hung_mounts", {})
+
+    statuses = _statuses(disk_monitoring.scan_partitions(timeout=0.1, max_workers=1))
+    assert statuses == {"/data": "skipped"}
+    assert futures[0].cancelled()
+
+
+DiskCounters = namedtuple("DiskCounters", ["read_bytes", "write_bytes", "read_count", "write_count",
+                                           "read_time", "write_time", "busy_time"])
+
+
+class TickingDiskSource:
+    """
+    Read bytes of 1000 * tick**2 at each one-second tick of a fake clock.
+
+    Each thread sees the clock value of the counters it read last. A sampler
+    that measures every reading against the one just before it reports
+    (2 * tick - 1) * 1000 bytes/s.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ticks = 0
+        self.local = threading.local()
+
+    def disk_io_counters(self, perdisk=True):
+        with self.lock:
+            self.ticks += 1
+            self.local.now = float(self.ticks)
+            return {"sda": DiskCounters(self.ticks ** 2 * 1000, 0, self.ticks, 0, 0, 0, 0)}
+
+    def time(self):
+        return self.local.now
+
+    def monotonic(self):
+        return self.local.now
+
+
+def test_disk_io_rates_can_be_shared_between_threads(monkeypatch):
+    source = TickingDiskSource()
+    monkeypatch.setattr(disk_monitoring.procfs, "get_source", lambda: source)
+    monkeypatch.setattr(disk_monitoring, "time", source)
+    # Switch threads as often as possible to expose races.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    monkeypatch.setattr(disk_monitoring, "map_devices_to_mountpoints", lambda partitions=None: {})
+    rates = disk_monitoring.DiskIORates()
+    rates.sample()
+    seen = []
+
+    def work():
+        for _ in range(2000):
+            rate = rates.sample()[0].read_bytes_per_sec
+            seen.append(rate - (2 * source.local.now - 1) * 1000)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert set(seen) == {0.0}
+
+
+def test_concurrent_scans_clear_a_recovered_mount_once(stub_mounts):
+    stub_mounts[:] = ["/data"]
+    errors = []
+
+    def scan():
+        try:
+            disk_monitoring.scan_partitions(timeout=1.0, max_workers=1)
+        except Exception as e:
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(50):
+            # A hung call on /data has finished; every scan wants to clear it.
+            recovered = disk_monitoring.Future()
+            recovered.set_result(None)
+            disk_monitoring._hung_mounts["/data"] = recovered
+            threads = [threading.Thread(target=scan) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert disk_monitoring._hung_mounts == {}
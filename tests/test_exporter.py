@@ -0,0 +1,30 @@
+import json
+import urllib.request
+
+import exporter
+
+
+class StubCollector:
+    def collect(self):
+        return {"cpu.total": 12.5, "mount./.percent": 40.0}
+
+
+def test_defaults_are_local_and_off_node_exporter_port():
+    metrics = exporter.MetricsExporter(collector=StubCollector())
+    assert metrics.host == "127.0.0.1"
+    assert metrics.port == exporter.DEFAULT_PORT != 9100
+
+
+def test_serves_on_loopback():
+    metrics = exporter.MetricsExporter(collector=StubCollector(), port=0)
+    host, port = metrics.start()
+    try:
+        assert host == "127.0.0.1"
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics.json", timeout=5) as response:
+            document = json.load(response)
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            page = response.read().decode()
+    finally:
+        metrics.stop()
+    assert document["metrics"]["cpu.total"] == 12.5
+    assert 'systeminfo_filesystem_percent{mountpoint="/"} 40.0' in page
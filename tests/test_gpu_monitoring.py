@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+
+import gpu_monitoring
+
+
+class FakeBackend:
+    """
+    Returns one GPU whose load is the number of queries made so far.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("driver gone")
+        return [gpu_monitoring.GpuInfo(0, "Fake GPU", 50.0, 1024.0, 8192.0, float(self.calls))]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(gpu_monitoring.time, "monotonic", clock)
+    return clock
+
+
+def test_cached_within_the_staleness_window(clock):
+    backend = FakeBackend()
+    poller = gpu_monitoring.GpuPoller(backend, interval=1.0)
+
+    for _ in range(10):
+        assert poller.get_device(0).load == 1.0
+    assert backend.calls == 1
+
+    clock.now += 2.0
+    assert poller.get_device(0).load == 1.0
+    clock.now += 0.5
+    assert poller.get_device(0).load == 2.0
+    assert backend.calls == 2
+    assert poller.get_device(1) is None
+
+
+def test_failed_query_leaves_the_cache_to_go_stale(clock):
+    backend = FakeBackend()
+    poller = gpu_monitoring.GpuPoller(backend, interval=1.0)
+    poller.poll()
+    backend.fail = True
+
+    assert poller.poll() == []
+    assert isinstance(poller.last_error, RuntimeError)
+    assert poller.get_device(0).load == 1.0
+    clock.now += 3.0
+    assert poller.get_devices() == []
+
+
+def test_background_thread_start_and_stop():
+    backend = FakeBackend()
+    poller = gpu_monitoring.GpuPoller(backend, interval=0.02)
+    poller.start()
+    thread = poller._thread
+    # A second start does not spawn another thread.
+    poller.start()
+    assert poller._thread is thread
+    time.sleep(0.2)
+    assert backend.calls > 2
+
+    poller.stop()
+    assert not thread.is_alive()
+    assert poller._thread is None
+    calls = backend.calls
+    time.sleep(0.1)
+    assert backend.calls == calls
+
+    # The poller can be started again after a stop.
+    poller.start()
+    assert poller._thread.is_alive()
+    poller.stop()
+
+
+def test_stop_does_not_wait_for_the_interval():
+    poller = gpu_monitoring.GpuPoller(FakeBackend(), interval=60.0)
+    poller.start()
+    start = time.monotonic()
+    poller.stop()
+    assert time.monotonic() - start < 1.0
+
+
+def test_nvidia_smi_parsing(monkeypatch):
+    output = (
+        "0, NVIDIA A100-SXM4-40GB, 34, 1024, 40960, 12\n"
+        "\n"
+        "1, NVIDIA GeForce GT 710, [N/A], 300, 2048, [N/A]\n"
+        "2, Truncated GPU, 40\n"
+        "[N/A], Unknown, 1, 2, 3, 4\n"
+    )
+    seen = {}
+
+    def check_output(args, timeout, universal_newlines):
+        seen["args"] = args
+        return output
+
+    monkeypatch.setattr(gpu_monitoring.subprocess, "check_output", check_output)
+    devices = gpu_monitoring.NvidiaSmiBackend(command="fake-smi")()
+
+    assert seen["args"][0] == "fake-smi"
+    assert devices == [
+        gpu_monitoring.GpuInfo(0, "NVIDIA A100-SXM4-40GB", 34.0, 1024.0, 40960.0, 12.0),
+        gpu_monitoring.GpuInfo(1, "NVIDIA GeForce GT 710", None, 300.0, 2048.0, None),
+        gpu_monitoring.GpuInfo(2, "Truncated GPU", 40.0, None, None, None),
+    ]
+
+
+def test_default_poller_is_created_once(monkeypatch):
+    created = []
+
+    class CountingPoller(gpu_monitoring.GpuPoller):
+        def __init__(self):
+            created.append(self)
+            super().__init__(FakeBackend(), interval=60.0)
+
+    monkeypatch.setattr(gpu_monitoring, "GpuPoller", CountingPoller)
+    monkeypatch.setattr(gpu_monitoring, "_default_poller", None)
+    barrier = threading.Barrier(8)
+    pollers = []
+
+    def get():
+        barrier.wait()
+        pollers.append(gpu_monitoring.get_default_poller())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert len(created) == 1
+        assert all(poller is created[0] for poller in pollers)
+    finally:
+        created[0].stop()
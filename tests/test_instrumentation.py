@@ -0,0 +1,90 @@
+import sys
+
+import pytest
+
+import instrumentation
+
+FAKE_MODULE = '''
+clock = None
+
+
+def inner():
+    clock.now += 2.0
+
+
+def outer():
+    clock.now += 1.0
+    inner()
+    inner()
+    clock.now += 0.5
+
+
+def numbers():
+    clock.now += 1.0
+    yield 1
+    yield 2
+
+
+class Reader:
+    def read(self):
+        clock.now += 3.0
+        return inner()
+'''
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    (tmp_path / "fake_collectors.py").write_text(FAKE_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import fake_collectors
+
+    clock = fake_collectors.clock = Clock()
+    monkeypatch.setattr(instrumentation.time, "perf_counter", clock)
+    instrumentation.stats.reset()
+    instrumentation.enable(modules=("fake_collectors",))
+    yield fake_collectors
+    instrumentation.disable()
+    instrumentation.stats.reset()
+    sys.modules.pop("fake_collectors", None)
+
+
+def test_nested_collectors_record_self_time(fake_module):
+    fake_module.outer()
+    fake_module.Reader().read()
+
+    outer = instrumentation.stats.get("fake_collectors.outer")
+    assert outer["total_seconds"] == 5.5
+    assert outer["self_seconds"] == 1.5
+    inner = instrumentation.stats.get("fake_collectors.inner")
+    assert inner["calls"] == 3
+    assert inner["total_seconds"] == inner["self_seconds"] == 6.0
+    read = instrumentation.stats.get("fake_collectors.Reader.read")
+    assert (read["total_seconds"], read["self_seconds"]) == (5.0, 3.0)
+
+    # Self times add up to the time actually spent.
+    assert sum(entry["self_seconds"] for entry in instrumentation.stats.as_dict().values()) == 10.5
+    assert instrumentation.export_values()["collector.fake_collectors.outer.self_seconds"] == 1.5
+
+
+def test_generator_functions_are_not_wrapped(fake_module):
+    assert list(fake_module.numbers()) == [1, 2]
+    assert instrumentation.stats.get("fake_collectors.numbers") is None
+    assert not hasattr(fake_module.numbers, "__wrapped__")
+    assert hasattr(fake_module.outer, "__wrapped__")
+
+
+def test_disable_restores_the_originals(fake_module):
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    assert not hasattr(fake_module.outer, "__wrapped__")
+    fake_module.outer()
+    assert instrumentation.stats.get("fake_collectors.outer") is None
+    assert instrumentation.export_values() == {}
@@ -0,0 +1,123 @@
+import os
+
+import pytest
+
+import memory_monitoring
+from process_monitoring import ProcessRow
+
+
+def _write(root, path, text):
+    path = os.path.join(str(root), path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_memory_pressure(tmp_path):
+    _write(tmp_path, "pressure/memory",
+           "some avg10=1.50 avg60=0.75 avg300=0.10 total=123456\n"
+           "full avg10=0.50 avg60=0.25 avg300=0.00 total=65432\n")
+    pressure = memory_monitoring.get_memory_pressure(str(tmp_path))
+    assert pressure == memory_monitoring.MemoryPressure(1.5, 0.75, 0.1, 123456, 0.5, 0.25, 0.0, 65432)
+    assert isinstance(pressure.some_total, int)
+
+
+def test_memory_pressure_without_full_line_or_psi(tmp_path):
+    _write(tmp_path, "pressure/memory", "some avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    pressure = memory_monitoring.get_memory_pressure(str(tmp_path))
+    assert pressure.some_total == 0
+    assert pressure.full_avg10 is None
+    assert memory_monitoring.get_memory_pressure(str(tmp_path / "missing")) is None
+
+
+def _vmstat(root, pgfault, pgmajfault, pswpin=None, pswpout=None):
+    lines = ["nr_free_pages 1000", f"pgfault {pgfault}", f"pgmajfault {pgmajfault}"]
+    if pswpin is not None:
+        lines += [f"pswpin {pswpin}", f"pswpout {pswpout}"]
+    _write(root, "vmstat", "\n".join(lines) + "\n")
+
+
+def test_vmstat_rates_from_deltas(tmp_path, monkeypatch):
+    now = [1100.0]
+    monkeypatch.setattr(memory_monitoring.time, "time", lambda: now[0])
+    monkeypatch.setattr(memory_monitoring.psutil, "boot_time", lambda: 1000.0)
+    sampler = memory_monitoring.VmstatSampler(str(tmp_path))
+
+    # The first sample averages since boot.
+    _vmstat(tmp_path, 5000, 100, 20, 40)
+    first = sampler.sample()
+    assert first == memory_monitoring.VmstatRates(50.0, 1.0, 0.2, 0.4)
+
+    _vmstat(tmp_path, 5600, 110, 20, 64)
+    now[0] += 2.0
+    assert sampler.sample() == memory_monitoring.VmstatRates(300.0, 5.0, 0.0, 12.0)
+
+
+def test_vmstat_missing_fields_and_counter_reset(tmp_path, monkeypatch):
+    now = [1100.0]
+    monkeypatch.setattr(memory_monitoring.time, "time", lambda: now[0])
+    monkeypatch.setattr(memory_monitoring.psutil, "boot_time", lambda: 1000.0)
+    sampler = memory_monitoring.VmstatSampler(str(tmp_path))
+
+    # No swap configured in this kernel build.
+    _vmstat(tmp_path, 5000, 100)
+    rates = sampler.sample()
+    assert rates.swap_in_per_sec is None
+    assert rates.swap_out_per_sec is None
+
+    _vmstat(tmp_path, 10, 0)
+    now[0] += 1.0
+    rates = sampler.sample()
+    assert (rates.page_faults_per_sec, rates.major_faults_per_sec) == (0.0, 0.0)
+
+
+def _rollup(root, pid, pss_kb, private_kb, swap_kb=0):
+    _write(root, f"{pid}/smaps_rollup",
+           "00400000-7ffd0000 ---p 00000000 00:00 0    [rollup]\n"
+           f"Rss:            {pss_kb * 2} kB\n"
+           f"Pss:            {pss_kb} kB\n"
+           f"Private_Clean:  {private_kb // 2} kB\n"
+           f"Private_Dirty:  {private_kb - private_kb // 2} kB\n"
+           f"Swap:           {swap_kb} kB\n")
+
+
+@pytest.fixture
+def top_rows(monkeypatch):
+    rows = []
+    monkeypatch.setattr(memory_monitoring.process_monitoring, "top_processes", lambda n, key: rows[:n])
+    return rows
+
+
+def test_footprint_scanner_rereads_only_changed_processes(tmp_path, top_rows):
+    _rollup(tmp_path, 10, 4000, 3000, 8)
+    _rollup(tmp_path, 20, 2000, 1000)
+    top_rows[:] = [ProcessRow(10, "postgres", 0.0, 8 << 20, 500.0), ProcessRow(20, "nginx", 0.0, 4 << 20, 600.0)]
+    scanner = memory_monitoring.FootprintScanner(n=2, proc_root=str(tmp_path))
+
+    first = scanner.scan()
+    assert scanner.reads == 2
+    assert first[0] == memory_monitoring.ProcessFootprint(10, "postgres", 8 << 20, 4000 * 1024, 3000 * 1024, 8 * 1024)
+
+    # Nothing changed: both come from the cache, even if smaps_rollup did.
+    _rollup(tmp_path, 10, 1, 1)
+    assert scanner.scan() == first
+    assert scanner.reads == 2
+
+    # postgres grew; nginx did not.
+    top_rows[0] = ProcessRow(10, "postgres", 0.0, 9 << 20, 500.0)
+    second = scanner.scan()
+    assert scanner.reads == 3
+    assert second[0].pss == 1024
+    assert second[1] == first[1]
+
+    # pid 20 now belongs to a new process with the same RSS.
+    top_rows[1] = ProcessRow(20, "nginx", 0.0, 4 << 20, 700.0)
+    scanner.scan()
+    assert scanner.reads == 4
+
+
+def test_footprint_scanner_skips_processes_that_exited(tmp_path, top_rows):
+    _rollup(tmp_path, 10, 4000, 3000)
+    top_rows[:] = [ProcessRow(10, "postgres", 0.0, 8 << 20, 500.0), ProcessRow(2 ** 22 + 1, "gone", 0.0, 1 << 20, 1.0)]
+    scanner = memory_monitoring.FootprintScanner(n=2, proc_root=str(tmp_path))
+    assert [footprint.pid for footprint in scanner.scan()] == [10]
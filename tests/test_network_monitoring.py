@@ -0,0 +1,101 @@
+import sys
+import threading
+from collections import namedtuple
+
+import pytest
+
+import network_monitoring
+
+
+def test_connection_status_handles_invalid_hostnames():
+    assert network_monitoring.get_connection_status("a" * 64 + ".example", 80, timeout=1.0) is False
+
+
+NicCounters = namedtuple("NicCounters", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+                                         "errin", "errout", "dropin", "dropout"])
+
+
+class TickingNetSource:
+    """
+    Received bytes of 1000 * tick**2 at each one-second tick of a fake clock.
+
+    Each thread sees the clock value of the counters it read last; see
+    TickingDiskSource in test_disk_monitoring.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ticks = 0
+        self.local = threading.local()
+
+    def net_io_counters(self, pernic=True):
+        with self.lock:
+            self.ticks += 1
+            self.local.now = float(self.ticks)
+            return {"eth0": NicCounters(0, self.ticks ** 2 * 1000, 0, 0, 0, 0, 0, 0)}
+
+    def time(self):
+        return self.local.now
+
+
+def test_network_io_rates_can_be_shared_between_threads(monkeypatch):
+    source = TickingNetSource()
+    monkeypatch.setattr(network_monitoring.procfs, "get_source", lambda: source)
+    monkeypatch.setattr(network_monitoring, "time", source)
+    monkeypatch.setattr(network_monitoring.psutil, "net_if_stats", lambda: {})
+    rates = network_monitoring.NetworkIORates()
+    rates.sample()
+    seen = []
+
+    def work():
+        for _ in range(2000):
+            rate = rates.sample()[0].bytes_recv_per_sec
+            seen.append(rate - (2 * source.local.now - 1) * 1000)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert set(seen) == {0.0}
+
+
+class FakeClock:
+    """Monotonic clock where each sample costs 0.3 s and sleeping advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_stream_interface_rates_does_not_drift(monkeypatch):
+    clock = FakeClock()
+
+    def sample(self, snapshot=None):
+        clock.now += 0.3
+        return ["rate"]
+
+    monkeypatch.setattr(network_monitoring, "time", clock)
+    monkeypatch.setattr(network_monitoring.NetworkIORates, "sample", sample)
+    list(network_monitoring.stream_interface_rates(interval=1, duration=5))
+
+    # After the first full interval, every sleep makes up for the 0.3 s
+    # the previous sample took.
+    assert clock.sleeps[0] == 1.0
+    assert clock.sleeps[1:] == pytest.approx([0.7] * (len(clock.sleeps) - 1))
+    assert len(clock.sleeps) == 5
@@ -0,0 +1,107 @@
+import asyncio
+import socket
+
+import pytest
+
+import network_probe
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+    yield f"127.0.0.1:{sock.getsockname()[1]}"
+    sock.close()
+
+
+@pytest.fixture
+def closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"127.0.0.1:{port}"
+
+
+def test_bad_targets_fail_on_their_own(listener, closed_port):
+    targets = [
+        listener,
+        closed_port,
+        # The IDNA codec rejects a label longer than 63 characters.
+        ("a" * 64 + ".example", 80),
+        # An embedded NUL character.
+        ("bad\x00host", 80),
+        listener,
+    ]
+    results = network_probe.probe_targets(targets, timeout=1.0)
+
+    assert [result.ok for result in results] == [True, False, False, False, True]
+    assert results[0].latency_ms >= 0
+    assert results[1].error == "Connection refused"
+    assert results[2].error.startswith("UnicodeError")
+    assert results[3].error
+
+
+def test_every_resolved_address_is_tried(listener, closed_port, monkeypatch):
+    # A dual-stack name whose first address refuses, like localhost
+    # resolving to ::1 first for an IPv4-only service.
+    refusing = ("127.0.0.1", int(closed_port.rpartition(":")[2]))
+    accepting = ("127.0.0.1", int(listener.rpartition(":")[2]))
+
+    async def dual_stack_getaddrinfo(self, host, port, **kwargs):
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", refusing),
+            (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", accepting),
+        ]
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", dual_stack_getaddrinfo)
+    ok, = network_probe.probe_targets([("dual.example", 80)], timeout=1.0)
+    assert ok.ok
+
+    async def refusing_getaddrinfo(self, host, port, **kwargs):
+        return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", refusing)] * 2
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", refusing_getaddrinfo)
+    failed, = network_probe.probe_targets([("dual.example", 80)], timeout=1.0)
+    assert not failed.ok
+    assert failed.error == "Connection refused"
+
+
+def test_latency_excludes_name_resolution(listener, monkeypatch):
+    original = asyncio.BaseEventLoop.getaddrinfo
+
+    async def slow_getaddrinfo(self, *args, **kwargs):
+        await asyncio.sleep(0.3)
+        return await original(self, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", slow_getaddrinfo)
+    result, = network_probe.probe_targets([listener], timeout=1.0)
+
+    assert result.ok
+    assert result.latency_ms < 300
+
+
+def test_slow_resolution_times_out(listener, monkeypatch):
+    async def hanging_getaddrinfo(self, *args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", hanging_getaddrinfo)
+    result, = network_probe.probe_targets([listener], timeout=0.1)
+
+    assert not result.ok
+    assert result.error == "resolving timed out after 0.1 s"
+
+
+def test_stats_count_failures_as_loss(listener, closed_port):
+    prober = network_probe.TcpProber([listener, closed_port], timeout=1.0)
+    for _ in range(4):
+        asyncio.run(prober.probe())
+    stats = prober.stats()
+
+    assert stats[listener]["count"] == 4
+    assert stats[listener]["loss_percent"] == 0
+    assert stats[listener]["p50"] is not None
+    assert stats[closed_port]["failures"] == 4
+    assert stats[closed_port]["loss_percent"] == 100
+    assert stats[closed_port]["p50"] is None
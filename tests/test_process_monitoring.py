@@ -0,0 +1,203 @@
+import contextlib
+import threading
+from collections import namedtuple
+
+import psutil
+import pytest
+
+import process_monitoring
+
+MemoryInfo = namedtuple("MemoryInfo", ["rss"])
+CpuTimes = namedtuple("CpuTimes", ["user", "system"])
+
+
+class FakeProcess:
+    """Stand-in for psutil.Process backed by the ``running`` table."""
+
+    running = {}
+    cpu_seconds = {}
+    denied = set()
+
+    def __init__(self, pid):
+        if pid not in self.running:
+            raise psutil.NoSuchProcess(pid)
+        self.pid = pid
+        # Like psutil, identity is fixed when the object is created.
+        self._name, self._create_time, self._rss = self.running[pid]
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def is_running(self):
+        current = self.running.get(self.pid)
+        return current is not None and current[1] == self._create_time
+
+    def create_time(self):
+        return self._create_time
+
+    def name(self):
+        return self._name
+
+    def cpu_percent(self):
+        return 0.0
+
+    def memory_info(self):
+        if self.pid in self.denied:
+            raise psutil.AccessDenied(self.pid)
+        return MemoryInfo(self.running[self.pid][2])
+
+    def cpu_times(self):
+        if self.pid not in self.running:
+            raise psutil.NoSuchProcess(self.pid)
+        return CpuTimes(self.cpu_seconds.get(self.pid, 0.0), 0.0)
+
+    def num_threads(self):
+        if self.pid in self.denied:
+            raise psutil.AccessDenied(self.pid)
+        return 1
+
+    def io_counters(self):
+        raise psutil.AccessDenied(self.pid)
+
+
+@pytest.fixture
+def fake_processes(monkeypatch):
+    FakeProcess.running = {}
+    FakeProcess.cpu_seconds = {}
+    FakeProcess.denied = set()
+    monkeypatch.setattr(psutil, "Process", FakeProcess)
+    monkeypatch.setattr(psutil, "pids", lambda: sorted(FakeProcess.running))
+    return FakeProcess.running
+
+
+def test_process_table_detects_pid_reuse(fake_processes):
+    table = process_monitoring.ProcessTable()
+    fake_processes[100] = ("old", 1000.0, 1024)
+    [row] = table.refresh()
+    assert (row.name, row.create_time) == ("old", 1000.0)
+
+    fake_processes[100] = ("new", 2000.0, 2048)
+    [row] = table.refresh()
+    assert (row.name, row.create_time, row.rss) == ("new", 2000.0, 2048)
+
+
+def test_process_table_prunes_exited_pids(fake_processes):
+    table = process_monitoring.ProcessTable()
+    fake_processes.update({1: ("a", 1.0, 1), 2: ("b", 2.0, 2)})
+    assert len(table.refresh()) == 2
+    del fake_processes[2]
+    assert [row.pid for row in table.refresh()] == [1]
+    assert list(table._processes) == [1]
+
+
+def test_prime_reports_only_recorded_baselines(fake_processes):
+    sampler = process_monitoring.ProcessSampler()
+    fake_processes[1] = ("a", 1.0, 1)
+
+    # Nothing to wait for when every pid is gone or already primed.
+    assert sampler.prime([404]) is False
+    assert sampler.prime([1, 404]) is True
+    assert sampler.prime([1]) is False
+    assert list(sampler._baselines) == [1]
+
+
+def test_sampler_prunes_exited_pids(fake_processes):
+    sampler = process_monitoring.ProcessSampler()
+    fake_processes.update({1: ("a", 1.0, 1), 2: ("b", 2.0, 2), 3: ("c", 3.0, 3)})
+    sampler.prime([1, 2, 3])
+    FakeProcess.cpu_seconds[1] = 0.5
+
+    del fake_processes[2]
+    del fake_processes[3]
+    usage = sampler.collect([1])
+    assert list(usage) == [1]
+    assert usage[1].cpu_percent > 0
+    # Pid 3 was not requested, but it exited, so its baseline goes too.
+    assert list(sampler._baselines) == [1]
+
+
+def test_sampler_keeps_baseline_on_access_denied(fake_processes):
+    sampler = process_monitoring.ProcessSampler()
+    fake_processes[1] = ("a", 1.0, 1)
+    sampler.prime([1])
+
+    FakeProcess.denied.add(1)
+    assert sampler.collect([1]) == {}
+    assert 1 in sampler._baselines
+
+    # The baseline survived, so the next sample needs no wait.
+    FakeProcess.denied.clear()
+    assert sampler.prime([1]) is False
+    assert list(sampler.collect([1])) == [1]
+
+
+def test_sampler_is_safe_to_share_between_threads(fake_processes):
+    sampler = process_monitoring.ProcessSampler()
+    fake_processes.update({pid: (str(pid), float(pid), pid) for pid in range(1, 400)})
+    errors = []
+
+    def work(pids):
+        try:
+            for _ in range(50):
+                sampler.prime(pids)
+                sampler.collect(pids)
+        except Exception as e:
+            errors.append(e)
+
+    # Every thread asks for pids that have exited, so every collect prunes.
+    exited = range(300, 400)
+    sampler.prime(exited)
+    for pid in exited:
+        del fake_processes[pid]
+    threads = [threading.Thread(target=work, args=(list(range(n, 400, 4)),)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert sorted(sampler._baselines) == list(range(1, 300))
+
+
+class FakeLinuxProcess(FakeProcess):
+    """FakeProcess with the /proc/<pid>/stat start time psutil reads on Linux."""
+
+    is_running_calls = 0
+
+    def __init__(self, pid):
+        super().__init__(pid)
+        self._proc = self
+
+    def _parse_stat_file(self):
+        return {"create_time": self.running[self.pid][1] * 100}
+
+    def is_running(self):
+        FakeLinuxProcess.is_running_calls += 1
+        return super().is_running()
+
+
+def test_process_table_detects_pid_reuse_from_stat(fake_processes, monkeypatch):
+    monkeypatch.setattr(psutil, "Process", FakeLinuxProcess)
+    FakeLinuxProcess.is_running_calls = 0
+    table = process_monitoring.ProcessTable()
+    fake_processes[100] = ("old", 1000.0, 1024)
+    table.refresh()
+    table.refresh()
+
+    fake_processes[100] = ("new", 2000.0, 2048)
+    [row] = table.refresh()
+    assert (row.name, row.create_time, row.rss) == ("new", 2000.0, 2048)
+    # The stat file read by oneshot() is enough; no extra lookup per pid.
+    assert FakeLinuxProcess.is_running_calls == 0
+
+
+def test_process_table_keeps_rows_with_denied_fields(fake_processes):
+    table = process_monitoring.ProcessTable()
+    fake_processes.update({1: ("mine", 1.0, 1024), 2: ("root", 2.0, 2048)})
+    FakeProcess.denied.add(2)
+
+    rows = {row.pid: row for row in table.refresh()}
+    assert sorted(rows) == [1, 2]
+    assert (rows[2].name, rows[2].rss) == ("root", None)
+    formatted = rows[2].format()
+    assert formatted["Name"] == "root"
+    assert formatted["Memory Usage"] is None
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+
+import procfs
+
+STAT = """cpu  100 5 50 1000 10 1 2 3 0 0
+cpu0 60 3 30 500 5 1 1 2 0 0
+cpu1 40 2 20 500 5 0 1 1 0 0
+intr 12345
+ctxt 6789
+"""
+
+MEMINFO = """MemTotal:        8000000 kB
+MemFree:         2000000 kB
+MemAvailable:    5000000 kB
+Buffers:          100000 kB
+Cached:          1500000 kB
+SwapCached:            0 kB
+Active:          3000000 kB
+Inactive:        1000000 kB
+Shmem:             50000 kB
+Slab:             300000 kB
+SReclaimable:     200000 kB
+"""
+
+NET_HEADER = (
+    "Inter-|   Receive                                                |  Transmit\n"
+    " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n"
+)
+
+
+def _net_dev(count):
+    lines = [NET_HEADER]
+    for i in range(count):
+        lines.append(f"  br{i}: {1000 + i} {10 + i} 1 2 0 0 0 0 {2000 + i} {20 + i} 3 4 0 0 0 0\n")
+    return "".join(lines)
+
+
+def _diskstats(count):
+    return "".join(
+        f"   8 {i} sd{i} {i + 1} 0 {8 * (i + 1)} 5 {i + 2} 0 {16 * (i + 1)} 7 0 9 12 0 0 0 0\n"
+        for i in range(count)
+    )
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "stat").write_text(STAT)
+    (tmp_path / "meminfo").write_text(MEMINFO)
+    (tmp_path / "net" / "dev").write_text(_net_dev(100))
+    (tmp_path / "diskstats").write_text(_diskstats(100))
+    return tmp_path
+
+
+@pytest.fixture
+def page_sized_reads(monkeypatch):
+    """Make preadv behave like a seq_file: at most 4 KB per call."""
+    real_preadv = os.preadv
+
+    def preadv(fd, buffers, offset):
+        with memoryview(buffers[0]) as view:
+            return real_preadv(fd, [view[:4096]], offset)
+
+    monkeypatch.setattr(os, "preadv", preadv)
+
+
+def test_fixtures_are_larger_than_a_page(proc_root):
+    assert (proc_root / "net" / "dev").stat().st_size > 4096
+    assert (proc_root / "diskstats").stat().st_size > 4096
+
+
+def test_proc_file_reads_whole_file_with_page_sized_reads(proc_root, page_sized_reads):
+    content = (proc_root / "net" / "dev").read_bytes()
+    f = procfs.ProcFile(str(proc_root / "net" / "dev"), size=512)
+    try:
+        buffer, n = f.read()
+        assert bytes(buffer[:n]) == content
+        # A second read reuses the grown buffer and sees the same content.
+        buffer, n = f.read()
+        assert bytes(buffer[:n]) == content
+    finally:
+        f.close()
+
+
+def test_net_io_counters_keeps_every_interface(proc_root, page_sized_reads):
+    backend = procfs.ProcBackend(str(proc_root))
+    try:
+        counters = backend.net_io_counters(pernic=True)
+    finally:
+        backend.close()
+    assert len(counters) == 100
+    assert counters["br99"] == procfs.NetIOCounters(
+        bytes_sent=2099, bytes_recv=1099, packets_sent=119, packets_recv=109,
+        errin=1, errout=3, dropin=2, dropout=4,
+    )
+
+
+def test_disk_io_counters_keeps_every_device(proc_root, page_sized_reads):
+    backend = procfs.ProcBackend(str(proc_root))
+    try:
+        counters = backend.disk_io_counters(perdisk=True)
+    finally:
+        backend.close()
+    assert len(counters) == 100
+    sd3 = counters["sd3"]
+    assert (sd3.read_count, sd3.write_count) == (4, 5)
+    assert (sd3.read_bytes, sd3.write_bytes) == (32 * procfs.SECTOR_SIZE, 64 * procfs.SECTOR_SIZE)
+    assert sd3.busy_time == 9
+
+
+def test_cpu_times_and_virtual_memory(proc_root):
+    backend = procfs.ProcBackend(str(proc_root))
+    try:
+        ticks = backend._clock_ticks
+        total = backend.cpu_times()
+        percpu = backend.cpu_times(percpu=True)
+        memory = backend.virtual_memory()
+    finally:
+        backend.close()
+    assert total.user == 100 / ticks
+    assert [times.user for times in percpu] == [60 / ticks, 40 / ticks]
+    assert memory.total == 8000000 * 1024
+    assert memory.available == 5000000 * 1024
+    assert memory.cached == (1500000 + 200000) * 1024
+    assert memory.used == memory.total - memory.available
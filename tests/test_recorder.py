@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+import recorder
+
+
+def _record(directory, values, timestamp, max_segment_bytes=64 * 1024 * 1024):
+    with recorder.SnapshotRecorder(str(directory), max_segment_bytes=max_segment_bytes) as r:
+        r.record_many(values, timestamp)
+
+
+def test_next_sequence_follows_highest_segment(tmp_path):
+    assert recorder.next_sequence(str(tmp_path)) == 0
+    for name in ("metrics-000003.bin", "metrics-000007.bin", "other-000042.bin"):
+        (tmp_path / name).write_bytes(b"")
+    assert recorder.next_sequence(str(tmp_path)) == 8
+
+
+def test_new_recorder_does_not_overwrite_after_retention(tmp_path):
+    for i in range(3):
+        _record(tmp_path, {"cpu.total": float(i)}, 100.0 + i)
+    paths = recorder.segment_paths(str(tmp_path))
+    assert [os.path.basename(p) for p in paths] == ["metrics-000000.bin", "metrics-000001.bin", "metrics-000002.bin"]
+
+    # Retention removes the oldest segment; two segments are left.
+    os.remove(paths[0])
+    kept = {p: open(p, "rb").read() for p in paths[1:]}
+
+    _record(tmp_path, {"cpu.total": 9.0}, 200.0)
+    for path, content in kept.items():
+        assert open(path, "rb").read() == content
+    assert os.path.basename(recorder.segment_paths(str(tmp_path))[-1]) == "metrics-000003.bin"
+
+
+def test_segment_writer_refuses_existing_file(tmp_path):
+    path = tmp_path / "metrics-000000.bin"
+    path.write_bytes(b"history")
+    with pytest.raises(FileExistsError):
+        recorder.SegmentWriter(str(path), ["cpu.total"])
+    assert path.read_bytes() == b"history"
+
+
+def test_recording_reads_back(tmp_path):
+    pytest.importorskip("numpy")
+    with recorder.SnapshotRecorder(str(tmp_path)) as r:
+        r.record_many({"cpu.total": 1.0, "memory.percent": 2.0}, 10.0)
+        r.record_many({"cpu.total": 3.0, "memory.percent": 4.0}, 11.0)
+    readers = recorder.read_recording(str(tmp_path))
+    try:
+        assert list(readers[0].timestamps) == [10.0, 11.0]
+        assert list(readers[0].column("cpu.total")) == [1.0, 3.0]
+    finally:
+        for reader in readers:
+            reader.close()
+
+
+def test_live_and_empty_segments_are_skipped(tmp_path):
+    pytest.importorskip("numpy")
+    # A writer that died before its header reached the disk.
+    (tmp_path / "metrics-000000.bin").write_bytes(b"")
+    (tmp_path / "metrics-000001.bin").write_bytes(b"SYSINFO1")
+    with pytest.raises(ValueError):
+        recorder.SegmentReader(str(tmp_path / "metrics-000000.bin"))
+
+    with recorder.SnapshotRecorder(str(tmp_path)) as r:
+        r.record_many({"cpu.total": 1.0}, 10.0)
+        # The live segment is readable while the recorder still has it open.
+        readers = recorder.read_recording(str(tmp_path))
+        try:
+            assert [os.path.basename(reader.path) for reader in readers] == ["metrics-000002.bin"]
+            assert readers[0].columns == ["cpu.total"]
+        finally:
+            for reader in readers:
+                reader.close()
+
+
+def test_rotation_drops_metrics_that_went_away(tmp_path):
+    pytest.importorskip("numpy")
+    with recorder.SnapshotRecorder(str(tmp_path)) as r:
+        r.record_many({"disk.sda.read": 1.0, "cpu.total": 1.0}, 10.0)
+        # sda was unplugged and sdb plugged in.
+        r.record_many({"disk.sdb.read": 2.0, "cpu.total": 2.0}, 11.0)
+    readers = recorder.read_recording(str(tmp_path))
+    try:
+        assert [reader.columns for reader in readers] == [
+            ["cpu.total", "disk.sda.read"], ["cpu.total", "disk.sdb.read"]]
+    finally:
+        for reader in readers:
+            reader.close()
@@ -0,0 +1,108 @@
+import timeseries
+
+
+def test_metric_store_drops_series_idle_for_a_retention_window():
+    store = timeseries.MetricStore(retention=3)
+    store.record_many({"cpu.total": 1.0, "net.veth1.bytes_recv_per_sec": 5.0}, 100.0)
+
+    # The veth disappears; its samples stay queryable for a full window.
+    for i in range(1, 3):
+        store.record_many({"cpu.total": 1.0}, 100.0 + i)
+        assert "net.veth1.bytes_recv_per_sec" in store.metrics()
+    store.record_many({"cpu.total": 1.0}, 103.0)
+
+    assert store.metrics() == ["cpu.total"]
+    assert store.series("net.veth1.bytes_recv_per_sec") is None
+    assert len(store.series("cpu.total")) == 3
+
+
+def test_metric_store_keeps_series_with_sparse_samples():
+    store = timeseries.MetricStore(retention=3)
+    for i in range(10):
+        values = {"cpu.total": 1.0}
+        if i % 3 == 0:
+            values["mount./mnt.percent"] = 50.0
+        store.record_many(values, 100.0 + i)
+    assert store.metrics() == ["cpu.total", "mount./mnt.percent"]
+
+    # A None value is not a sample.
+    for i in range(3):
+        store.record_many({"cpu.total": 1.0, "mount./mnt.percent": None}, 200.0 + i)
+    assert store.metrics() == ["cpu.total"]
+
+
+def test_rollup_store_drops_series_older_than_every_tier():
+    store = timeseries.RollupStore(tiers=((1, 10), (10, 6)))
+    assert store.span == 60
+    store.record_many({"cpu.total": 1.0, "disk.sdb.utilization": 2.0}, 1000.0)
+    store.record_many({"cpu.total": 1.0}, 1060.0)
+    assert store.metrics() == ["cpu.total", "disk.sdb.utilization"]
+
+    store.record_many({"cpu.total": 1.0}, 1061.0)
+    assert store.metrics() == ["cpu.total"]
+    assert store.query("disk.sdb.utilization", 0.0) == {"resolution": None, "buckets": []}
+
+
+def test_rollup_tier_buckets_min_max_mean():
+    tier = timeseries.RollupTier(resolution=10, capacity=3)
+    assert tier.oldest() is None
+    for value, timestamp in [(4.0, 1000.0), (1.0, 1003.5), (7.0, 1009.999), (2.0, 1010.0), (6.0, 1019.0)]:
+        tier.add(value, timestamp)
+
+    assert tier.buckets() == [
+        {"start": 1000.0, "min": 1.0, "max": 7.0, "mean": 4.0, "count": 3},
+        {"start": 1010.0, "min": 2.0, "max": 6.0, "mean": 4.0, "count": 2},
+    ]
+    # A late sample for a closed bucket is dropped.
+    tier.add(100.0, 1005.0)
+    assert tier.buckets()[0]["max"] == 7.0
+
+    # Only buckets overlapping the range are returned.
+    assert [b["start"] for b in tier.buckets(start=1010.0)] == [1010.0]
+    assert [b["start"] for b in tier.buckets(start=1009.0, end=1009.5)] == [1000.0]
+
+
+def test_rollup_tier_ring_keeps_the_newest_buckets():
+    tier = timeseries.RollupTier(resolution=1, capacity=3)
+    for i in range(6):
+        tier.add(float(i), 1000.0 + i)
+    # Three closed buckets plus the open one.
+    assert [b["start"] for b in tier.buckets()] == [1002.0, 1003.0, 1004.0, 1005.0]
+    assert tier.oldest() == 1002.0
+    assert tier.span == 3
+
+
+def _filled_store():
+    # 40 one-second samples: the 1 s tier reaches back to 1029, the 10 s tier to 1000.
+    store = timeseries.RollupStore(tiers=((1, 10), (10, 6)))
+    for i in range(40):
+        store.record("cpu.total", float(i), 1000.0 + i)
+    return store
+
+
+def test_rollup_store_selects_the_finest_covering_tier():
+    store = _filled_store()
+
+    recent = store.query("cpu.total", 1035.0)
+    assert recent["resolution"] == 1
+    assert [b["start"] for b in recent["buckets"]] == [1035.0, 1036.0, 1037.0, 1038.0, 1039.0]
+
+    older = store.query("cpu.total", 1020.0)
+    assert older["resolution"] == 10
+    assert older["buckets"] == [
+        {"start": 1020.0, "min": 20.0, "max": 29.0, "mean": 24.5, "count": 10},
+        {"start": 1030.0, "min": 30.0, "max": 39.0, "mean": 34.5, "count": 10},
+    ]
+
+    # Nothing covers the range; the tier with the longest history is used.
+    assert store.select_tier("cpu.total", 900.0).resolution == 10
+    assert store.select_tier("memory.percent", 1035.0) is None
+
+
+def test_rollup_store_selects_by_requested_resolution():
+    store = _filled_store()
+    # The coarsest acceptable tier that covers the range.
+    assert store.select_tier("cpu.total", 1035.0, resolution=10).resolution == 10
+    assert store.select_tier("cpu.total", 1035.0, resolution=60).resolution == 10
+    # Only the 1 s tier is fine enough, even though it does not reach back far enough.
+    assert store.select_tier("cpu.total", 1020.0, resolution=5).resolution == 1